@@ -0,0 +1,95 @@
+"""Convert books.extra to JSONB with GIN index
+
+Revision ID: 0c6e9d4b7a21
+Revises: f3b7d2c8a915
+Create Date: 2026-10-18 16:42:10.508371
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0c6e9d4b7a21'
+down_revision: Union[str, Sequence[str], None] = 'f3b7d2c8a915'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Строк в одной транзакции заполнения
+BACKFILL_BATCH_SIZE = 10_000
+
+# Пока идет заполнение, новые записи приложения сразу пишутся и в extra_jsonb
+SYNC_FUNCTION = """
+CREATE FUNCTION books_extra_jsonb_sync() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    NEW.extra_jsonb := NEW.extra::jsonb;
+    RETURN NEW;
+END
+$$
+"""
+
+BACKFILL_BATCH = sa.text("""
+    UPDATE books SET extra_jsonb = extra::jsonb
+    WHERE book_id IN (
+        SELECT book_id FROM books
+        WHERE book_id > :after AND extra IS NOT NULL
+        ORDER BY book_id
+        LIMIT :limit
+    )
+    RETURNING book_id
+""")
+
+
+def upgrade() -> None:
+    """
+    Upgrade schema.
+
+    ALTER COLUMN ... TYPE jsonb переписал бы всю таблицу под эксклюзивной
+    блокировкой. Вместо этого: новая колонка, заполнение пачками (каждая —
+    своя транзакция, чтения и записи книг не останавливаются), затем
+    быстрая замена колонки и индекс CONCURRENTLY.
+    """
+    op.add_column('books', sa.Column('extra_jsonb', sa.dialects.postgresql.JSONB(), nullable=True))
+    op.execute(SYNC_FUNCTION)
+    op.execute(
+        "CREATE TRIGGER books_extra_jsonb_sync BEFORE INSERT OR UPDATE OF extra ON books"
+        " FOR EACH ROW EXECUTE FUNCTION books_extra_jsonb_sync()"
+    )
+
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        after = '00000000-0000-0000-0000-000000000000'
+        while True:
+            book_ids = bind.execute(
+                BACKFILL_BATCH, {"after": after, "limit": BACKFILL_BATCH_SIZE}
+            ).scalars().all()
+            if not book_ids:
+                break
+            after = max(book_ids)
+
+    # Замена колонки — короткая блокировка; строки, измененные после
+    # заполнения своей пачки, уже синхронизированы триггером
+    op.execute("DROP TRIGGER books_extra_jsonb_sync ON books")
+    op.execute("DROP FUNCTION books_extra_jsonb_sync()")
+    op.drop_column('books', 'extra')
+    op.alter_column('books', 'extra_jsonb', new_column_name='extra')
+
+    # Фильтры subject/language/publisher: extra @> '{...}'
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY ix_books_extra ON books"
+            " USING gin (extra jsonb_path_ops)"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_books_extra', table_name='books')
+    op.alter_column(
+        'books', 'extra',
+        type_=sa.JSON(),
+        postgresql_using='extra::json',
+    )
@@ -0,0 +1,49 @@
+"""Add books enrichment state
+
+Revision ID: 5e93b0a7c2f4
+Revises: c41d7a9e5b12
+Create Date: 2026-02-20 10:05:51.662019
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e93b0a7c2f4'
+down_revision: Union[str, Sequence[str], None] = 'c41d7a9e5b12'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Существующие книги уже обогащались синхронно при создании
+    op.add_column('books', sa.Column('enrichment_status', sa.String(length=20), server_default='done', nullable=False))
+    op.add_column('books', sa.Column('enriched_at', sa.TIMESTAMP(timezone=True), nullable=True))
+    op.add_column('books', sa.Column('enrichment_attempts', sa.Integer(), server_default='0', nullable=False))
+    # None мог сохраниться и как JSON null ('null'), а не SQL NULL
+    op.execute(
+        "UPDATE books SET enrichment_status = 'not_found'"
+        " WHERE extra IS NULL OR jsonb_typeof(extra::jsonb) = 'null'"
+    )
+    op.execute("UPDATE books SET enriched_at = updated_at")
+    op.alter_column('books', 'enrichment_status', server_default='pending')
+
+    op.create_index(
+        'ix_books_enrichment_pending',
+        'books',
+        ['created_at'],
+        unique=False,
+        postgresql_where=sa.text("enrichment_status = 'pending'"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_books_enrichment_pending', table_name='books', postgresql_where=sa.text("enrichment_status = 'pending'"))
+    op.drop_column('books', 'enrichment_attempts')
+    op.drop_column('books', 'enriched_at')
+    op.drop_column('books', 'enrichment_status')
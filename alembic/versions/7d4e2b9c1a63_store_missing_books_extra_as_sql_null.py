@@ -0,0 +1,39 @@
+"""Store missing books.extra as SQL NULL
+
+Revision ID: 7d4e2b9c1a63
+Revises: 0c6e9d4b7a21
+Create Date: 2026-10-18 02:57:39.945019
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d4e2b9c1a63'
+down_revision: Union[str, Sequence[str], None] = '0c6e9d4b7a21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # None из ORM сохранялся как JSON null ('null'); такие книги при переходе
+    # на фоновое обогащение получили статус done вместо not_found
+    op.execute("""
+        UPDATE books SET
+            extra = NULL,
+            enrichment_status = CASE
+                WHEN enrichment_status = 'done' THEN 'not_found' ELSE enrichment_status
+            END,
+            version = version + 1
+        WHERE jsonb_typeof(extra) = 'null'
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # JSON null и SQL NULL означают одно и то же — возвращать нечего
+    pass
@@ -0,0 +1,37 @@
+"""Add books keyset pagination index
+
+Revision ID: 8b1f4c2d9e07
+Revises: 27653c6e3164
+Create Date: 2026-02-02 11:20:13.514826
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b1f4c2d9e07'
+down_revision: Union[str, Sequence[str], None] = '27653c6e3164'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY: построение индекса не блокирует записи в books
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_books_created_at_book_id',
+            'books',
+            ['created_at', 'book_id'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_books_created_at_book_id', table_name='books', postgresql_concurrently=True)
@@ -0,0 +1,114 @@
+"""Add trigram and full-text search indexes
+
+Revision ID: c41d7a9e5b12
+Revises: 8b1f4c2d9e07
+Create Date: 2026-02-09 15:42:37.104583
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41d7a9e5b12'
+down_revision: Union[str, Sequence[str], None] = '8b1f4c2d9e07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Строк в одной транзакции заполнения
+BACKFILL_BATCH_SIZE = 10_000
+
+SEARCH_VECTOR = (
+    "setweight(to_tsvector('simple', coalesce({row}title, '')), 'A')"
+    " || setweight(to_tsvector('simple', coalesce({row}author, '')), 'B')"
+    " || setweight(to_tsvector('simple', coalesce({row}description, '')), 'C')"
+)
+
+# Вектор поддерживается триггером, а не GENERATED ... STORED: добавление
+# вычисляемой колонки переписало бы всю таблицу под эксклюзивной блокировкой
+UPDATE_FUNCTION = f"""
+CREATE FUNCTION books_search_vector_update() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    NEW.search_vector := {SEARCH_VECTOR.format(row='NEW.')};
+    RETURN NEW;
+END
+$$
+"""
+
+BACKFILL_BATCH = sa.text(f"""
+    UPDATE books SET search_vector = {SEARCH_VECTOR.format(row='')}
+    WHERE book_id IN (
+        SELECT book_id FROM books
+        WHERE book_id > :after
+        ORDER BY book_id
+        LIMIT :limit
+    )
+    RETURNING book_id
+""")
+
+
+def upgrade() -> None:
+    """
+    Upgrade schema.
+
+    Колонка без значения по умолчанию добавляется без перезаписи таблицы,
+    новые и измененные строки заполняет триггер, существующие — пачки
+    (каждая — своя транзакция), индексы строятся CONCURRENTLY: чтения
+    и записи книг не останавливаются.
+    """
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # Полнотекстовый поиск q=
+    op.add_column('books', sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+    op.execute(UPDATE_FUNCTION)
+    op.execute(
+        "CREATE TRIGGER books_search_vector_update"
+        " BEFORE INSERT OR UPDATE OF title, author, description ON books"
+        " FOR EACH ROW EXECUTE FUNCTION books_search_vector_update()"
+    )
+
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        after = '00000000-0000-0000-0000-000000000000'
+        while True:
+            book_ids = bind.execute(
+                BACKFILL_BATCH, {"after": after, "limit": BACKFILL_BATCH_SIZE}
+            ).scalars().all()
+            if not book_ids:
+                break
+            after = max(book_ids)
+
+        # ILIKE '%...%' по title/author/genre
+        for column in ('title', 'author', 'genre'):
+            op.create_index(
+                f'ix_books_{column}_trgm',
+                'books',
+                [column],
+                unique=False,
+                postgresql_using='gin',
+                postgresql_ops={column: 'gin_trgm_ops'},
+                postgresql_concurrently=True,
+            )
+        op.create_index(
+            'ix_books_search_vector',
+            'books',
+            ['search_vector'],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_books_search_vector', table_name='books', postgresql_concurrently=True)
+        for column in ('genre', 'author', 'title'):
+            op.drop_index(f'ix_books_{column}_trgm', table_name='books', postgresql_concurrently=True)
+    op.execute("DROP TRIGGER IF EXISTS books_search_vector_update ON books")
+    op.execute("DROP FUNCTION IF EXISTS books_search_vector_update()")
+    op.drop_column('books', 'search_vector')
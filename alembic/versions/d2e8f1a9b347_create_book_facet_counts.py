@@ -0,0 +1,123 @@
+"""Create book_facet_counts maintained by triggers on books
+
+Revision ID: d2e8f1a9b347
+Revises: a7c3e15d8f60
+Create Date: 2026-10-18 10:12:41.530218
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2e8f1a9b347'
+down_revision: Union[str, Sequence[str], None] = 'a7c3e15d8f60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Значения фасетов строки books (facet, value)
+FACET_VALUES = """
+    LATERAL (VALUES
+        ('genre', b.genre),
+        ('decade', (b.year / 10 * 10)::text),
+        ('author', b.author),
+        ('available', b.available::text)
+    ) AS f(facet, value)
+"""
+
+# Statement-level триггер с transition tables: одна строка-приращение
+# на значение фасета за statement, в том числе для COPY и пакетных INSERT
+DELTA_FUNCTION = f"""
+CREATE FUNCTION book_facet_counts_delta() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO book_facet_counts (facet, value, count)
+        SELECT f.facet, f.value, count(*)
+        FROM new_books AS b, {FACET_VALUES}
+        WHERE f.value IS NOT NULL
+        GROUP BY f.facet, f.value;
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO book_facet_counts (facet, value, count)
+        SELECT f.facet, f.value, -count(*)
+        FROM old_books AS b, {FACET_VALUES}
+        WHERE f.value IS NOT NULL
+        GROUP BY f.facet, f.value;
+    ELSE
+        -- UPDATE, не меняющий фасеты (обогащение, pages), ничего не пишет
+        INSERT INTO book_facet_counts (facet, value, count)
+        SELECT facet, value, sum(delta)
+        FROM (
+            SELECT f.facet, f.value, 1 AS delta FROM new_books AS b, {FACET_VALUES}
+            UNION ALL
+            SELECT f.facet, f.value, -1 FROM old_books AS b, {FACET_VALUES}
+        ) AS d
+        WHERE value IS NOT NULL
+        GROUP BY facet, value
+        HAVING sum(delta) <> 0;
+    END IF;
+    RETURN NULL;
+END
+$$
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('book_facet_counts',
+    sa.Column('id', sa.BigInteger(), sa.Identity(always=False), nullable=False),
+    sa.Column('facet', sa.String(length=20), nullable=False),
+    sa.Column('value', sa.String(length=300), nullable=False),
+    sa.Column('count', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+    op.execute(DELTA_FUNCTION)
+    op.execute(
+        "CREATE TRIGGER books_facet_counts_insert AFTER INSERT ON books"
+        " REFERENCING NEW TABLE AS new_books"
+        " FOR EACH STATEMENT EXECUTE FUNCTION book_facet_counts_delta()"
+    )
+    op.execute(
+        "CREATE TRIGGER books_facet_counts_update AFTER UPDATE ON books"
+        " REFERENCING OLD TABLE AS old_books NEW TABLE AS new_books"
+        " FOR EACH STATEMENT EXECUTE FUNCTION book_facet_counts_delta()"
+    )
+    op.execute(
+        "CREATE TRIGGER books_facet_counts_delete AFTER DELETE ON books"
+        " REFERENCING OLD TABLE AS old_books"
+        " FOR EACH STATEMENT EXECUTE FUNCTION book_facet_counts_delta()"
+    )
+    op.execute("""
+        CREATE FUNCTION book_facet_counts_truncate() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            DELETE FROM book_facet_counts;
+            RETURN NULL;
+        END
+        $$
+    """)
+    op.execute(
+        "CREATE TRIGGER books_facet_counts_truncate AFTER TRUNCATE ON books"
+        " FOR EACH STATEMENT EXECUTE FUNCTION book_facet_counts_truncate()"
+    )
+
+    # Начальные значения; CREATE TRIGGER держит блокировку books до конца
+    # транзакции, поэтому параллельные записи не потеряются и не задвоятся
+    op.execute(f"""
+        INSERT INTO book_facet_counts (facet, value, count)
+        SELECT f.facet, f.value, count(*)
+        FROM books AS b, {FACET_VALUES}
+        WHERE f.value IS NOT NULL
+        GROUP BY f.facet, f.value
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for trigger in ('truncate', 'delete', 'update', 'insert'):
+        op.execute(f"DROP TRIGGER books_facet_counts_{trigger} ON books")
+    op.execute("DROP FUNCTION book_facet_counts_truncate()")
+    op.execute("DROP FUNCTION book_facet_counts_delta()")
+    op.drop_table('book_facet_counts')
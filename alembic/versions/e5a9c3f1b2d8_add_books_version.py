@@ -0,0 +1,29 @@
+"""Add books version for optimistic concurrency
+
+Revision ID: e5a9c3f1b2d8
+Revises: d2e8f1a9b347
+Create Date: 2026-10-18 11:05:19.844107
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a9c3f1b2d8'
+down_revision: Union[str, Sequence[str], None] = 'd2e8f1a9b347'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Константный DEFAULT: столбец добавляется без перезаписи таблицы
+    op.add_column('books', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('books', 'version')
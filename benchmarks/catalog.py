@@ -0,0 +1,311 @@
+"""
+Генератор синтетического каталога: миллионы книг в books через COPY.
+
+Данные воспроизводимы: одинаковые --seed и --start дают те же строки.
+Распределения близки к настоящему каталогу: авторы и жанры — по закону
+Ципфа (немногие популярные, длинный хвост), годы смещены к последним
+десятилетиям, названия из частотного словаря. ISBN (--isbn-ratio)
+уникальны и выводятся из номера строки, поэтому догрузка с --start
+продолжает нумерацию без конфликтов. Книги с extra (--extra-ratio)
+считаются обогащенными (done), остальные — not_found: фоновый воркер
+их не трогает.
+
+Строки генерируются пачками в нескольких процессах (--jobs) и грузятся
+COPY FORMAT csv по нескольким соединениям. --drop-indexes удаляет
+вторичные индексы books на время загрузки и строит их заново после —
+для десятков миллионов строк это быстрее, чем обновлять GIN-индексы
+на каждой строке.
+
+Запуск (из корня проекта, DATABASE_URL из .env):
+    poetry run python -m benchmarks.catalog --rows 10000000 --drop-indexes
+    poetry run python -m benchmarks.catalog --rows 100000 --csv catalog.csv
+"""
+
+import argparse
+import asyncio
+import csv
+import io
+import itertools
+import json
+import os
+import random
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+
+import asyncpg
+from sqlalchemy.engine import make_url
+
+from src.library_catalog.core.config import settings
+
+COLUMNS = (
+    "book_id", "title", "author", "year", "genre", "pages", "available", "isbn",
+    "description", "extra", "enrichment_status", "enriched_at", "created_at", "updated_at",
+)
+
+FIRST_NAMES = (
+    "James", "Mary", "John", "Patricia", "Robert", "Jennifer", "Michael", "Linda", "William",
+    "Elizabeth", "David", "Barbara", "Richard", "Susan", "Joseph", "Jessica", "Thomas", "Sarah",
+    "Charles", "Karen", "Daniel", "Nancy", "George", "Margaret", "Anna", "Emma", "Henry", "Alice",
+    "Лев", "Федор", "Анна", "Михаил", "Марина", "Иван", "Ольга", "Сергей", "Татьяна", "Николай",
+)
+LAST_NAMES = (
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Wilson",
+    "Anderson", "Taylor", "Thomas", "Moore", "Jackson", "Martin", "Lee", "Thompson", "White",
+    "Harris", "Clark", "Lewis", "Robinson", "Walker", "Young", "Allen", "King", "Wright", "Scott",
+    "Green", "Baker", "Adams", "Nelson", "Hill", "Campbell", "Mitchell", "Roberts", "Carter",
+    "Толстой", "Достоевский", "Пушкин", "Булгаков", "Чехов", "Гоголь", "Тургенев", "Набоков",
+    "Пастернак", "Ахматова", "Цветаева", "Лермонтов", "Бунин", "Горький", "Платонов", "Шолохов",
+)
+# По убыванию популярности: вес жанра — по закону Ципфа от позиции
+GENRES = (
+    "Fiction", "Fantasy", "Detective", "Romance", "Science Fiction", "Classic", "History",
+    "Biography", "Programming", "Children", "Thriller", "Poetry", "Philosophy", "Horror",
+    "Psychology", "Economics", "Travel", "Cooking", "Art", "Mathematics", "Physics", "Religion",
+    "Drama", "Humor", "Adventure", "Science", "Politics", "Music", "Sports", "Medicine",
+)
+WORDS = (
+    "the", "night", "river", "war", "peace", "shadow", "garden", "silent", "dragon", "stone",
+    "winter", "empire", "ocean", "forest", "mirror", "code", "city", "house", "road", "star",
+    "king", "queen", "secret", "last", "lost", "dark", "light", "fire", "ice", "blood", "time",
+    "world", "heart", "storm", "glass", "iron", "golden", "hidden", "broken", "wild", "long",
+    "journey", "memory", "island", "north", "south", "tower", "song", "dream", "letter", "machine",
+    "ночь", "река", "война", "мир", "тень", "сад", "тишина", "камень", "зима", "море", "лес",
+    "город", "дом", "дорога", "звезда", "тайна", "сердце", "буря", "время", "песня", "письмо",
+)
+LANGUAGES = ("eng", "eng", "eng", "rus", "rus", "ger", "fre", "spa")
+PUBLISHERS = (
+    "Penguin", "HarperCollins", "Macmillan", "Simon & Schuster", "Hachette", "O'Reilly",
+    "Vintage", "Эксмо", "АСТ", "Азбука", "Манн, Иванов и Фербер",
+)
+
+
+@dataclass(frozen=True)
+class CatalogSpec:
+    """Параметры генерации; одинаковые параметры — одинаковые строки."""
+    seed: int = 42
+    authors: int = 50_000
+    zipf: float = 0.9
+    isbn_ratio: float = 0.7
+    extra_ratio: float = 0.6
+    description_ratio: float = 0.5
+    years_back: int = 150
+    created_days: int = 5 * 365
+    now: datetime = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+@lru_cache
+def zipf_weights(n: int, s: float) -> list[float]:
+    """Накопленные веса k^-s для k = 1..n (для random.choices(cum_weights=...))."""
+    return list(itertools.accumulate(1 / k ** s for k in range(1, n + 1)))
+
+
+@lru_cache
+def year_weights(years_back: int) -> list[float]:
+    # Вес года убывает экспоненциально с возрастом: половина книг — за последние ~20 лет
+    return list(itertools.accumulate(0.966 ** age for age in range(years_back)))
+
+
+@lru_cache(maxsize=None)
+def author_name(k: int) -> str:
+    combos = len(FIRST_NAMES) * len(LAST_NAMES)
+    first = FIRST_NAMES[k % len(FIRST_NAMES)]
+    last = LAST_NAMES[k // len(FIRST_NAMES) % len(LAST_NAMES)]
+    if k < combos:
+        return f"{first} {last}"
+    initial = chr(ord("A") + k // combos % 26)
+    suffix = f" {k // (combos * 26) + 1}" if k >= combos * 26 else ""
+    return f"{first} {initial}. {last}{suffix}"
+
+
+def isbn13(n: int) -> str:
+    """Уникальный для n < 10^9 ISBN-13 с верной контрольной цифрой."""
+    # n * 7919 mod 10^9 — биекция (7919 взаимно просто с 10^9), ISBN не идут подряд
+    body = f"978{(n * 7919 + 104_729) % 10**9:09d}"
+    check = (10 - sum(int(d) * (3 if i % 2 else 1) for i, d in enumerate(body)) % 10) % 10
+    return body + str(check)
+
+
+def generate_chunk(spec: CatalogSpec, start: int, count: int) -> bytes:
+    """Строки start..start+count-1 в формате CSV для COPY."""
+    rng = random.Random(f"{spec.seed}:{start}")
+    author_weights = zipf_weights(spec.authors, spec.zipf)
+    genre_weights = zipf_weights(len(GENRES), spec.zipf)
+    word_weights = zipf_weights(len(WORDS), 0.8)
+    years = year_weights(spec.years_back)
+
+    authors = rng.choices(range(spec.authors), cum_weights=author_weights, k=count)
+    genres = rng.choices(GENRES, cum_weights=genre_weights, k=count)
+    ages = rng.choices(range(spec.years_back), cum_weights=years, k=count)
+    words = iter(rng.choices(WORDS, cum_weights=word_weights, k=count * 16))
+    created_span = spec.created_days * 86_400
+    current_year = spec.now.year
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for i in range(count):
+        n = start + i
+        title = " ".join(next(words) for _ in range(rng.randint(1, 4))).capitalize()
+        genre = genres[i]
+
+        description = None
+        if rng.random() < spec.description_ratio:
+            description = " ".join(next(words) for _ in range(rng.randint(6, 12))).capitalize() + "."
+
+        created_at = spec.now - timedelta(seconds=rng.random() * created_span)
+        updated_at = created_at + timedelta(seconds=rng.random() * 86_400)
+
+        extra, status, enriched_at = None, "not_found", updated_at
+        if rng.random() < spec.extra_ratio:
+            status = "done"
+            extra = json.dumps({
+                "cover_url": f"https://covers.openlibrary.org/b/id/{rng.randrange(10**7)}-L.jpg",
+                "subjects": [genre, *rng.sample(GENRES, rng.randint(0, 3))],
+                "publisher": rng.choice(PUBLISHERS),
+                "language": rng.choice(LANGUAGES),
+                "rating": round(rng.uniform(2.5, 5.0), 2),
+            }, ensure_ascii=False)
+
+        writer.writerow((
+            uuid.UUID(int=rng.getrandbits(128), version=4),
+            f"{title} {n}",
+            author_name(authors[i]),
+            current_year - ages[i],
+            genre,
+            min(max(int(rng.lognormvariate(5.6, 0.5)), 24), 3000),
+            "t" if rng.random() < 0.75 else "f",
+            isbn13(n) if rng.random() < spec.isbn_ratio else None,
+            description,
+            extra,
+            status,
+            enriched_at.isoformat(),
+            created_at.isoformat(),
+            updated_at.isoformat(),
+        ))
+    return buffer.getvalue().encode()
+
+
+# ========== LOADING ==========
+
+def asyncpg_dsn() -> str:
+    return make_url(settings.database_url.unicode_string()).set(
+        drivername="postgresql"
+    ).render_as_string(hide_password=False)
+
+
+async def secondary_indexes(conn: asyncpg.Connection) -> dict[str, str]:
+    """Индексы books, кроме первичного ключа: имя -> CREATE INDEX."""
+    rows = await conn.fetch(
+        "SELECT indexname, indexdef FROM pg_indexes"
+        " WHERE schemaname = current_schema() AND tablename = 'books' AND indexname <> 'books_pkey'"
+    )
+    return {row["indexname"]: row["indexdef"] for row in rows}
+
+
+async def rebuild_indexes(pool: asyncpg.Pool, indexes: dict[str, str]) -> None:
+    async def create(definition: str) -> None:
+        async with pool.acquire() as conn:
+            await conn.execute("SET maintenance_work_mem = '512MB'")
+            await conn.execute(definition)
+
+    await asyncio.gather(*(create(definition) for definition in indexes.values()))
+
+
+async def load(spec: CatalogSpec, rows: int, start: int | None, chunk_size: int, jobs: int,
+               drop_indexes: bool) -> None:
+    pool = await asyncpg.create_pool(asyncpg_dsn(), min_size=1, max_size=jobs)
+    try:
+        if start is None:
+            start = await pool.fetchval("SELECT count(*) FROM books")
+
+        indexes = {}
+        if drop_indexes:
+            indexes = await secondary_indexes(pool)
+            for name in indexes:
+                await pool.execute(f'DROP INDEX "{name}"')
+            print(f"dropped {len(indexes)} indexes")
+
+        started = time.perf_counter()
+        loaded = 0
+        in_flight = asyncio.Semaphore(jobs * 2)
+        loop = asyncio.get_running_loop()
+
+        with ProcessPoolExecutor(jobs) as executor:
+            async def load_chunk(chunk_start: int, count: int) -> None:
+                nonlocal loaded
+                async with in_flight:
+                    data = await loop.run_in_executor(executor, generate_chunk, spec, chunk_start, count)
+                    async with pool.acquire() as conn:
+                        await conn.copy_to_table(
+                            "books", source=io.BytesIO(data), columns=COLUMNS, format="csv",
+                        )
+                loaded += count
+                rate = loaded / (time.perf_counter() - started)
+                print(f"loaded {loaded}/{rows} ({rate:,.0f} rows/s)")
+
+            try:
+                await asyncio.gather(*(
+                    load_chunk(chunk_start, min(chunk_size, start + rows - chunk_start))
+                    for chunk_start in range(start, start + rows, chunk_size)
+                ))
+            finally:
+                if indexes:
+                    index_started = time.perf_counter()
+                    await rebuild_indexes(pool, indexes)
+                    print(f"rebuilt {len(indexes)} indexes in {time.perf_counter() - index_started:.1f}s")
+
+        await pool.execute("VACUUM ANALYZE books")
+        print(f"done: {rows} rows in {time.perf_counter() - started:.1f}s")
+    finally:
+        await pool.close()
+
+
+def write_csv(spec: CatalogSpec, path: str, rows: int, start: int, chunk_size: int, jobs: int) -> None:
+    """Записать каталог в CSV с заголовком (COPY books (...) FROM ... CSV HEADER)."""
+    chunks = range(start, start + rows, chunk_size)
+    with open(path, "wb") as f, ProcessPoolExecutor(jobs) as executor:
+        f.write((",".join(COLUMNS) + "\n").encode())
+        for data in executor.map(
+                generate_chunk,
+                itertools.repeat(spec),
+                chunks,
+                (min(chunk_size, start + rows - chunk_start) for chunk_start in chunks),
+        ):
+            f.write(data)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Сколько книг сгенерировать")
+    parser.add_argument("--start", type=int, help="Номер первой строки (по умолчанию — число книг в books)")
+    parser.add_argument("--seed", type=int, default=CatalogSpec.seed)
+    parser.add_argument("--authors", type=int, default=CatalogSpec.authors, help="Число разных авторов")
+    parser.add_argument("--zipf", type=float, default=CatalogSpec.zipf, help="Показатель Ципфа авторов и жанров")
+    parser.add_argument("--isbn-ratio", type=float, default=CatalogSpec.isbn_ratio)
+    parser.add_argument("--extra-ratio", type=float, default=CatalogSpec.extra_ratio)
+    parser.add_argument("--description-ratio", type=float, default=CatalogSpec.description_ratio)
+    parser.add_argument("--chunk-size", type=int, default=50_000, help="Строк в одном COPY")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="Процессов генерации и соединений")
+    parser.add_argument("--drop-indexes", action="store_true", help="Перестроить индексы после загрузки")
+    parser.add_argument("--csv", help="Записать в CSV-файл вместо загрузки в БД")
+    args = parser.parse_args()
+
+    spec = CatalogSpec(
+        seed=args.seed,
+        authors=args.authors,
+        zipf=args.zipf,
+        isbn_ratio=args.isbn_ratio,
+        extra_ratio=args.extra_ratio,
+        description_ratio=args.description_ratio,
+    )
+    if args.csv:
+        write_csv(spec, args.csv, args.rows, args.start or 0, args.chunk_size, args.jobs)
+    else:
+        asyncio.run(load(spec, args.rows, args.start, args.chunk_size, args.jobs, args.drop_indexes))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""
+Бенчмарк кодирования ответа листинга: прежний путь против ModelResponse.
+
+Прежний путь: маппер собирает ShowBook именованными аргументами, затем
+FastAPI повторно валидирует ответ по response_model и сериализует через
+dict и json.dumps. Новый путь: маппер валидирует книги из атрибутов ORM
+одним вызовом TypeAdapter, ModelResponse сериализует сразу в байты.
+
+Оба эндпоинта поднимаются в одном FastAPI-приложении и вызываются через
+ASGI без сети и без БД; тела ответов сверяются. Отдельно измеряется
+только кодирование (маппинг + сериализация тела), без ASGI.
+
+Запуск (из корня проекта):
+    poetry run python -m benchmarks.encoding --items 100 --iterations 500
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import httpx
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute, serialize_response
+
+from src.library_catalog.api.v1.schemas.book import ShowBook
+from src.library_catalog.api.v1.schemas.common import PaginatedResponse, PaginationParams
+from src.library_catalog.core.responses import ModelResponse
+from src.library_catalog.data.models.book import Book
+from src.library_catalog.domain.mappers.book_mapper import BookMapper
+
+
+def make_books(count: int) -> list[Book]:
+    """Книги, как их возвращает репозиторий (без БД)."""
+    now = datetime.now(timezone.utc)
+    return [
+        Book(
+            book_id=uuid4(),
+            title=f"Book {i}",
+            author=f"Author {i % 50}",
+            year=1950 + i % 70,
+            genre="Fantasy",
+            pages=100 + i,
+            available=i % 3 != 0,
+            isbn=f"978{i:010d}",
+            description="Lorem ipsum dolor sit amet " * 4,
+            extra={"cover_url": f"https://covers.openlibrary.org/b/id/{i}-L.jpg",
+                   "subjects": ["Fiction", "Adventure"], "publisher": "Penguin"},
+            enrichment_status="done",
+            enriched_at=now,
+            version=1,
+            created_at=now - timedelta(minutes=i),
+            updated_at=now,
+        )
+        for i in range(count)
+    ]
+
+
+def validated_show_book(book: Book) -> ShowBook:
+    """Прежний маппер: ShowBook из именованных аргументов."""
+    return ShowBook(
+        book_id=book.book_id,
+        title=book.title,
+        author=book.author,
+        year=book.year,
+        genre=book.genre,
+        pages=book.pages,
+        available=book.available,
+        isbn=book.isbn,
+        description=book.description,
+        extra=book.extra,
+        enrichment_status=book.enrichment_status,
+        enriched_at=book.enriched_at,
+        version=book.version,
+        created_at=book.created_at,
+        updated_at=book.updated_at,
+    )
+
+
+def build_app(books: list[Book]) -> FastAPI:
+    app = FastAPI()
+    pagination = PaginationParams(page_size=len(books), count="exact")
+
+    @app.get("/baseline", response_model=PaginatedResponse[ShowBook])
+    async def baseline():
+        items = [validated_show_book(book) for book in books]
+        return PaginatedResponse.create(items, len(items), pagination)
+
+    @app.get("/fast", response_model=PaginatedResponse[ShowBook])
+    async def fast():
+        items = BookMapper.to_show_books(books)
+        return ModelResponse(PaginatedResponse.create(items, len(items), pagination))
+
+    return app
+
+
+async def measure(client: httpx.AsyncClient, path: str, iterations: int) -> float:
+    """Среднее время ответа, мс."""
+    await client.get(path)
+    started = time.perf_counter()
+    for _ in range(iterations):
+        await client.get(path)
+    return (time.perf_counter() - started) * 1000 / iterations
+
+
+async def measure_encoding(app: FastAPI, books: list[Book], iterations: int) -> tuple[float, float]:
+    """Среднее время маппинга и кодирования тела без ASGI, мс: (прежний, новый)."""
+    route = next(r for r in app.routes if isinstance(r, APIRoute) and r.path == "/baseline")
+    pagination = PaginationParams(page_size=len(books), count="exact")
+
+    async def baseline() -> bytes:
+        items = [validated_show_book(book) for book in books]
+        page = PaginatedResponse.create(items, len(items), pagination)
+        content = await serialize_response(field=route.response_field, response_content=page)
+        return JSONResponse(content).body
+
+    async def fast() -> bytes:
+        items = BookMapper.to_show_books(books)
+        return ModelResponse(PaginatedResponse.create(items, len(items), pagination)).body
+
+    timings = []
+    for encode in (baseline, fast):
+        await encode()
+        started = time.perf_counter()
+        for _ in range(iterations):
+            await encode()
+        timings.append((time.perf_counter() - started) * 1000 / iterations)
+    return timings[0], timings[1]
+
+
+async def main(items: int, iterations: int, as_json: bool) -> None:
+    books = make_books(items)
+    app = build_app(books)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        baseline_body = (await client.get("/baseline")).json()
+        fast_body = (await client.get("/fast")).json()
+        if baseline_body != fast_body:
+            raise SystemExit("Response bodies differ")
+
+        baseline = await measure(client, "/baseline", iterations)
+        fast = await measure(client, "/fast", iterations)
+
+    encode_baseline, encode_fast = await measure_encoding(app, books, iterations)
+
+    result = {
+        "items": items,
+        "iterations": iterations,
+        "baseline_ms": round(baseline, 3),
+        "fast_ms": round(fast, 3),
+        "speedup": round(baseline / fast, 2),
+        "encode_baseline_ms": round(encode_baseline, 3),
+        "encode_fast_ms": round(encode_fast, 3),
+        "encode_speedup": round(encode_baseline / encode_fast, 2),
+    }
+    if as_json:
+        print(json.dumps(result))
+    else:
+        print(f"{items} books per page, {iterations} iterations")
+        print(f"  mapper + response_model: {result['baseline_ms']:.3f} ms/response")
+        print(f"  TypeAdapter + ModelResponse: {result['fast_ms']:.3f} ms/response")
+        print(f"  speedup: x{result['speedup']}")
+        print("encoding only (mapping + body serialization):")
+        print(f"  mapper + response_model: {result['encode_baseline_ms']:.3f} ms/page")
+        print(f"  TypeAdapter + ModelResponse: {result['encode_fast_ms']:.3f} ms/page")
+        print(f"  speedup: x{result['encode_speedup']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--items", type=int, default=100, help="Книг на странице")
+    parser.add_argument("--iterations", type=int, default=500, help="Запросов на вариант")
+    parser.add_argument("--json", action="store_true", help="Вывести результат в JSON")
+    args = parser.parse_args()
+    asyncio.run(main(args.items, args.iterations, args.json))
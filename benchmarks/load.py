@@ -0,0 +1,345 @@
+"""
+Нагрузочный бенчмарк API: пропускная способность и p50/p95/p99 по сценариям.
+
+Поднимает приложение в uvicorn (отдельный процесс) на локальном Postgres
+из DATABASE_URL, догружает синтетические книги до --rows (сразу в статусе
+not_found, чтобы фоновый воркер обогащения не работал с ними во время
+замеров; число pending-книг перед прогоном пишется в meta) и подменяет
+Open Library заглушкой в этом процессе (OPENLIBRARY_BASE_URL приложения
+указывает на нее, задержка ответа — --openlibrary-latency). Сценарии
+выполняются по очереди, каждый с --concurrency одновременными клиентами:
+
+    create  POST   /books
+    get     GET    /books/{book_id}
+    list    GET    /books?genre=...&page=--deep-page (OFFSET)
+    update  PATCH  /books/{book_id}
+    delete  DELETE /books/{book_id} (книги, созданные сценарием create)
+
+Результат — JSON (--output), ключи отсортированы, чтобы прогоны разных
+коммитов сравнивались diff'ом; --compare печатает изменение относительно
+прежнего результата.
+
+Запуск (из корня проекта, DATABASE_URL из .env):
+    poetry run python -m benchmarks.load --rows 100000 --concurrency 32 --output load.json
+    poetry run python -m benchmarks.load --compare load.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+import httpx
+import uvicorn
+from sqlalchemy import text
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from benchmarks.search_plans import seed
+from src.library_catalog.core.database import dispose_engine, engine
+
+SCENARIOS = ("create", "get", "list", "update", "delete")
+GENRES = ("Fantasy", "Classic", "Science Fiction", "Programming", "History")
+
+
+# ========== OPEN LIBRARY STUB ==========
+
+def openlibrary_stub(latency: float) -> Starlette:
+    """/search.json с постоянным документом после задержки latency секунд."""
+    doc = {
+        "cover_i": 240727,
+        "subject": ["Fiction", "Benchmark"],
+        "publisher": ["Stub Press"],
+        "language": ["eng"],
+        "ratings_average": 4.2,
+    }
+
+    async def search(request: Request) -> JSONResponse:
+        await asyncio.sleep(latency)
+        return JSONResponse({"numFound": 1, "docs": [doc]})
+
+    return Starlette(routes=[Route("/search.json", search)])
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+# ========== APPLICATION ==========
+
+def start_app(port: int, workers: int, openlibrary_url: str) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "OPENLIBRARY_BASE_URL": openlibrary_url,
+        # Кэш обогащения сделал бы заглушку ненужной после первого запроса
+        "OPENLIBRARY_CACHE_ENABLED": "false",
+    }
+    return subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "src.library_catalog.main:app",
+            "--host", "127.0.0.1", "--port", str(port),
+            "--workers", str(workers), "--log-level", "warning", "--no-access-log",
+        ],
+        env=env,
+        # Логи приложения пишутся в stdout; ошибки запуска остаются в stderr
+        stdout=subprocess.DEVNULL,
+    )
+
+
+async def wait_ready(client: httpx.AsyncClient, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            if (await client.get("/")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        if time.monotonic() > deadline:
+            raise SystemExit("Application did not start")
+        await asyncio.sleep(0.2)
+
+
+# ========== SCENARIOS ==========
+
+@dataclass
+class ScenarioResult:
+    latencies: list[float] = field(default_factory=list)
+    statuses: Counter = field(default_factory=Counter)
+    errors: int = 0
+    elapsed: float = 0.0
+
+    def summary(self) -> dict:
+        ms = sorted(latency * 1000 for latency in self.latencies)
+        quantiles = statistics.quantiles(ms, n=100, method="inclusive") if len(ms) > 1 else ms * 99
+        return {
+            "requests": len(ms),
+            "errors": self.errors,
+            "statuses": {str(status): count for status, count in sorted(self.statuses.items())},
+            "throughput_rps": round(len(ms) / self.elapsed, 1) if self.elapsed else 0.0,
+            "latency_ms": {
+                "mean": round(statistics.fmean(ms), 3) if ms else 0.0,
+                "p50": round(quantiles[49], 3) if ms else 0.0,
+                "p95": round(quantiles[94], 3) if ms else 0.0,
+                "p99": round(quantiles[98], 3) if ms else 0.0,
+                "max": round(ms[-1], 3) if ms else 0.0,
+            },
+        }
+
+
+class Workload:
+    """Запросы сценариев; детерминированы при одинаковом --seed."""
+
+    def __init__(self, book_ids: list[str], deep_page: int, page_size: int, seed_value: int):
+        self.book_ids = book_ids
+        self.deep_page = deep_page
+        self.page_size = page_size
+        self.created: list[str] = []
+        self.random = random.Random(seed_value)
+        self._isbn = self.random.randrange(10**9)
+
+    def request(self, scenario: str, i: int) -> tuple[str, str, dict]:
+        """(method, url, kwargs) i-го запроса сценария."""
+        if scenario == "create":
+            self._isbn += 1
+            return "POST", "/api/v1/books/", {"json": {
+                "title": f"Load test book {i}",
+                "author": f"Author {i % 100}",
+                "year": 1950 + i % 70,
+                "genre": GENRES[i % len(GENRES)],
+                "pages": 100 + i % 500,
+                "isbn": f"979{self._isbn % 10**10:010d}",
+            }}
+        if scenario == "get":
+            return "GET", f"/api/v1/books/{self.random.choice(self.book_ids)}", {}
+        if scenario == "list":
+            return "GET", "/api/v1/books/", {"params": {
+                "genre": GENRES[i % len(GENRES)],
+                "page": self.deep_page,
+                "page_size": self.page_size,
+            }}
+        if scenario == "update":
+            return "PATCH", f"/api/v1/books/{self.random.choice(self.book_ids)}", {
+                "json": {"pages": self.random.randint(50, 900)},
+            }
+        if scenario == "delete":
+            return "DELETE", f"/api/v1/books/{self.created[i]}", {}
+        raise ValueError(scenario)
+
+    def requests_for(self, scenario: str, requests: int) -> int:
+        # Удаляются все книги, созданные бенчмарком (и при прогреве), —
+        # следующий прогон с тем же --seed создает те же ISBN
+        return len(self.created) if scenario == "delete" else requests
+
+
+async def run_scenario(
+        client: httpx.AsyncClient,
+        workload: Workload,
+        scenario: str,
+        requests: int,
+        concurrency: int,
+) -> ScenarioResult:
+    result = ScenarioResult()
+    counter = iter(range(requests))
+
+    async def worker() -> None:
+        for i in counter:
+            method, url, kwargs = workload.request(scenario, i)
+            started = time.perf_counter()
+            try:
+                response = await client.request(method, url, **kwargs)
+            except httpx.HTTPError:
+                result.errors += 1
+                continue
+            result.latencies.append(time.perf_counter() - started)
+            result.statuses[response.status_code] += 1
+            if response.status_code >= 400:
+                result.errors += 1
+            elif scenario == "create":
+                workload.created.append(response.json()["book_id"])
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    result.elapsed = time.perf_counter() - started
+    return result
+
+
+# ========== REPORT ==========
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_report(report: dict, baseline: dict | None) -> None:
+    print(f"commit {report['meta']['commit']}, concurrency {report['meta']['concurrency']}")
+    print(f"{'scenario':<8} {'rps':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7}")
+    for name, result in report["scenarios"].items():
+        latency = result["latency_ms"]
+        print(
+            f"{name:<8} {result['throughput_rps']:>9.1f} {latency['p50']:>9.2f}"
+            f" {latency['p95']:>9.2f} {latency['p99']:>9.2f} {result['errors']:>7}"
+        )
+        before = (baseline or {}).get("scenarios", {}).get(name)
+        if before:
+            changes = [
+                f"rps {change(before['throughput_rps'], result['throughput_rps'])}",
+                *(
+                    f"{p} {change(before['latency_ms'][p], latency[p])}"
+                    for p in ("p50", "p95", "p99")
+                ),
+            ]
+            print(f"{'':<8} vs {baseline['meta']['commit']}: {', '.join(changes)}")
+
+
+def change(before: float, after: float) -> str:
+    return f"{(after - before) / before * 100:+.1f}%" if before else "n/a"
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000, help="Минимальный размер таблицы books")
+    parser.add_argument("--requests", type=int, default=2_000, help="Запросов на сценарий")
+    parser.add_argument("--concurrency", type=int, default=32, help="Одновременных клиентов")
+    parser.add_argument("--workers", type=int, default=1, help="Процессов uvicorn")
+    parser.add_argument("--deep-page", type=int, default=200, help="Страница листинга")
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--openlibrary-latency", type=float, default=0.05, help="Задержка заглушки, с")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="Сценарии через запятую")
+    parser.add_argument("--seed", type=int, default=42, help="Seed генератора запросов")
+    parser.add_argument("--output", help="Файл для результата в JSON")
+    parser.add_argument("--compare", help="Прежний результат для сравнения")
+    args = parser.parse_args()
+
+    scenarios = [name for name in SCENARIOS if name in args.scenarios.split(",")]
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    try:
+        await seed(args.rows, batch=100_000)
+        async with engine.connect() as conn:
+            book_ids = [
+                str(book_id) for book_id in (await conn.execute(
+                    text("SELECT book_id FROM books ORDER BY book_id LIMIT 10000")
+                )).scalars()
+            ]
+            # Оставшиеся от прежних прогонов pending-книги воркер обогатит во время замеров
+            pending_books = (await conn.execute(
+                text("SELECT count(*) FROM books WHERE enrichment_status = 'pending'")
+            )).scalar_one()
+    finally:
+        await dispose_engine()
+
+    stub_port, app_port = free_port(), free_port()
+    stub = uvicorn.Server(uvicorn.Config(
+        openlibrary_stub(args.openlibrary_latency), port=stub_port, log_level="warning", access_log=False,
+    ))
+    stub_task = asyncio.create_task(stub.serve())
+    app = start_app(app_port, args.workers, f"http://127.0.0.1:{stub_port}")
+
+    workload = Workload(book_ids, args.deep_page, args.page_size, args.seed)
+    results = {}
+    try:
+        limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+        async with httpx.AsyncClient(
+                base_url=f"http://127.0.0.1:{app_port}", limits=limits, timeout=60.0,
+        ) as client:
+            await wait_ready(client)
+            for scenario in scenarios:
+                # Прогрев: соединения пула, подготовленные запросы
+                if scenario != "delete":
+                    await run_scenario(client, workload, scenario, args.concurrency, args.concurrency)
+                requests = workload.requests_for(scenario, args.requests)
+                result = await run_scenario(client, workload, scenario, requests, args.concurrency)
+                results[scenario] = result.summary()
+    finally:
+        app.terminate()
+        app.wait()
+        stub.should_exit = True
+        await stub_task
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "rows": args.rows,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "workers": args.workers,
+            "deep_page": args.deep_page,
+            "page_size": args.page_size,
+            "openlibrary_latency": args.openlibrary_latency,
+            "pending_books": pending_books,
+            "seed": args.seed,
+        },
+        "scenarios": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+            f.write("\n")
+    print_report(report, baseline)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,152 @@
+"""
+Бенчмарк поиска: планы запросов листинга на большой таблице.
+
+Догружает в books синтетические строки до --rows, выполняет реальные
+запросы BookRepository и печатает EXPLAIN (ANALYZE, BUFFERS) по каждому.
+Код возврата 1, если какой-то поиск читает books последовательным сканом.
+
+Запуск (из корня проекта, DATABASE_URL из .env):
+    poetry run python -m benchmarks.search_plans --rows 1000000
+"""
+
+import argparse
+import asyncio
+import json
+
+from sqlalchemy import event, text
+
+from src.library_catalog.core.database import async_session_maker, dispose_engine, engine
+from src.library_catalog.data.repositories.book_repository import BookRepository
+
+# Сценарии: фильтры find_by_filters
+CASES = {
+    "title substring": {"title": "ring"},
+    "author substring": {"author": "tolst"},
+    "genre substring": {"genre": "fant"},
+    "title + author": {"title": "war", "author": "tolst"},
+    "full-text q": {"q": "dragon"},
+    "full-text phrase": {"q": '"silent river"'},
+}
+
+# Строки сразу not_found: иначе фоновый воркер начнет их обогащать
+SEED_SQL = """
+INSERT INTO books (
+    book_id, title, author, year, genre, pages, available, description,
+    enrichment_status, enriched_at
+)
+SELECT
+    gen_random_uuid(),
+    initcap(w[1 + (i * 7) % array_length(w, 1)] || ' ' || w[1 + (i * 13) % array_length(w, 1)])
+        || ' ' || i,
+    a[1 + (i * 31) % array_length(a, 1)] || ' ' || (i % 5000),
+    1900 + i % 125,
+    g[1 + i % array_length(g, 1)],
+    50 + i % 900,
+    i % 4 <> 0,
+    'The ' || w[1 + (i * 17) % array_length(w, 1)] || ' of the '
+        || w[1 + (i * 19) % array_length(w, 1)] || ' ' || md5(i::text),
+    'not_found',
+    now()
+FROM generate_series(CAST(:start AS integer), CAST(:stop AS integer)) AS i,
+     (SELECT
+        ARRAY['silent', 'river', 'dragon', 'war', 'peace', 'ring', 'shadow', 'garden',
+              'night', 'code', 'stone', 'winter', 'empire', 'ocean', 'forest', 'mirror'] AS w,
+        ARRAY['Tolstoy', 'Dostoevsky', 'Tolkien', 'Martin', 'Orwell', 'Austen',
+              'Pushkin', 'Bulgakov', 'Rowling', 'Pratchett'] AS a,
+        ARRAY['Fantasy', 'Classic', 'Science Fiction', 'Programming', 'History',
+              'Poetry', 'Detective', 'Romance'] AS g
+     ) AS dict
+"""
+
+
+async def seed(rows: int, batch: int) -> None:
+    """Догрузить синтетические книги до rows штук."""
+    async with engine.begin() as conn:
+        current = (await conn.execute(text("SELECT count(*) FROM books"))).scalar_one()
+
+    for start in range(current + 1, rows + 1, batch):
+        stop = min(start + batch - 1, rows)
+        async with engine.begin() as conn:
+            await conn.execute(text(SEED_SQL), {"start": start, "stop": stop})
+        print(f"seeded {stop}/{rows}")
+
+    # VACUUM нельзя выполнять внутри транзакции
+    async with engine.execution_options(isolation_level="AUTOCOMMIT").connect() as conn:
+        await conn.execute(text("VACUUM ANALYZE books"))
+
+
+def scan_nodes(plan: dict) -> list[str]:
+    """Собрать типы узлов плана, читающих таблицы/индексы."""
+    nodes = []
+    if "Relation Name" in plan or "Index Name" in plan:
+        nodes.append(f"{plan['Node Type']} on {plan.get('Index Name') or plan['Relation Name']}")
+    for child in plan.get("Plans", []):
+        nodes.extend(scan_nodes(child))
+    return nodes
+
+
+async def explain_case(name: str, filters: dict) -> dict:
+    """Выполнить поиск через репозиторий и получить план каждого запроса."""
+    captured: list[tuple[str, tuple]] = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        async with async_session_maker() as session:
+            repo = BookRepository(session)
+            await repo.find_by_filters(**filters, limit=20)
+            await repo.count_by_filters(**filters)
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", capture)
+
+    queries = []
+    async with engine.connect() as conn:
+        for statement, parameters in captured:
+            result = await conn.exec_driver_sql(
+                "EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + statement, parameters
+            )
+            plan = result.scalar_one()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            nodes = scan_nodes(plan[0]["Plan"])
+            queries.append({
+                "kind": "count" if "count(" in statement else "page",
+                "execution_ms": plan[0]["Execution Time"],
+                "scans": nodes,
+                "seq_scan": any(node.startswith("Seq Scan on books") for node in nodes),
+            })
+    return {"case": name, "filters": filters, "queries": queries}
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Минимальный размер таблицы books")
+    parser.add_argument("--batch", type=int, default=100_000, help="Строк на один INSERT при сидировании")
+    parser.add_argument("--json", action="store_true", help="Вывести результат в JSON")
+    args = parser.parse_args()
+
+    try:
+        await seed(args.rows, args.batch)
+        results = [await explain_case(name, filters) for name, filters in CASES.items()]
+    finally:
+        await dispose_engine()
+
+    if args.json:
+        print(json.dumps(results, indent=2, ensure_ascii=False))
+    else:
+        for result in results:
+            for query in result["queries"]:
+                mark = "SEQ SCAN" if query["seq_scan"] else "ok"
+                print(
+                    f"{result['case']:<18} {query['kind']:<6} {query['execution_ms']:>10.2f} ms"
+                    f"  [{mark}] {', '.join(query['scans'])}"
+                )
+
+    return 1 if any(q["seq_scan"] for r in results for q in r["queries"]) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(asyncio.run(main()))
@@ -4,9 +4,15 @@ from typing import Annotated
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..core.database import get_db
+from ..core.database import async_session_maker, get_db, read_only_session_maker, request_routing
 from ..data.repositories.book_repository import BookRepository
+from ..domain.services.book_cache import BookCache, MemoryBookCacheBackend
+from ..domain.services.book_export import BookExporter
+from ..domain.services.book_facets import FacetCountsCompactor
 from ..domain.services.book_service import BookService
+from ..domain.services.enrichment import EnrichmentWorker
+from ..domain.services.idempotency import IdempotencyStore
+from ..external.openlibrary.cache import EnrichmentCache, PostgresCacheBackend
 from ..external.openlibrary.client import OpenLibraryClient
 from ..core.config import settings
 
@@ -20,12 +26,104 @@ def get_openlibrary_client() -> OpenLibraryClient:
 
     lru_cache создает клиент один раз и переиспользует.
     """
+    cache = None
+    if settings.openlibrary_cache_enabled:
+        backend = None
+        if settings.openlibrary_cache_backend == "postgres":
+            backend = PostgresCacheBackend(async_session_maker)
+        cache = EnrichmentCache(
+            max_entries=settings.openlibrary_cache_max_entries,
+            ttl=settings.openlibrary_cache_ttl,
+            negative_ttl=settings.openlibrary_cache_negative_ttl,
+            backend=backend,
+        )
+
     return OpenLibraryClient(
         base_url=settings.openlibrary_base_url,
         timeout=settings.openlibrary_timeout,
+        cache=cache,
+        retries=settings.openlibrary_retries,
+        backoff=settings.openlibrary_backoff,
+        retry_budget_ratio=settings.openlibrary_retry_budget_ratio,
+        max_connections=settings.openlibrary_max_connections,
+        max_keepalive_connections=settings.openlibrary_max_keepalive_connections,
+        max_concurrency=settings.openlibrary_max_concurrency,
+        breaker_failure_threshold=settings.openlibrary_breaker_failure_threshold,
+        breaker_recovery_timeout=settings.openlibrary_breaker_recovery_timeout,
+    )
+
+
+@lru_cache
+def get_book_cache() -> BookCache:
+    """
+    Получить singleton кэша книг по ID.
+
+    При book_cache_enabled=False кэш только объединяет одновременные чтения.
+    """
+    backend = None
+    if settings.book_cache_enabled:
+        backend = MemoryBookCacheBackend(
+            max_entries=settings.book_cache_max_entries,
+            ttl=settings.book_cache_ttl,
+        )
+    return BookCache(backend)
+
+
+@lru_cache
+def get_enrichment_worker() -> EnrichmentWorker:
+    """
+    Получить singleton EnrichmentWorker.
+
+    Запускается и останавливается в lifespan приложения.
+    """
+    return EnrichmentWorker(
+        ol_client=get_openlibrary_client(),
+        session_maker=async_session_maker,
+        concurrency=settings.enrichment_workers,
+        queue_size=settings.enrichment_queue_size,
+        max_attempts=settings.enrichment_max_attempts,
+        retry_delay=settings.enrichment_retry_delay,
+        sweep_interval=settings.enrichment_sweep_interval,
+        book_cache=get_book_cache(),
     )
 
 
+@lru_cache
+def get_book_exporter() -> BookExporter:
+    """Получить singleton потоковой выгрузки (работает в собственных сессиях)."""
+    return BookExporter(read_only_session_maker, batch_size=settings.export_batch_size)
+
+
+@lru_cache
+def get_facet_counts_compactor() -> FacetCountsCompactor:
+    """Получить singleton сжатия счетчиков фасетов (запускается в lifespan)."""
+    return FacetCountsCompactor(async_session_maker, interval=settings.facet_counts_compact_interval)
+
+
+@lru_cache
+def get_idempotency_store() -> IdempotencyStore:
+    """Получить singleton хранилища Idempotency-Key (работает в собственных сессиях)."""
+    return IdempotencyStore(
+        async_session_maker,
+        ttl=settings.idempotency_key_ttl,
+        processing_timeout=settings.idempotency_key_processing_timeout,
+    )
+
+
+# ========== DATABASE ROUTING ==========
+
+async def use_read_replica() -> None:
+    """
+    Пометить эндпоинт только читающим: его запросы к БД могут идти на реплику.
+
+    Подключается через dependencies=[Depends(use_read_replica)].
+    Записи все равно уходят на primary.
+    """
+    routing = request_routing.get()
+    if routing is not None:
+        routing.read_only = True
+
+
 # ========== REPOSITORIES ==========
 
 async def get_book_repository(
@@ -43,7 +141,8 @@ async def get_book_repository(
 
 async def get_book_service(
         book_repo: Annotated[BookRepository, Depends(get_book_repository)],
-        ol_client: Annotated[OpenLibraryClient, Depends(get_openlibrary_client)],
+        enrichment_worker: Annotated[EnrichmentWorker, Depends(get_enrichment_worker)],
+        book_cache: Annotated[BookCache, Depends(get_book_cache)],
 ) -> BookService:
     """
     Создать BookService с внедренными зависимостями.
@@ -51,12 +150,14 @@ async def get_book_service(
     FastAPI автоматически разрешит все зависимости:
     1. get_db() создаст AsyncSession
     2. get_book_repository() создаст BookRepository с session
-    3. get_openlibrary_client() вернет singleton клиент
-    4. Все внедрится в BookService
+    3. get_enrichment_worker() вернет singleton фонового обогащения
+    4. get_book_cache() вернет singleton кэша книг
+    5. Все внедрится в BookService
     """
     return BookService(
         book_repository=book_repo,
-        openlibrary_client=ol_client,
+        enrichment_worker=enrichment_worker,
+        book_cache=book_cache,
     )
 
 
@@ -66,4 +167,8 @@ async def get_book_service(
 # async def my_route(service: BookServiceDep):
 BookServiceDep = Annotated[BookService, Depends(get_book_service)]
 BookRepoDep = Annotated[BookRepository, Depends(get_book_repository)]
+OpenLibraryClientDep = Annotated[OpenLibraryClient, Depends(get_openlibrary_client)]
+BookExporterDep = Annotated[BookExporter, Depends(get_book_exporter)]
+IdempotencyStoreDep = Annotated[IdempotencyStore, Depends(get_idempotency_store)]
+
 DbSessionDep = Annotated[AsyncSession, Depends(get_db)]
\ No newline at end of file
@@ -1,59 +1,203 @@
 from uuid import UUID
-from typing import Annotated
+from typing import Annotated, Awaitable, Callable
 
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Header, Query, Request, Response, status
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel
 
 from ..schemas.book import (
+    BookBulkCreate,
+    BookBulkResponse,
+    BookBulkWriteResponse,
     BookCreate,
+    BookFacets,
+    BookLookup,
+    BookLookupResponse,
     BookUpdate,
     ShowBook,
     BookFilters,
+    BookFields,
+    book_projection,
 )
 from ..schemas.common import PaginatedResponse, PaginationParams
-from ...dependencies import BookServiceDep
+from ...dependencies import BookExporterDep, BookServiceDep, IdempotencyStoreDep, use_read_replica
+from ....core.responses import ModelResponse
+from ....domain.services.book_export import MEDIA_TYPES, ExportFormat
+from ....domain.services.idempotency import IdempotencyStore, request_fingerprint
+from ....utils.http_cache import (
+    has_conditions,
+    if_match_tags,
+    is_not_modified,
+    make_etag,
+    validator_headers,
+)
 
 router = APIRouter(prefix="/books", tags=["Books"])
 
+NOT_MODIFIED_RESPONSE = {304: {"description": "Не изменилось (If-None-Match / If-Modified-Since)"}}
+PRECONDITION_FAILED_RESPONSE = {412: {"description": "Книга изменена после чтения (If-Match)"}}
+IDEMPOTENCY_RESPONSES = {
+    409: {"description": "Книга с таким ISBN уже есть, или запрос с этим Idempotency-Key еще выполняется"},
+    422: {"description": "Idempotency-Key уже использован с другим запросом"},
+}
+
+IdempotencyKeyHeader = Annotated[
+    str | None,
+    Header(max_length=255, description="Ключ повтора: запрос с тем же ключом и телом выполняется один раз"),
+]
+
+
+def book_etag(version: int) -> str:
+    """Сильный ETag книги — номер ее версии."""
+    return f'"{version}"'
+
+
+def expected_versions(request: Request) -> list[int] | None:
+    """
+    Версии книги из If-Match; None — запись без условия.
+
+    Теги, не выданные этим API (не номер версии), ни с чем не совпадают.
+    """
+    tags = if_match_tags(request.headers)
+    if tags is None:
+        return None
+    return [int(tag[1:-1]) for tag in tags if tag[1:-1].isdigit() and tag[0] == tag[-1] == '"']
+
+
+async def run_idempotent(
+        request: Request,
+        store: IdempotencyStore,
+        key: str | None,
+        payload: BaseModel,
+        status_code: int,
+        operation: Callable[[], Awaitable[BaseModel]],
+) -> Response:
+    """
+    Выполнить создание с учетом Idempotency-Key.
+
+    Повтор с тем же ключом получает сохраненный ответ с заголовком
+    Idempotent-Replayed: true.
+    """
+    if key is None:
+        return ModelResponse(await operation(), status_code=status_code)
+
+    fingerprint = request_fingerprint(request.method, request.url.path, payload.model_dump(mode="json"))
+    result = await store.run(key, fingerprint, status_code, operation)
+    if result.replayed:
+        return JSONResponse(
+            result.body, status_code=result.status_code, headers={"Idempotent-Replayed": "true"},
+        )
+    return ModelResponse(result.body, status_code=result.status_code)
+
 
 @router.post(
     "/",
     response_model=ShowBook,
     status_code=status.HTTP_201_CREATED,
+    responses=IDEMPOTENCY_RESPONSES,
     summary="Создать книгу",
-    description="Создать новую книгу в каталоге с автоматическим обогащением из Open Library",
+    description="Создать новую книгу в каталоге с фоновым обогащением из Open Library",
 )
 async def create_book(
         book_data: BookCreate,
+        request: Request,
         service: BookServiceDep,
+        idempotency: IdempotencyStoreDep,
+        idempotency_key: IdempotencyKeyHeader = None,
 ):
     """
     Создать новую книгу.
 
-    Автоматически обогащает данные из Open Library API:
+    Книга возвращается сразу с enrichment_status=pending, затем
+    фоновый воркер обогащает ее данными из Open Library API:
     - Обложка книги
     - Темы/subjects
     - Издатель
     - Рейтинг
 
-    Если Open Library недоступен, книга все равно будет создана.
+    Если Open Library недоступен, обогащение повторяется позже.
+
+    С заголовком Idempotency-Key повтор запроса (например, после таймаута)
+    не создает книгу и не запускает обогащение заново, а возвращает
+    первый ответ.
+    """
+    return await run_idempotent(
+        request, idempotency, idempotency_key, book_data, status.HTTP_201_CREATED,
+        lambda: service.create_book(book_data),
+    )
+
+
+@router.post(
+    "/bulk",
+    response_model=BookBulkResponse,
+    responses=IDEMPOTENCY_RESPONSES,
+    summary="Создать книги пакетом",
+    description="Создать до BULK_CREATE_MAX_ITEMS книг одним запросом, обогащение — в фоне",
+)
+async def create_books(
+        books_data: BookBulkCreate,
+        request: Request,
+        service: BookServiceDep,
+        idempotency: IdempotencyStoreDep,
+        idempotency_key: IdempotencyKeyHeader = None,
+):
+    """
+    Создать пакет книг.
+
+    Каждая книга получает свой статус: created, exists, duplicate, invalid.
+    Ошибка одной книги не отменяет остальные.
+
+    Обогащение из Open Library выполняется после ответа и
+    не задерживает вставку.
+
+    Idempotency-Key — как у создания одной книги.
     """
-    return await service.create_book(book_data)
+    return await run_idempotent(
+        request, idempotency, idempotency_key, books_data, status.HTTP_200_OK,
+        lambda: service.create_books(books_data.items),
+    )
+
+
+@router.post(
+    "/lookup",
+    response_model=BookLookupResponse,
+    dependencies=[Depends(use_read_replica)],
+    summary="Получить книги по списку ID и ISBN",
+    description="Пакетное получение до BOOK_LOOKUP_MAX_ITEMS книг одним запросом к БД",
+)
+async def lookup_books(
+        lookup: BookLookup,
+        service: BookServiceDep,
+):
+    """
+    Получить книги по списку ID и ISBN.
+
+    Вместо отдельного GET /books/{book_id} на каждую книгу: книги по ID
+    берутся из того же кэша, остальные читаются одним запросом
+    (book_id = ANY(...) OR isbn = ANY(...)). ISBN сравнивается точно,
+    в том виде, в каком был передан при создании.
+
+    Returns:
+        BookLookupResponse: Найденные книги в порядке запроса
+            и ненайденные ключи
+    """
+    return ModelResponse(await service.lookup_books(lookup.book_ids, lookup.isbns))
 
 
 @router.get(
     "/",
     response_model=PaginatedResponse[ShowBook],
+    responses=NOT_MODIFIED_RESPONSE,
+    dependencies=[Depends(use_read_replica)],
     summary="Получить список книг",
     description="Получить список книг с фильтрацией и пагинацией",
 )
 async def get_books(
+        request: Request,
         service: BookServiceDep,
         pagination: Annotated[PaginationParams, Depends()],
-        title: str | None = Query(None, description="Поиск по названию"),
-        author: str | None = Query(None, description="Поиск по автору"),
-        genre: str | None = Query(None, description="Фильтр по жанру"),
-        year: int | None = Query(None, description="Фильтр по году"),
-        available: bool | None = Query(None, description="Фильтр по доступности"),
+        filters: Annotated[BookFilters, Depends()],
+        book_fields: Annotated[BookFields, Depends()],
 ):
     """
     Получить список книг с фильтрацией.
@@ -64,55 +208,211 @@ async def get_books(
     - genre: точное совпадение
     - year: точное совпадение
     - available: True/False
+    - q: полнотекстовый поиск по title/author/description,
+      результаты отсортированы по релевантности
 
     Пагинация:
     - page: номер страницы (начиная с 1)
     - page_size: размер страницы (1-100, по умолчанию 20)
+    - cursor: next_cursor/prev_cursor из предыдущего ответа. Стоимость
+      страницы не зависит от глубины, вставки не сдвигают страницы.
+      Не поддерживается вместе с q.
+    - count: exact (по умолчанию) | estimated | none — как считать total;
+      использованный режим возвращается в total_mode
+
+    fields: поля книг в ответе через запятую (title,author,year,available);
+    из БД читаются только они, тяжелые description и extra не читаются.
+
+    ETag страницы строится по (book_id, version) ее книг и total;
+    при совпадении с If-None-Match возвращается 304 без тела.
+
+    Ответ сериализуется один раз (ModelResponse), без повторной
+    валидации по response_model.
     """
-    books, total = await service.search_books(
-        title=title,
-        author=author,
-        genre=genre,
-        year=year,
-        available=available,
+    books, total, total_mode, has_more = await service.search_books(
+        **filters.model_dump(),
         limit=pagination.limit,
         offset=pagination.offset,
+        cursor=pagination.decode_cursor(),
+        count=pagination.count,
+        fields=book_fields.parse(),
     )
 
-    return PaginatedResponse.create(books, total, pagination)
+    etag = make_etag(
+        total, total_mode, has_more,
+        *(f"{book.book_id}:{book.version}" for book in books),
+    )
+    headers = validator_headers(etag)
+    if is_not_modified(request.headers, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    page = PaginatedResponse.create(
+        books, total, pagination, has_more, cursors=not filters.q, total_mode=total_mode,
+    )
+    return ModelResponse(page, headers=headers)
+
+
+@router.patch(
+    "/",
+    response_model=BookBulkWriteResponse,
+    summary="Обновить книги по фильтрам",
+    description="Изменить все книги, подходящие под фильтры листинга",
+)
+async def update_books(
+        book_data: BookUpdate,
+        service: BookServiceDep,
+        filters: Annotated[BookFilters, Depends()],
+        dry_run: bool = Query(False, description="Только посчитать подходящие книги"),
+):
+    """
+    Обновить книги по фильтрам.
+
+    Фильтры те же, что у списка книг; нужен хотя бы один. Книги не читаются
+    и не обновляются по одной: изменение выполняется UPDATE по фильтрам
+    пачками до BULK_WRITE_CHUNK_SIZE книг (каждая пачка — своя транзакция),
+    версия каждой книги увеличивается.
+
+    Returns:
+        BookBulkWriteResponse: Сколько книг изменено (при dry_run — подходит)
+
+    Raises:
+        400: Нет фильтров или невалидные данные
+    """
+    return await service.update_books(book_data, dry_run, **filters.model_dump())
+
+
+@router.delete(
+    "/",
+    response_model=BookBulkWriteResponse,
+    summary="Удалить книги по фильтрам",
+    description="Удалить все книги, подходящие под фильтры листинга",
+)
+async def delete_books(
+        service: BookServiceDep,
+        filters: Annotated[BookFilters, Depends()],
+        dry_run: bool = Query(False, description="Только посчитать подходящие книги"),
+):
+    """
+    Удалить книги по фильтрам.
+
+    Фильтры те же, что у списка книг; нужен хотя бы один. Удаление —
+    DELETE по фильтрам пачками до BULK_WRITE_CHUNK_SIZE книг.
+
+    Returns:
+        BookBulkWriteResponse: Сколько книг удалено (при dry_run — подходит)
+
+    Raises:
+        400: Нет фильтров
+    """
+    return await service.delete_books(dry_run, **filters.model_dump())
+
+
+@router.get(
+    "/facets",
+    response_model=BookFacets,
+    dependencies=[Depends(use_read_replica)],
+    summary="Фасеты поиска",
+    description="Количества книг по жанрам, десятилетиям, авторам и доступности для фильтров",
+)
+async def get_book_facets(
+        service: BookServiceDep,
+        filters: Annotated[BookFilters, Depends()],
+        limit: int = Query(10, ge=1, le=100, description="Значений в каждом фасете"),
+):
+    """
+    Получить фасеты для текущих фильтров.
+
+    Фильтры те же, что у списка книг. Вместо отдельного запроса
+    с подсчетом на каждое значение все фасеты и total считаются за один
+    проход; без фильтров — из счетчиков, которые триггеры поддерживают
+    в актуальном состоянии при каждой записи книг.
+    """
+    return ModelResponse(await service.get_facets(limit, **filters.model_dump()))
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    responses={200: {"content": {media_type: {} for media_type in MEDIA_TYPES.values()}}},
+    summary="Выгрузить книги",
+    description="Потоковая выгрузка всех книг по фильтрам в NDJSON или CSV",
+)
+async def export_books(
+        exporter: BookExporterDep,
+        filters: Annotated[BookFilters, Depends()],
+        export_format: ExportFormat = Query("ndjson", alias="format", description="ndjson или csv"),
+):
+    """
+    Выгрузить книги.
+
+    Фильтры те же, что у списка книг, но без пагинации и подсчета total:
+    отдаются все подходящие книги в порядке листинга. Ответ передается
+    частями по мере чтения из БД, память сервера не зависит от объема выгрузки.
+    Если клиент читает медленно, чтение из БД приостанавливается.
+    """
+    return StreamingResponse(
+        exporter.stream(export_format, **filters.model_dump()),
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="books.{export_format}"'},
+    )
 
 
 @router.get(
     "/{book_id}",
     response_model=ShowBook,
+    responses=NOT_MODIFIED_RESPONSE,
+    dependencies=[Depends(use_read_replica)],
     summary="Получить книгу",
     description="Получить информацию о конкретной книге по ID",
 )
 async def get_book(
         book_id: UUID,
+        request: Request,
         service: BookServiceDep,
+        book_fields: Annotated[BookFields, Depends()],
 ):
     """
     Получить книгу по ID.
 
+    Ответ содержит ETag (версия книги) и Last-Modified. Для условного запроса
+    (If-None-Match / If-Modified-Since) сначала проверяется только версия
+    книги (кэш или узкий запрос), и при совпадении возвращается 304.
+
+    fields: поля книги в ответе через запятую. Книга читается целиком
+    (через общий кэш книг), проекция применяется к ответу.
+
     Returns:
         ShowBook: Полная информация о книге
 
     Raises:
         404: Книга не найдена
     """
-    return await service.get_book(book_id)
+    fields = book_fields.parse()
+    if has_conditions(request.headers):
+        version, updated_at = await service.get_book_version(book_id)
+        headers = validator_headers(book_etag(version), updated_at)
+        if is_not_modified(request.headers, headers["ETag"], updated_at):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    book = await service.get_book(book_id)
+    headers = validator_headers(book_etag(book.version), book.updated_at)
+    if fields:
+        return ModelResponse(book_projection(fields).model_validate(book), headers=headers)
+    return ModelResponse(book, headers=headers)
 
 
 @router.patch(
     "/{book_id}",
     response_model=ShowBook,
+    responses=PRECONDITION_FAILED_RESPONSE,
     summary="Обновить книгу",
     description="Частичное обновление книги (передаются только изменяемые поля)",
 )
 async def update_book(
         book_id: UUID,
         book_data: BookUpdate,
+        request: Request,
+        response: Response,
         service: BookServiceDep,
 ):
     """
@@ -121,30 +421,41 @@ async def update_book(
     Передаются только те поля, которые нужно изменить.
     Остальные поля остаются без изменений.
 
+    С If-Match (ETag из GET) книга обновляется, только если ее не изменили
+    после чтения; иначе — 412, и клиент перечитывает книгу.
+
     Returns:
-        ShowBook: Обновленная книга
+        ShowBook: Обновленная книга (с новым ETag)
 
     Raises:
         404: Книга не найдена
         400: Невалидные данные
+        412: Версия книги не совпала с If-Match
     """
-    return await service.update_book(book_id, book_data)
+    book = await service.update_book(book_id, book_data, expected_versions(request))
+    response.headers.update(validator_headers(book_etag(book.version), book.updated_at))
+    return book
 
 
 @router.delete(
     "/{book_id}",
     status_code=status.HTTP_204_NO_CONTENT,
+    responses=PRECONDITION_FAILED_RESPONSE,
     summary="Удалить книгу",
     description="Удалить книгу из каталога",
 )
 async def delete_book(
         book_id: UUID,
+        request: Request,
         service: BookServiceDep,
 ):
     """
     Удалить книгу.
 
+    С If-Match книга удаляется, только если ее версия совпадает.
+
     Raises:
         404: Книга не найдена
+        412: Версия книги не совпала с If-Match
     """
-    await service.delete_book(book_id)
\ No newline at end of file
+    await service.delete_book(book_id, expected_versions(request))
\ No newline at end of file
@@ -2,8 +2,13 @@ from fastapi import APIRouter, Depends
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..schemas.common import HealthCheckResponse
-from ...dependencies import DbSessionDep
+from ..schemas.common import (
+    DatabasePoolStatusResponse,
+    HealthCheckResponse,
+    OpenLibraryStatusResponse,
+)
+from ....core.database import pool_stats, replicas
+from ...dependencies import DbSessionDep, OpenLibraryClientDep
 
 router = APIRouter(prefix="/health", tags=["Health"])
 
@@ -32,4 +37,34 @@ async def health_check(db: DbSessionDep):
     return HealthCheckResponse(
         status="healthy",
         database=db_status,
-    )
\ No newline at end of file
+    )
+
+
+@router.get(
+    "/openlibrary",
+    response_model=OpenLibraryStatusResponse,
+    summary="Open Library",
+    description="Кэш, повторы и circuit breaker клиента Open Library (в пределах процесса)",
+)
+async def openlibrary_status(ol_client: OpenLibraryClientDep):
+    """Состояние клиента Open Library."""
+    return OpenLibraryStatusResponse(
+        cache=ol_client.cache.stats() if ol_client.cache else None,
+        **ol_client.resilience_stats(),
+    )
+
+
+@router.get(
+    "/pool",
+    response_model=DatabasePoolStatusResponse,
+    summary="Пулы соединений",
+    description="Занятость пулов соединений с БД и время ожидания соединения (в пределах процесса)",
+)
+async def pool_status():
+    """
+    Состояние пулов соединений.
+
+    Растущие waiting, timeouts и хвост wait_time означают, что запросы
+    ждут соединения: пул процесса мал для нагрузки.
+    """
+    return DatabasePoolStatusResponse(pools=pool_stats(), replicas=replicas.stats())
@@ -1,6 +1,11 @@
 from datetime import datetime
+from functools import lru_cache
+from typing import Literal
 from uuid import UUID
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, create_model, field_validator, model_validator
+
+from ....core.config import settings
+from ....domain.exceptions import InvalidFieldsException
 
 
 class BookBase(BaseModel):
@@ -73,6 +78,9 @@ class ShowBook(BookBase):
     isbn: str | None
     description: str | None
     extra: dict | None
+    enrichment_status: Literal["pending", "done", "not_found", "failed"]
+    enriched_at: datetime | None
+    version: int
     created_at: datetime
     updated_at: datetime
 
@@ -94,6 +102,9 @@ class ShowBook(BookBase):
                         "cover_url": "https://covers.openlibrary.org/b/id/123-L.jpg",
                         "subjects": ["Computer Science", "Software Engineering"]
                     },
+                    "enrichment_status": "done",
+                    "enriched_at": "2024-01-01T12:00:02",
+                    "version": 2,
                     "created_at": "2024-01-01T12:00:00",
                     "updated_at": "2024-01-01T12:00:00"
                 }
@@ -102,10 +113,176 @@ class ShowBook(BookBase):
     }
 
 
+# Поля, которые проекция загружает всегда (в ответ — только если запрошены):
+# ключ курсора (created_at, book_id) и версия для ETag
+PROJECTION_REQUIRED_FIELDS = ("book_id", "created_at", "version")
+
+
+class BookFields(BaseModel):
+    """Выбор полей книги в ответе (sparse fieldset)."""
+    fields: str | None = Field(
+        None,
+        description="Поля книги через запятую, например title,author,year,available; "
+                    "по умолчанию — все",
+    )
+
+    def parse(self) -> tuple[str, ...] | None:
+        """
+        Разобрать список полей.
+
+        Raises:
+            InvalidFieldsException: Если поле не из ShowBook
+        """
+        if self.fields is None:
+            return None
+        names = tuple(dict.fromkeys(name.strip() for name in self.fields.split(",") if name.strip()))
+        unknown = [name for name in names if name not in ShowBook.model_fields]
+        if unknown or not names:
+            raise InvalidFieldsException(unknown, list(ShowBook.model_fields))
+        if set(names) == set(ShowBook.model_fields):
+            return None
+        return names
+
+
+@lru_cache(maxsize=256)
+def book_projection(fields: tuple[str, ...]) -> type[BaseModel]:
+    """
+    Модель ответа с подмножеством полей ShowBook.
+
+    Обязательные для курсора и ETag поля есть в модели всегда,
+    но сериализуются, только если запрошены.
+    """
+    definitions = {}
+    for name, field in ShowBook.model_fields.items():
+        if name in fields:
+            definitions[name] = (field.annotation, field)
+        elif name in PROJECTION_REQUIRED_FIELDS:
+            definitions[name] = (field.annotation, Field(exclude=True))
+    return create_model(
+        "ShowBookFields",
+        __config__=ConfigDict(from_attributes=True),
+        **definitions,
+    )
+
+
+def projection_columns(fields: tuple[str, ...]) -> tuple[str, ...]:
+    """Колонки books, которые нужно прочитать для проекции."""
+    return tuple(dict.fromkeys((*PROJECTION_REQUIRED_FIELDS, *fields)))
+
+
 class BookFilters(BaseModel):
     """Фильтры для поиска книг."""
     title: str | None = Field(None, description="Поиск по названию (частичное совпадение)")
     author: str | None = Field(None, description="Поиск по автору (частичное совпадение)")
-    genre: str | None = Field(None, description="Точное совпадение жанра")
+    genre: str | None = Field(None, description="Фильтр по жанру")
     year: int | None = Field(None, description="Точное совпадение года")
-    available: bool | None = Field(None, description="Фильтр по доступности")
\ No newline at end of file
+    available: bool | None = Field(None, description="Фильтр по доступности")
+    q: str | None = Field(None, description="Полнотекстовый поиск по названию, автору и описанию")
+    subject: str | None = Field(None, description="Тема из Open Library (точное совпадение)")
+    language: str | None = Field(None, description="Код языка из Open Library, например eng")
+    publisher: str | None = Field(None, description="Издатель из Open Library (точное совпадение)")
+
+    @field_validator("q")
+    @classmethod
+    def empty_query_is_none(cls, v: str | None) -> str | None:
+        """Пустой q — без полнотекстового поиска (порядок листинга и курсоры сохраняются)."""
+        if v is None or not v.strip():
+            return None
+        return v
+
+
+class FacetBucket(BaseModel):
+    """Значение фасета и число книг с ним."""
+    value: str | int | bool
+    count: int
+
+
+class BookFacets(BaseModel):
+    """
+    Количества книг по значениям фасетов для текущих фильтров.
+
+    source:
+    - precomputed: без фильтров — из поддерживаемых триггерами счетчиков
+    - query: по фильтрам — одним запросом к books
+    """
+    total: int = Field(..., description="Книг по фильтрам")
+    genre: list[FacetBucket]
+    decade: list[FacetBucket] = Field(..., description="Год, округленный вниз до десятилетия")
+    author: list[FacetBucket]
+    available: list[FacetBucket]
+    source: Literal["precomputed", "query"]
+
+
+class BookBulkCreate(BaseModel):
+    """Схема для пакетного создания книг."""
+    items: list[BookCreate] = Field(
+        ...,
+        min_length=1,
+        max_length=settings.bulk_create_max_items,
+        description="Книги для создания",
+    )
+
+
+class BookBulkWriteResponse(BaseModel):
+    """Ответ на изменение или удаление книг по фильтрам."""
+    count: int = Field(..., description="Изменено (удалено) книг; при dry_run — подходит под фильтры")
+    dry_run: bool
+
+
+class BookLookup(BaseModel):
+    """Схема для пакетного получения книг по ID и ISBN."""
+    book_ids: list[UUID] = Field(
+        default_factory=list,
+        max_length=settings.book_lookup_max_items,
+        description="ID книг",
+    )
+    isbns: list[str] = Field(
+        default_factory=list,
+        max_length=settings.book_lookup_max_items,
+        description="ISBN книг",
+    )
+
+    @model_validator(mode="after")
+    def check_size(self) -> "BookLookup":
+        keys = len(self.book_ids) + len(self.isbns)
+        if keys == 0:
+            raise ValueError("book_ids or isbns must not be empty")
+        if keys > settings.book_lookup_max_items:
+            raise ValueError(f"At most {settings.book_lookup_max_items} book_ids and isbns in total")
+        return self
+
+
+class BookLookupResponse(BaseModel):
+    """
+    Ответ на пакетное получение книг.
+
+    items — в порядке запроса: сначала найденные по book_ids, затем по isbns;
+    книга, запрошенная несколько раз, возвращается один раз.
+    """
+    items: list[ShowBook]
+    missing_book_ids: list[UUID] = Field(..., description="Не найденные ID")
+    missing_isbns: list[str] = Field(..., description="Не найденные ISBN")
+
+
+class BookBulkItemResult(BaseModel):
+    """
+    Результат создания одной книги из пакета.
+
+    status:
+    - created: книга создана
+    - exists: книга с таким ISBN уже есть в каталоге
+    - duplicate: ISBN повторяется внутри пакета (создана первая книга)
+    - invalid: нарушены бизнес-правила (см. error)
+    """
+    index: int = Field(..., description="Позиция книги в запросе")
+    status: Literal["created", "exists", "duplicate", "invalid"]
+    book_id: UUID | None = None
+    isbn: str | None = None
+    error: str | None = None
+
+
+class BookBulkResponse(BaseModel):
+    """Ответ на пакетное создание книг."""
+    created: int = Field(..., description="Создано книг")
+    failed: int = Field(..., description="Не создано книг")
+    items: list[BookBulkItemResult]
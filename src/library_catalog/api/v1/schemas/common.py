@@ -1,13 +1,71 @@
-from typing import Generic, TypeVar
+import base64
+import binascii
+from datetime import datetime
+from typing import Generic, Literal, TypeVar
+from uuid import UUID
+
 from pydantic import BaseModel, Field
 
+from ....domain.exceptions import InvalidCursorException
+
 T = TypeVar('T')
 
+# Способ получения total в пагинированном ответе
+CountMode = Literal["exact", "estimated", "none"]
+
+
+class PageCursor(BaseModel):
+    """
+    Позиция в keyset-пагинации.
+
+    Указывает на граничную запись страницы по ключу сортировки
+    (created_at, book_id) и направление, в котором читать дальше.
+    """
+    created_at: datetime
+    book_id: UUID
+    backward: bool = False
+
+    def encode(self) -> str:
+        """Закодировать курсор в непрозрачную строку для клиента."""
+        raw = self.model_dump_json().encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, token: str) -> "PageCursor":
+        """
+        Раскодировать курсор, полученный от клиента.
+
+        Raises:
+            InvalidCursorException: Если строка не является курсором
+        """
+        try:
+            padded = token + "=" * (-len(token) % 4)
+            return cls.model_validate_json(base64.urlsafe_b64decode(padded))
+        except (ValueError, binascii.Error):
+            raise InvalidCursorException(token)
+
+    @classmethod
+    def from_item(cls, item, backward: bool = False) -> "PageCursor":
+        """Построить курсор, указывающий на запись."""
+        return cls(
+            created_at=item.created_at,
+            book_id=item.book_id,
+            backward=backward,
+        )
+
 
 class PaginationParams(BaseModel):
     """Параметры пагинации."""
     page: int = Field(1, ge=1, description="Номер страницы")
     page_size: int = Field(20, ge=1, le=100, description="Размер страницы")
+    cursor: str | None = Field(
+        None,
+        description="Курсор next_cursor/prev_cursor из предыдущего ответа (вместо page)",
+    )
+    count: CountMode = Field(
+        "exact",
+        description="Подсчет total: exact — точно, estimated — оценка планировщика, none — без total",
+    )
 
     @property
     def offset(self) -> int:
@@ -19,35 +77,96 @@ class PaginationParams(BaseModel):
         """Limit для SQL."""
         return self.page_size
 
+    def decode_cursor(self) -> PageCursor | None:
+        """Раскодировать курсор, если он передан."""
+        if self.cursor is None:
+            return None
+        return PageCursor.decode(self.cursor)
+
 
 class PaginatedResponse(BaseModel, Generic[T]):
     """Generic схема для пагинированных ответов."""
     items: list[T]
-    total: int = Field(..., description="Всего элементов")
-    page: int = Field(..., description="Текущая страница")
+    total: int | None = Field(..., description="Всего элементов (None при count=none)")
+    total_mode: CountMode = Field("exact", description="Как получен total")
+    page: int | None = Field(..., description="Текущая страница (None в режиме курсора)")
     page_size: int = Field(..., description="Размер страницы")
-    pages: int = Field(..., description="Всего страниц")
+    pages: int | None = Field(..., description="Всего страниц (None при count=none)")
+    has_next: bool = Field(False, description="Есть ли следующая страница")
+    next_cursor: str | None = Field(None, description="Курсор следующей страницы")
+    prev_cursor: str | None = Field(None, description="Курсор предыдущей страницы")
 
     @classmethod
     def create(
             cls,
             items: list[T],
-            total: int,
+            total: int | None,
             pagination: PaginationParams,
+            has_more: bool = False,
+            cursors: bool = True,
+            total_mode: CountMode = "exact",
     ):
-        """Создать пагинированный ответ."""
-        pages = (total + pagination.page_size - 1) // pagination.page_size
+        """
+        Создать пагинированный ответ.
+
+        has_more — есть ли записи дальше в направлении чтения
+        (вперед для page/next_cursor, назад для prev_cursor).
+        cursors=False — не выдавать курсоры (порядок не по ключу курсора).
+        """
+        pages = None
+        if total is not None:
+            pages = (total + pagination.page_size - 1) // pagination.page_size
+        cursor = pagination.decode_cursor()
+
+        if cursor is not None and cursor.backward:
+            has_next, has_prev = True, has_more
+        else:
+            has_next = has_more
+            has_prev = cursor is not None or pagination.page > 1
+
+        next_cursor = prev_cursor = None
+        if items and cursors:
+            if has_next:
+                next_cursor = PageCursor.from_item(items[-1]).encode()
+            if has_prev:
+                prev_cursor = PageCursor.from_item(items[0], backward=True).encode()
 
         return cls(
             items=items,
             total=total,
-            page=pagination.page,
+            total_mode=total_mode,
+            page=pagination.page if cursor is None else None,
             page_size=pagination.page_size,
             pages=pages,
+            has_next=has_next and bool(items),
+            next_cursor=next_cursor,
+            prev_cursor=prev_cursor,
         )
 
 
 class HealthCheckResponse(BaseModel):
     """Схема для health check."""
     status: str = "healthy"
-    database: str = "connected"
\ No newline at end of file
+    database: str = "connected"
+
+
+class OpenLibraryStatusResponse(BaseModel):
+    """Схема для состояния клиента Open Library."""
+    cache: dict[str, int] | None = Field(None, description="Счетчики кэша (None — кэш выключен)")
+    requests: int = Field(0, description="Запросов к API")
+    retries: int = Field(0, description="Повторов")
+    retries_denied: int = Field(0, description="Повторов, отклоненных бюджетом")
+    failures: int = Field(0, description="Сбоев (таймауты, сетевые ошибки, 5xx)")
+    circuit_breaker: dict = Field(default_factory=dict, description="Состояние circuit breaker")
+
+
+class DatabasePoolStatusResponse(BaseModel):
+    """Схема для состояния пулов соединений с БД (в пределах процесса)."""
+    pools: dict[str, dict] = Field(
+        ...,
+        description=(
+            "Пулы по имени (primary, replica_N): size, checked_out, checked_in, overflow, "
+            "waiting, timeouts и распределение ожидания соединения wait_time"
+        ),
+    )
+    replicas: list[dict] = Field(default_factory=list, description="Отставание и здоровье реплик")
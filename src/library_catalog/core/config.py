@@ -1,6 +1,6 @@
 from typing import Literal
 
-from pydantic import PostgresDsn
+from pydantic import PostgresDsn, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from functools import lru_cache
 
@@ -12,13 +12,82 @@ class Settings(BaseSettings):
     debug: bool
     database_url: PostgresDsn
     database_pool_size: int = 20
+    # Пул соединений и драйвер asyncpg (на каждый процесс и каждую БД)
+    database_max_overflow: int = 10
+    database_pool_timeout: float = 30.0
+    database_pool_recycle: int = 1800  # -1 — не пересоздавать соединения
+    database_pool_pre_ping: bool = False
+    # Кэш подготовленных запросов; 0 — для PgBouncer в режиме transaction
+    database_statement_cache_size: int = 100
+    database_command_timeout: float | None = None
+    # Реплики для чтения (JSON-список DSN); пусто — все идет на primary
+    database_replica_urls: list[PostgresDsn] = []
+    database_replica_max_lag: float = 5.0
+    database_replica_check_interval: float = 5.0
+    # После записи клиент читает с primary столько секунд (не меньше max_lag)
+    database_sticky_seconds: float = 5.0
+    # Запросы дольше (секунды) пишутся в лог с параметрами; None — не логировать
+    database_slow_query_threshold: float | None = 0.5
+    # План медленного SELECT в логе: plan — EXPLAIN, analyze — EXPLAIN ANALYZE
+    # (повторное выполнение; только development или DEBUG)
+    database_slow_query_explain: Literal["off", "plan", "analyze"] = "off"
+    # Предупреждение, если HTTP запрос выполнил больше запросов к БД
+    database_request_query_budget: int | None = None
+    # Предупреждение о вероятном N+1: один запрос повторился столько раз за HTTP запрос
+    database_repeated_query_threshold: int = 10
     api_v1_prefix: str = "/api/v1"
     log_level: str = "INFO"
     docs_url: str = "/docs"
     redoc_url: str = "/redoc"
     cors_origins: list[str] = ["*"]
+    # count=estimated: ниже этой оценки total все равно считается точно
+    count_estimate_threshold: int = 10_000
     openlibrary_base_url: str = "https://openlibrary.org"
     openlibrary_timeout: float = 10.0
+    openlibrary_retries: int = 3
+    openlibrary_backoff: float = 0.5
+    openlibrary_retry_budget_ratio: float = 0.2
+    openlibrary_max_connections: int = 20
+    openlibrary_max_keepalive_connections: int = 10
+    openlibrary_max_concurrency: int = 10
+    openlibrary_breaker_failure_threshold: int = 5
+    openlibrary_breaker_recovery_timeout: float = 30.0
+    # Кэш результатов Open Library (промахи живут negative_ttl)
+    openlibrary_cache_enabled: bool = True
+    openlibrary_cache_backend: Literal["memory", "postgres"] = "memory"
+    openlibrary_cache_max_entries: int = 10_000
+    openlibrary_cache_ttl: float = 7 * 24 * 3600
+    openlibrary_cache_negative_ttl: float = 3600
+    # Фоновое обогащение из Open Library
+    enrichment_workers: int = 4
+    enrichment_queue_size: int = 10_000
+    enrichment_max_attempts: int = 5
+    enrichment_retry_delay: float = 300.0
+    enrichment_sweep_interval: float = 30.0
+    enrichment_drain_timeout: float = 20.0
+    # POST /books/bulk
+    bulk_create_max_items: int = 5_000
+    bulk_insert_batch_size: int = 500
+    # PATCH/DELETE /books по фильтрам: строк в одной транзакции
+    bulk_write_chunk_size: int = 10_000
+    # POST /books/lookup: максимум ID и ISBN в одном запросе
+    book_lookup_max_items: int = 500
+    # Idempotency-Key у POST /books и /books/bulk: сколько хранить ответ
+    # и через сколько освободить ключ запроса, не завершившегося за это время
+    idempotency_key_ttl: float = 24 * 3600
+    idempotency_key_processing_timeout: float = 60.0
+    # GET /books/facets: как часто сворачивать приращения счетчиков фасетов
+    facet_counts_compact_interval: float = 60.0
+    # GET /books/export: строк в одной пачке серверного курсора
+    export_batch_size: int = 1_000
+    # Кэш GET /books/{book_id}; сброс при изменении — только в своем процессе,
+    # поэтому при нескольких воркерах устаревание ограничено ttl
+    book_cache_enabled: bool = True
+    book_cache_max_entries: int = 10_000
+    book_cache_ttl: float = 60.0
+    # Файл с ID популярных книг: пишется при остановке, читается при старте
+    book_cache_warmup_file: str | None = None
+    book_cache_warmup_size: int = 1_000
 
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -27,6 +96,20 @@ class Settings(BaseSettings):
         extra="ignore",
     )
 
+    @model_validator(mode="after")
+    def check_slow_query_explain(self) -> "Settings":
+        # EXPLAIN ANALYZE повторно выполняет каждый медленный SELECT —
+        # как раз тогда, когда БД и так перегружена
+        if (
+                self.database_slow_query_explain == "analyze"
+                and self.environment != "development"
+                and not self.debug
+        ):
+            raise ValueError(
+                "DATABASE_SLOW_QUERY_EXPLAIN=analyze is allowed only in development or with DEBUG"
+            )
+        return self
+
     @property
     def is_production(self) -> bool:
         return self.environment == "production"
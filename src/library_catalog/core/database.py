@@ -1,28 +1,247 @@
-from typing import AsyncGenerator
+import asyncio
+import itertools
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import AsyncGenerator, Iterator
 
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine, AsyncSession, create_async_engine, async_sessionmaker,
+)
+from sqlalchemy.orm import DeclarativeBase, Session
+from sqlalchemy.sql.dml import UpdateBase
 
 from src.library_catalog.core.config import settings
+from src.library_catalog.core.pool import InstrumentedAsyncPool
+from src.library_catalog.core.queries import instrument_queries
+
+logger = logging.getLogger(__name__)
 
 
 class Base(DeclarativeBase):
     pass
 
-# Создать engine
-engine = create_async_engine(
-    settings.database_url.unicode_string(),
-    pool_size=settings.database_pool_size,
-    echo=settings.debug,
+
+def create_engine_from_settings(url: str) -> AsyncEngine:
+    """Engine с настройками пула и драйвера из Settings."""
+    connect_args = {
+        # Кэш asyncpg и кэш подготовленных запросов адаптера SQLAlchemy
+        "statement_cache_size": settings.database_statement_cache_size,
+        "prepared_statement_cache_size": settings.database_statement_cache_size,
+    }
+    if settings.database_command_timeout is not None:
+        connect_args["command_timeout"] = settings.database_command_timeout
+
+    engine = create_async_engine(
+        url,
+        poolclass=InstrumentedAsyncPool,
+        pool_size=settings.database_pool_size,
+        max_overflow=settings.database_max_overflow,
+        pool_timeout=settings.database_pool_timeout,
+        pool_recycle=settings.database_pool_recycle,
+        pool_pre_ping=settings.database_pool_pre_ping,
+        connect_args=connect_args,
+        echo=settings.debug,
+    )
+    instrument_queries(
+        engine,
+        slow_query_threshold=settings.database_slow_query_threshold,
+        explain=settings.database_slow_query_explain,
+    )
+    return engine
+
+
+# Создать engine (primary)
+engine = create_engine_from_settings(settings.database_url.unicode_string())
+
+
+# ========== READ REPLICAS ==========
+
+@dataclass
+class RequestRouting:
+    """Маршрутизация запросов к БД в рамках одного HTTP запроса."""
+    read_only: bool = False
+    """Эндпоинт только читает — чтения можно отправить на реплику."""
+    sticky: bool = False
+    """Клиент недавно писал — читать с primary, чтобы он видел свои изменения."""
+    wrote: bool = False
+    """В этом запросе была запись в primary."""
+
+
+request_routing: ContextVar[RequestRouting | None] = ContextVar("request_routing", default=None)
+_primary_reads: ContextVar[bool] = ContextVar("primary_reads", default=False)
+
+
+@contextmanager
+def primary_reads(enabled: bool = True) -> Iterator[None]:
+    """Внутри блока все запросы текущей задачи идут на primary."""
+    token = _primary_reads.set(enabled)
+    try:
+        yield
+    finally:
+        _primary_reads.reset(token)
+
+
+class ReplicaSet:
+    """
+    Реплики для чтения с фоновой проверкой здоровья и отставания.
+
+    Реплика получает чтения, только если последняя проверка прошла успешно
+    и отставание не больше max_lag секунд. До первой проверки и когда
+    здоровых реплик нет, чтения идут на primary.
+    """
+
+    LAG_SQL = text(
+        "SELECT CASE"
+        " WHEN NOT pg_is_in_recovery() THEN 0"
+        " WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0"
+        " ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)"
+        " END"
+    )
+
+    def __init__(
+            self,
+            engines: list[AsyncEngine],
+            max_lag: float = 5.0,
+            check_interval: float = 5.0,
+    ):
+        self.engines = engines
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self._lags: dict[int, float | None] = {i: None for i in range(len(engines))}
+        self._healthy: list[AsyncEngine] = []
+        self._next = itertools.count()
+        self._task: asyncio.Task | None = None
+
+    def choose(self) -> AsyncEngine | None:
+        """Следующая здоровая реплика (round-robin) или None."""
+        healthy = self._healthy
+        if not healthy:
+            return None
+        return healthy[next(self._next) % len(healthy)]
+
+    async def check(self) -> None:
+        """Проверить все реплики и обновить список здоровых."""
+        lags = await asyncio.gather(*(self._lag(replica) for replica in self.engines))
+        self._lags = dict(enumerate(lags))
+        self._healthy = [
+            replica for replica, lag in zip(self.engines, lags)
+            if lag is not None and lag <= self.max_lag
+        ]
+
+    async def start(self) -> None:
+        """Запустить периодическую проверку (первая — сразу)."""
+        if self.engines and self._task is None:
+            await self.check()
+            self._task = asyncio.create_task(self._run(), name="replica-health")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def stats(self) -> list[dict]:
+        """Состояние реплик: отставание (None — недоступна) и годность для чтения."""
+        return [
+            {
+                "url": replica.url.render_as_string(hide_password=True),
+                "lag_seconds": self._lags[i],
+                "healthy": replica in self._healthy,
+            }
+            for i, replica in enumerate(self.engines)
+        ]
+
+    async def _lag(self, replica: AsyncEngine) -> float | None:
+        """Отставание реплики в секундах или None, если она недоступна."""
+        try:
+            async with asyncio.timeout(self.check_interval):
+                async with replica.connect() as conn:
+                    return float((await conn.execute(self.LAG_SQL)).scalar_one())
+        except Exception as e:
+            logger.warning("Read replica check failed: %s", e)
+            return None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.check_interval)
+            await self.check()
+
+
+replicas = ReplicaSet(
+    [create_engine_from_settings(url.unicode_string()) for url in settings.database_replica_urls],
+    max_lag=settings.database_replica_max_lag,
+    check_interval=settings.database_replica_check_interval,
 )
 
+
+class RoutingSession(Session):
+    """
+    Сессия, разделяющая чтение и запись.
+
+    На primary идут: flush, INSERT/UPDATE/DELETE, SELECT ... FOR UPDATE,
+    операторы с execution_options(writes=True) (SELECT над записывающим
+    CTE) и все запросы сессии после первой записи. Чтения идут на реплику, если
+    сессия создана с info={"read_only": True} или эндпоинт помечен
+    только читающим (RequestRouting.read_only), клиент не писал недавно
+    (sticky), запрос не внутри primary_reads() и есть здоровая реплика.
+    Одна сессия читает с одной реплики.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        routing = request_routing.get()
+
+        if (
+                self._flushing
+                or isinstance(clause, UpdateBase)
+                or getattr(clause, "_for_update_arg", None) is not None
+                or _marked_write(clause)
+        ):
+            self.info["wrote"] = True
+            if routing is not None:
+                routing.wrote = True
+            return engine.sync_engine
+
+        if (
+                self.info.get("wrote")
+                or _primary_reads.get()
+                or (routing is not None and routing.sticky)
+        ):
+            return engine.sync_engine
+        if not (self.info.get("read_only") or (routing is not None and routing.read_only)):
+            return engine.sync_engine
+
+        if "replica" not in self.info:
+            self.info["replica"] = replicas.choose()
+        replica = self.info["replica"]
+        return replica.sync_engine if replica is not None else engine.sync_engine
+
+
+def _marked_write(clause) -> bool:
+    """Оператор явно помечен записью (INSERT/UPDATE/DELETE внутри CTE под SELECT)."""
+    get_options = getattr(clause, "get_execution_options", None)
+    return get_options is not None and get_options().get("writes", False)
+
+
 # Создать session maker
 async_session_maker = async_sessionmaker(
     bind=engine,
     class_=AsyncSession,
+    sync_session_class=RoutingSession,
     expire_on_commit=False,
 )
 
+# Сессии только для чтения (выгрузка): на реплику, если она есть
+read_only_session_maker = async_sessionmaker(
+    bind=engine,
+    class_=AsyncSession,
+    sync_session_class=RoutingSession,
+    expire_on_commit=False,
+    info={"read_only": True},
+)
+
 # Dependency для FastAPI
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     async with async_session_maker() as session:
@@ -34,6 +253,16 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         finally:
             await session.close()
 
+def pool_stats() -> dict[str, dict]:
+    """Статистика пулов соединений: primary и реплики."""
+    stats = {"primary": engine.pool.stats()}
+    for i, replica in enumerate(replicas.engines):
+        stats[f"replica_{i}"] = replica.pool.stats()
+    return stats
+
 async def dispose_engine() -> None:
     """Закрыть все соединения с БД."""
-    await engine.dispose()
\ No newline at end of file
+    await replicas.stop()
+    await engine.dispose()
+    for replica in replicas.engines:
+        await replica.dispose()
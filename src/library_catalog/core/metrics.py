@@ -0,0 +1,212 @@
+"""
+Prometheus-метрики: HTTP, запросы к БД, внешние API.
+
+Дочерние метрики с метками создаются заранее (при настройке приложения
+или создании клиента), поэтому на горячем пути — только поиск в словаре
+и инкремент.
+
+Несколько uvicorn-воркеров: задайте PROMETHEUS_MULTIPROC_DIR (пустой каталог,
+общий для воркеров, очищается перед запуском) — каждый процесс пишет значения
+в свои файлы, а /metrics отдает их сумму по всем процессам.
+"""
+
+import os
+import time
+
+from fastapi import FastAPI, Request, Response
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.routing import BaseRoute
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+# Статусы, для которых счетчики создаются заранее; остальные — при первом появлении
+COMMON_STATUSES = (200, 201, 204, 304, 400, 404, 409, 412, 422, 500, 503)
+UNMATCHED_ROUTE = "<unmatched>"
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "HTTP запросы", ["method", "route", "status"],
+)
+HTTP_DURATION = Histogram(
+    "http_request_duration_seconds", "Время обработки HTTP запроса",
+    ["method", "route"], buckets=LATENCY_BUCKETS,
+)
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds", "Время выполнения запроса к БД",
+    ["database", "operation"], buckets=LATENCY_BUCKETS,
+)
+DB_ERRORS = Counter("db_query_errors_total", "Ошибки запросов к БД", ["database"])
+EXTERNAL_DURATION = Histogram(
+    "external_api_request_duration_seconds", "Время одной попытки запроса к внешнему API",
+    ["client"], buckets=LATENCY_BUCKETS,
+)
+EXTERNAL_REQUESTS = Counter(
+    "external_api_requests_total", "Попытки запросов к внешнему API по результату",
+    ["client", "outcome"],
+)
+EXTERNAL_RETRIES = Counter(
+    "external_api_retries_total", "Повторы запросов к внешнему API", ["client"],
+)
+
+
+# ========== HTTP ==========
+
+class _RouteMetrics:
+    """Заранее созданные дочерние метрики одного (method, route)."""
+
+    __slots__ = ("method", "route", "duration", "statuses")
+
+    def __init__(self, method: str, route: str):
+        self.method = method
+        self.route = route
+        self.duration = HTTP_DURATION.labels(method, route)
+        self.statuses = {
+            status: HTTP_REQUESTS.labels(method, route, str(status))
+            for status in COMMON_STATUSES
+        }
+
+    def record(self, status: int, seconds: float) -> None:
+        self.duration.observe(seconds)
+        counter = self.statuses.get(status)
+        if counter is None:
+            counter = self.statuses[status] = HTTP_REQUESTS.labels(
+                self.method, self.route, str(status)
+            )
+        counter.inc()
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware: латентность и статусы по шаблону маршрута.
+
+    Метка route — шаблон пути (/api/v1/books/{book_id}), а не сам путь,
+    поэтому число рядов ограничено числом маршрутов.
+    """
+
+    def __init__(self, app: ASGIApp, routes: list[BaseRoute]):
+        self.app = app
+        # Маршруты живут все время работы приложения — ключ по id()
+        self._by_route: dict[tuple[int, str], _RouteMetrics] = {}
+        for route in routes:
+            for method in getattr(route, "methods", None) or ():
+                self._by_route[id(route), method] = _RouteMetrics(method, route.path)
+        self._unmatched: dict[str, _RouteMetrics] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        started = time.perf_counter()
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            self._metrics_for(scope).record(status, time.perf_counter() - started)
+
+    def _metrics_for(self, scope: Scope) -> _RouteMetrics:
+        method = scope["method"]
+        metrics = self._by_route.get((id(scope.get("route")), method))
+        if metrics is None:
+            metrics = self._unmatched.get(method)
+            if metrics is None:
+                metrics = self._unmatched[method] = _RouteMetrics(method, UNMATCHED_ROUTE)
+        return metrics
+
+
+# ========== DATABASE ==========
+
+def instrument_engine(engine: AsyncEngine, database: str) -> None:
+    """Считать длительность запросов engine по типу операции и ошибки."""
+    durations = {
+        operation: DB_QUERY_DURATION.labels(database, operation)
+        for operation in ("select", "insert", "update", "delete", "other")
+    }
+    errors = DB_ERRORS.labels(database)
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        context._metrics_started = time.perf_counter()
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if context.isinsert:
+            operation = "insert"
+        elif context.isupdate:
+            operation = "update"
+        elif context.isdelete:
+            operation = "delete"
+        elif context.is_text:
+            operation = "other"
+        else:
+            operation = "select"
+        durations[operation].observe(time.perf_counter() - context._metrics_started)
+
+    @event.listens_for(engine.sync_engine, "handle_error")
+    def handle_error(exception_context):
+        errors.inc()
+
+
+# ========== EXTERNAL APIS ==========
+
+class ExternalApiMetrics:
+    """Заранее созданные дочерние метрики одного клиента внешнего API."""
+
+    OUTCOMES = ("success", "client_error", "server_error", "transport_error", "circuit_open")
+
+    def __init__(self, client: str):
+        self.duration = EXTERNAL_DURATION.labels(client)
+        self.retries = EXTERNAL_RETRIES.labels(client)
+        self.outcomes = {outcome: EXTERNAL_REQUESTS.labels(client, outcome) for outcome in self.OUTCOMES}
+
+
+# ========== SETUP ==========
+
+def _registry() -> CollectorRegistry:
+    if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def setup_metrics(app: FastAPI, engines: dict[str, AsyncEngine]) -> None:
+    """
+    Подключить метрики к приложению.
+
+    Вызывается после подключения роутеров: метки маршрутов создаются
+    по уже зарегистрированным маршрутам. /metrics добавляется в приложение
+    без схемы OpenAPI.
+    """
+    for database, engine in engines.items():
+        instrument_engine(engine, database)
+
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics(request: Request) -> Response:
+        return Response(generate_latest(_registry()), media_type=CONTENT_TYPE_LATEST)
+
+    app.add_middleware(MetricsMiddleware, routes=list(app.routes))
+
+
+def mark_process_dead() -> None:
+    """Убрать файлы живых gauge завершившегося воркера (multiprocess режим)."""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        multiprocess.mark_process_dead(os.getpid())
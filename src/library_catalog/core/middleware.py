@@ -0,0 +1,49 @@
+from starlette.datastructures import MutableHeaders
+from starlette.requests import cookie_parser
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .database import RequestRouting, request_routing
+
+
+class ReadYourWritesMiddleware:
+    """
+    Read-your-writes при чтении с реплик.
+
+    Создает RequestRouting на каждый HTTP запрос. Если запрос писал в БД,
+    клиенту ставится cookie на sticky_seconds; пока она есть, его чтения
+    идут на primary и он видит свои изменения, даже если реплика отстает.
+    """
+
+    def __init__(self, app: ASGIApp, sticky_seconds: float, cookie_name: str = "db_primary"):
+        self.app = app
+        self.sticky_seconds = int(sticky_seconds)
+        self.cookie_name = cookie_name
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        routing = RequestRouting(sticky=self._has_cookie(scope))
+
+        async def send_with_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start" and routing.wrote:
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "set-cookie",
+                    f"{self.cookie_name}=1; Max-Age={self.sticky_seconds}; Path=/; "
+                    f"HttpOnly; SameSite=Lax",
+                )
+            await send(message)
+
+        token = request_routing.set(routing)
+        try:
+            await self.app(scope, receive, send_with_cookie)
+        finally:
+            request_routing.reset(token)
+
+    def _has_cookie(self, scope: Scope) -> bool:
+        for name, value in scope["headers"]:
+            if name == b"cookie":
+                return self.cookie_name in cookie_parser(value.decode("latin-1"))
+        return False
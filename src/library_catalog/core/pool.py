@@ -0,0 +1,85 @@
+import bisect
+import time
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+
+class WaitHistogram:
+    """Распределение времени ожидания соединения (накопительные корзины, мс)."""
+
+    BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+    def __init__(self):
+        self._counts = [0] * (len(self.BUCKETS_MS) + 1)
+        self.count = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, seconds: float) -> None:
+        ms = seconds * 1000
+        self._counts[bisect.bisect_left(self.BUCKETS_MS, ms)] += 1
+        self.count += 1
+        self.sum_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def stats(self) -> dict:
+        """count, sum_ms, max_ms и число ожиданий не дольше каждой границы (le)."""
+        buckets, total = {}, 0
+        for bound, count in zip((*self.BUCKETS_MS, "+Inf"), self._counts):
+            total += count
+            buckets[str(bound)] = total
+        return {
+            "count": self.count,
+            "sum_ms": round(self.sum_ms, 3),
+            "max_ms": round(self.max_ms, 3),
+            "buckets": buckets,
+        }
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """
+    AsyncAdaptedQueuePool со статистикой выдачи соединений.
+
+    Считает ожидающих соединение (waiting), таймауты ожидания
+    и распределение времени checkout — по ним видно, что пулу не хватает
+    соединений и запросы стоят в очереди.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.waiting = 0
+        self.timeouts = 0
+        self.wait_time = WaitHistogram()
+
+    def _do_get(self):
+        started = time.perf_counter()
+        self.waiting += 1
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            self.waiting -= 1
+            self.wait_time.observe(time.perf_counter() - started)
+
+    def recreate(self):
+        # engine.dispose() пересоздает пул — статистику переносим
+        pool = super().recreate()
+        pool.timeouts = self.timeouts
+        pool.wait_time = self.wait_time
+        return pool
+
+    def stats(self) -> dict:
+        """Текущее состояние пула и накопленная статистика."""
+        return {
+            "size": self.size(),
+            "checked_out": self.checkedout(),
+            "checked_in": self.checkedin(),
+            "overflow": max(self.overflow(), 0),
+            "max_overflow": self._max_overflow,
+            "waiting": self.waiting,
+            "timeouts": self.timeouts,
+            "wait_time": self.wait_time.stats(),
+        }
@@ -0,0 +1,215 @@
+"""
+Учет запросов к БД: число и время запросов на HTTP запрос, медленные запросы, N+1.
+
+Слушатели событий SQLAlchemy ставятся на каждый engine. Запросы записываются
+во все активные QueryRecorder текущего контекста: middleware заводит
+recorder на HTTP запрос, тесты — через query_budget().
+"""
+
+import logging
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+# Длина параметров и плана в логе
+MAX_LOGGED_CHARS = 2_000
+# Точка сохранения вокруг EXPLAIN медленного запроса
+EXPLAIN_SAVEPOINT = "slow_query_explain"
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Запрос выполнил больше запросов к БД, чем заявлено."""
+
+
+class QueryRecorder:
+    """Запросы к БД, выполненные в одном контексте."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements: Counter[str] = Counter()
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.duration += seconds
+        self.statements[statement] += 1
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Одинаковые запросы, выполненные не меньше threshold раз (признак N+1)."""
+        return [
+            (statement, count)
+            for statement, count in self.statements.most_common()
+            if count >= threshold
+        ]
+
+
+_recorders: ContextVar[tuple[QueryRecorder, ...]] = ContextVar("query_recorders", default=())
+
+
+@contextmanager
+def record_queries() -> Iterator[QueryRecorder]:
+    """Записывать запросы текущей задачи (и созданных в блоке задач)."""
+    recorder = QueryRecorder()
+    token = _recorders.set((*_recorders.get(), recorder))
+    try:
+        yield recorder
+    finally:
+        _recorders.reset(token)
+
+
+@contextmanager
+def query_budget(max_queries: int) -> Iterator[QueryRecorder]:
+    """
+    Не больше max_queries запросов к БД внутри блока (для тестов).
+
+    Raises:
+        QueryBudgetExceeded: Если запросов было больше
+    """
+    with record_queries() as recorder:
+        yield recorder
+    if recorder.count > max_queries:
+        statements = "\n".join(
+            f"  {count} x {statement}" for statement, count in recorder.statements.most_common()
+        )
+        raise QueryBudgetExceeded(
+            f"{recorder.count} queries, budget {max_queries}:\n{statements}"
+        )
+
+
+def instrument_queries(
+        engine: AsyncEngine,
+        slow_query_threshold: float | None = None,
+        explain: str = "off",
+) -> None:
+    """
+    Записывать запросы engine в активные QueryRecorder и логировать медленные.
+
+    Args:
+        slow_query_threshold: Запросы дольше (секунды) пишутся в лог с параметрами;
+            None — не логировать
+        explain: "plan" — добавить к медленному SELECT его план (EXPLAIN),
+            "analyze" — план с фактическим временем (EXPLAIN ANALYZE,
+            запрос выполняется повторно)
+    """
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        context._query_started = time.perf_counter()
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        seconds = time.perf_counter() - context._query_started
+
+        for recorder in _recorders.get():
+            recorder.record(statement, seconds)
+
+        if slow_query_threshold is not None and seconds >= slow_query_threshold:
+            plan = None
+            if explain != "off" and _explainable(statement, context):
+                plan = _explain(conn, statement, parameters, analyze=explain == "analyze")
+            _log_slow_query(statement, parameters, seconds, plan)
+
+
+def _explainable(statement: str, context) -> bool:
+    # EXPLAIN ANALYZE выполняет запрос — только чтения и не серверные курсоры
+    return (
+        not context.execution_options.get("stream_results", False)
+        and statement.lstrip()[:6].upper() == "SELECT"
+    )
+
+
+def _explain(conn: Connection, statement: str, parameters, analyze: bool) -> str | None:
+    """
+    План запроса отдельным курсором того же соединения (результат запроса не трогаем).
+
+    EXPLAIN выполняется в точке сохранения: его ошибка (statement_timeout,
+    параметры, которые не подставились) иначе прервала бы транзакцию запроса.
+    """
+    prefix = "EXPLAIN (ANALYZE, BUFFERS) " if analyze else "EXPLAIN "
+    try:
+        cursor = conn.connection.cursor()
+        try:
+            cursor.execute(f"SAVEPOINT {EXPLAIN_SAVEPOINT}")
+            try:
+                cursor.execute(prefix + statement, parameters)
+                plan = "\n".join(row[0] for row in cursor.fetchall())
+            except Exception:
+                cursor.execute(f"ROLLBACK TO SAVEPOINT {EXPLAIN_SAVEPOINT}")
+                raise
+            finally:
+                cursor.execute(f"RELEASE SAVEPOINT {EXPLAIN_SAVEPOINT}")
+            return plan
+        finally:
+            cursor.close()
+    except Exception as e:
+        return f"EXPLAIN failed: {e}"
+
+
+def _log_slow_query(statement: str, parameters, seconds: float, plan: str | None) -> None:
+    message = "Slow query (%.1f ms): %s\nparameters: %s"
+    args = [seconds * 1000, statement, _truncate(repr(parameters))]
+    if plan is not None:
+        message += "\nplan:\n%s"
+        args.append(_truncate(plan))
+    logger.warning(message, *args)
+
+
+def _truncate(text: str) -> str:
+    if len(text) <= MAX_LOGGED_CHARS:
+        return text
+    return text[:MAX_LOGGED_CHARS] + "..."
+
+
+class QueryStatsMiddleware:
+    """
+    Pure ASGI middleware: число и время запросов к БД на HTTP запрос.
+
+    Добавляет заголовок Server-Timing (db;dur=...;desc="N queries").
+    Предупреждает в лог, если запросов больше budget или один и тот же
+    запрос повторился не меньше repeated_threshold раз (вероятный N+1).
+    """
+
+    def __init__(self, app: ASGIApp, budget: int | None = None, repeated_threshold: int = 10):
+        self.app = app
+        self.budget = budget
+        self.repeated_threshold = repeated_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with record_queries() as recorder:
+            async def send_with_timing(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    headers = MutableHeaders(scope=message)
+                    headers.append(
+                        "server-timing",
+                        f'db;dur={recorder.duration * 1000:.1f};desc="{recorder.count} queries"',
+                    )
+                await send(message)
+
+            await self.app(scope, receive, send_with_timing)
+
+        self._report(scope, recorder)
+
+    def _report(self, scope: Scope, recorder: QueryRecorder) -> None:
+        request = f"{scope['method']} {scope['path']}"
+        logger.debug("%s: %d queries, %.1f ms", request, recorder.count, recorder.duration * 1000)
+
+        if self.budget is not None and recorder.count > self.budget:
+            logger.warning(
+                "%s: %d queries, budget %d", request, recorder.count, self.budget,
+            )
+        for statement, count in recorder.repeated(self.repeated_threshold):
+            logger.warning("%s: possible N+1, %d x %s", request, count, statement)
@@ -0,0 +1,16 @@
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+
+class ModelResponse(JSONResponse):
+    """
+    JSON-ответ из готовой pydantic-модели.
+
+    Сериализуется сразу в байты собранным сериализатором модели, минуя
+    повторную валидацию по response_model и промежуточный dict.
+    response_model эндпоинта остается для OpenAPI; JSON тот же, что
+    у стандартного пути FastAPI.
+    """
+
+    def render(self, content: BaseModel) -> bytes:
+        return content.__pydantic_serializer__.to_json(content)
@@ -1,13 +1,28 @@
 import uuid
 from datetime import datetime
+from enum import StrEnum
 from typing import Optional, Dict, Any
 
-from sqlalchemy import Boolean, DateTime, Integer, JSON, String, Text, func, TIMESTAMP
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import (
+    Boolean, DateTime, Index, Integer, String, Text, func, text, TIMESTAMP,
+)
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR, UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
 from ...core.database import Base
 
+class EnrichmentStatus(StrEnum):
+    """Состояние обогащения книги из Open Library."""
+    PENDING = "pending"
+    DONE = "done"
+    NOT_FOUND = "not_found"
+    FAILED = "failed"
+
+
+# Конфигурация полнотекстового поиска. 'simple' не применяет стемминг
+# и одинаково работает для русских и английских названий.
+SEARCH_CONFIG = "simple"
+
 
 class Book(Base):
     """
@@ -19,6 +34,35 @@ class Book(Base):
     """
 
     __tablename__ = "books"
+    __table_args__ = (
+        # Keyset-пагинация листинга: ORDER BY created_at DESC, book_id DESC
+        Index("ix_books_created_at_book_id", "created_at", "book_id"),
+        # Подстрочный поиск ILIKE '%...%' (pg_trgm)
+        Index(
+            "ix_books_title_trgm", "title",
+            postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_books_author_trgm", "author",
+            postgresql_using="gin", postgresql_ops={"author": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_books_genre_trgm", "genre",
+            postgresql_using="gin", postgresql_ops={"genre": "gin_trgm_ops"},
+        ),
+        # Полнотекстовый поиск q=
+        Index("ix_books_search_vector", "search_vector", postgresql_using="gin"),
+        # Фильтры по данным обогащения: extra @> '{"subjects": [...]}'
+        Index(
+            "ix_books_extra", "extra",
+            postgresql_using="gin", postgresql_ops={"extra": "jsonb_path_ops"},
+        ),
+        # Очередь обогащения: только книги, ожидающие Open Library
+        Index(
+            "ix_books_enrichment_pending", "created_at",
+            postgresql_where=text("enrichment_status = 'pending'"),
+        ),
+    )
 
     """Уникальный ID книги. Генерируется автоматически."""
     book_id: Mapped[uuid.UUID] = mapped_column(
@@ -77,12 +121,40 @@ class Book(Base):
         nullable=True,
         default = None,
     )
-    """Дополнительные данные в JSON. Может быть None."""
+    """Дополнительные данные из Open Library (JSONB). Может быть None."""
     extra: Mapped[Optional[Dict[str, Any]]] = mapped_column(
-        JSON,
+        # None — SQL NULL, а не JSON null
+        JSONB(none_as_null=True),
         nullable = True,
         default = None,
     )
+    """Статус обогащения из Open Library. Новые книги ждут обогащения в фоне."""
+    enrichment_status: Mapped[str] = mapped_column(
+        String(20),
+        nullable=False,
+        default=EnrichmentStatus.PENDING,
+        server_default=EnrichmentStatus.PENDING,
+    )
+    """Время завершения обогащения, а пока статус pending — последней попытки."""
+    enriched_at: Mapped[Optional[datetime]] = mapped_column(
+        TIMESTAMP(timezone=True),
+        nullable=True,
+        default=None,
+    )
+    """Количество неудачных обращений к Open Library."""
+    enrichment_attempts: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        server_default="0",
+    )
+    """Версия книги: +1 при каждом изменении. Основа ETag и проверки If-Match."""
+    version: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=1,
+        server_default="1",
+    )
     """Дата создания. Автоматически устанавливается БД при INSERT."""
     created_at: Mapped[datetime] = mapped_column(
         TIMESTAMP(timezone=True),
@@ -96,6 +168,13 @@ class Book(Base):
         server_default=func.now(),
         onupdate=func.now(),
     )
+    """Полнотекстовый вектор title (A) + author (B) + description (C).
+    Поддерживается БД (триггер books_search_vector_update), приложение его не пишет."""
+    search_vector: Mapped[Optional[str]] = mapped_column(
+        TSVECTOR,
+        nullable=True,
+        deferred=True,
+    )
 
     def __repr__(self) -> str:
         return f"<Book(id={self.book_id}, title='{self.title}')>"
\ No newline at end of file
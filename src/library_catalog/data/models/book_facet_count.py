@@ -0,0 +1,46 @@
+from sqlalchemy import BigInteger, Identity, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from ...core.database import Base
+
+# Фасеты, которые считаются заранее; decade — год, округленный вниз до десятилетия
+FACETS = ("genre", "decade", "author", "available")
+
+
+class BookFacetCount(Base):
+    """
+    Приращение числа книг со значением фасета.
+
+    Строки пишут триггеры на books (по одной на значение на каждый
+    INSERT/UPDATE/DELETE statement), число книг — сумма count по
+    (facet, value). Запись только добавлением не блокирует параллельные
+    вставки книг одного жанра; периодическое сжатие сворачивает строки
+    в одну на значение.
+    """
+
+    __tablename__ = "book_facet_counts"
+
+    """Суррогатный ключ: приращений одного значения может быть много."""
+    id: Mapped[int] = mapped_column(
+        BigInteger,
+        Identity(),
+        primary_key=True,
+    )
+    """Фасет: genre, decade, author или available."""
+    facet: Mapped[str] = mapped_column(
+        String(20),
+        nullable=False,
+    )
+    """Значение фасета как текст (decade — '1990', available — 'true')."""
+    value: Mapped[str] = mapped_column(
+        String(300),
+        nullable=False,
+    )
+    """Приращение (отрицательное при удалении и изменении книг)."""
+    count: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+    )
+
+    def __repr__(self) -> str:
+        return f"<BookFacetCount(facet='{self.facet}', value='{self.value}', count={self.count})>"
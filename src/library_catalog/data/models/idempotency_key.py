@@ -0,0 +1,53 @@
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import Integer, String, TIMESTAMP
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from ...core.database import Base
+
+
+class IdempotencyKey(Base):
+    """
+    Ключ Idempotency-Key и сохраненный ответ на запрос с ним.
+
+    Пока запрос выполняется, status_code пуст; повтор с тем же ключом
+    получает сохраненный ответ вместо повторного выполнения.
+    """
+
+    __tablename__ = "idempotency_keys"
+
+    """Значение заголовка Idempotency-Key."""
+    key: Mapped[str] = mapped_column(
+        String(255),
+        primary_key=True,
+    )
+    """Хэш метода, пути и тела запроса: тот же ключ с другим запросом — ошибка клиента."""
+    request_hash: Mapped[str] = mapped_column(
+        String(64),
+        nullable=False,
+    )
+    """HTTP статус сохраненного ответа. NULL — запрос еще выполняется."""
+    status_code: Mapped[int | None] = mapped_column(
+        Integer,
+        nullable=True,
+    )
+    """Тело сохраненного ответа."""
+    response: Mapped[Any | None] = mapped_column(
+        JSONB,
+        nullable=True,
+    )
+    """
+    Время, после которого ключ можно занять заново: для выполняющегося
+    запроса — таймаут обработки, для завершенного — срок хранения ответа.
+    Индексировано для очистки.
+    """
+    expires_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True),
+        nullable=False,
+        index=True,
+    )
+
+    def __repr__(self) -> str:
+        return f"<IdempotencyKey(key='{self.key}', status_code={self.status_code})>"
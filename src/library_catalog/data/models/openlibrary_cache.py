@@ -0,0 +1,39 @@
+from datetime import datetime
+from typing import Any, Dict
+
+from sqlalchemy import String, TIMESTAMP
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from ...core.database import Base
+
+
+class OpenLibraryCacheEntry(Base):
+    """
+    Запись персистентного кэша ответов Open Library.
+
+    Общая для всех uvicorn-воркеров и переживает перезапуск.
+    Пустой value — закэшированный промах (книга не найдена).
+    """
+
+    __tablename__ = "openlibrary_cache"
+
+    """Нормализованный ключ поиска (isbn:... или title:...|author:...)."""
+    key: Mapped[str] = mapped_column(
+        String(900),
+        primary_key=True,
+    )
+    """Извлеченные данные книги."""
+    value: Mapped[Dict[str, Any]] = mapped_column(
+        JSONB,
+        nullable=False,
+    )
+    """Время истечения записи. Индексировано для очистки."""
+    expires_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True),
+        nullable=False,
+        index=True,
+    )
+
+    def __repr__(self) -> str:
+        return f"<OpenLibraryCacheEntry(key='{self.key}')>"
@@ -1,7 +1,7 @@
 from typing import Generic, TypeVar, Type
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import delete, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 T = TypeVar('T')
@@ -30,29 +30,47 @@ class BaseRepository(Generic[T]):
         return await self.session.get(self.model, id)
 
     async def update(self, id: UUID, **kwargs) -> T | None:
-        """Обновить запись."""
-        instance = await self.get_by_id(id)
+        """
+        Обновить запись одним UPDATE ... RETURNING.
 
-        if not instance:
-            return None
+        Запись не читается заранее: обновленные значения, включая
+        вычисляемые БД (onupdate), приходят в ответе на UPDATE.
 
-        for key, value in kwargs.items():
-            if hasattr(instance, key):
-                setattr(instance, key, value)
-        await self.session.commit()
-        await self.session.refresh(instance)
-        return instance
+        Returns:
+            T | None: Обновленная запись или None, если ее нет
+        """
+        values = {key: value for key, value in kwargs.items() if hasattr(self.model, key)}
+        if not values:
+            return await self.get_by_id(id)
+        return await self._update_returning(self._primary_key() == id, values)
 
     async def delete(self, id: UUID) -> bool:
-        """Удалить запись."""
-        instance = await self.get_by_id(id)
+        """Удалить запись одним DELETE ... RETURNING; False — записи не было."""
+        return await self._delete_returning(self._primary_key() == id)
 
-        if not instance:
-            return False
+    async def _update_returning(self, where, values: dict) -> T | None:
+        stmt = (
+            update(self.model)
+            .where(where)
+            .values(**values)
+            .returning(self.model)
+            # Объект из identity map получает значения из RETURNING
+            .execution_options(populate_existing=True)
+        )
+        result = await self.session.execute(stmt)
+        instance = result.scalar_one_or_none()
+        await self.session.commit()
+        return instance
 
-        await self.session.delete(instance)
+    async def _delete_returning(self, where) -> bool:
+        stmt = delete(self.model).where(where).returning(self._primary_key())
+        result = await self.session.execute(stmt)
+        deleted = result.scalar_one_or_none() is not None
         await self.session.commit()
-        return True
+        return deleted
+
+    def _primary_key(self):
+        return self.model.__mapper__.primary_key[0]
 
     async def get_all(
             self,
@@ -1,10 +1,29 @@
-from sqlalchemy import select, func
+import json
+from datetime import datetime
+from typing import AsyncIterator, Collection
+from uuid import UUID
+
+from sqlalchemy import (
+    ARRAY, BigInteger, RowMapping, Select, String, any_, bindparam, case, cast, delete, exists, literal, or_, select,
+    func, null, text, tuple_, update,
+)
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased, load_only
 
-from src.library_catalog.data.models.book import Book
+from src.library_catalog.data.models.book import Book, EnrichmentStatus, SEARCH_CONFIG
+from src.library_catalog.data.models.book_facet_count import FACETS, BookFacetCount
 from src.library_catalog.data.repositories.base_repository import BaseRepository
 
 
+# Фасеты: {facet: [(value, count), ...]} по убыванию count
+FacetCounts = dict[str, list[tuple[str | int | bool, int]]]
+
+# Ключ advisory lock сжатия book_facet_counts (одно сжатие на все процессы)
+FACET_COMPACT_LOCK = 0x626F6F6B_66616365
+
+
 class BookRepository(BaseRepository[Book]):
     def __init__(self, session: AsyncSession):
         super().__init__(session, Book)
@@ -16,29 +35,187 @@ class BookRepository(BaseRepository[Book]):
             genre: str | None = None,
             year: int | None = None,
             available: bool | None = None,
+            q: str | None = None,
+            subject: str | None = None,
+            language: str | None = None,
+            publisher: str | None = None,
             limit: int = 20,
             offset: int = 0,
+            keyset: tuple[datetime, UUID] | None = None,
+            backward: bool = False,
+            columns: Collection[str] | None = None,
     ) -> list[Book]:
-        """Поиск книг с фильтрацией."""
+        """
+        Поиск книг с фильтрацией.
 
-        stmt = select(self.model)
+        Порядок стабилен: created_at DESC, book_id DESC. При полнотекстовом
+        поиске (q) без keyset книги сортируются по релевантности.
 
-        if title:
-            stmt = stmt.where(self.model.title.ilike(f"%{title}%"))
-        if author:
-            stmt = stmt.where(self.model.author.ilike(f"%{author}%"))
-        if genre:
-            stmt = stmt.where(self.model.genre.ilike(f"%{genre}%"))
-        if year is not None:
-            stmt = stmt.where(self.model.year == year)
-        if available is not None:
-            stmt = stmt.where(self.model.available == available)
+        Args:
+            q: Полнотекстовый запрос по title/author/description
+                (синтаксис websearch: "фраза", -исключение, or).
+            keyset: (created_at, book_id) граничной записи. Если передан,
+                offset игнорируется и выборка идет по индексу
+                ix_books_created_at_book_id от этой записи.
+            backward: Читать записи перед keyset (предыдущая страница).
+            columns: Загрузить только эти колонки (остальные атрибуты
+                книги недоступны); None — все
+        """
+        stmt = self._page_stmt(
+            self._select_books(columns),
+            dict(
+                title=title, author=author, genre=genre, year=year, available=available, q=q,
+                subject=subject, language=language, publisher=publisher,
+            ),
+            limit=limit,
+            offset=offset,
+            keyset=keyset,
+            backward=backward,
+        )
+
+        result = await self.session.execute(stmt)
+        books = list(result.scalars().all())
 
-        stmt = stmt.limit(limit).offset(offset)
-        stmt = stmt.order_by(self.model.created_at.desc())
+        if backward:
+            books.reverse()
+        return books
+
+    async def find_by_filters_with_total(
+            self,
+            title: str | None = None,
+            author: str | None = None,
+            genre: str | None = None,
+            year: int | None = None,
+            available: bool | None = None,
+            q: str | None = None,
+            subject: str | None = None,
+            language: str | None = None,
+            publisher: str | None = None,
+            limit: int = 20,
+            offset: int = 0,
+            keyset: tuple[datetime, UUID] | None = None,
+            backward: bool = False,
+            columns: Collection[str] | None = None,
+    ) -> tuple[list[Book], int | None]:
+        """
+        То же, что find_by_filters, плюс точное количество — одним запросом.
+
+        Количество считается несвязанным подзапросом (InitPlan) по тем же
+        фильтрам без учета keyset/offset и приходит в каждой строке.
+
+        Returns:
+            tuple: (список книг, общее количество или None, если страница пуста)
+        """
+        filters = dict(
+            title=title, author=author, genre=genre, year=year, available=available, q=q,
+            subject=subject, language=language, publisher=publisher,
+        )
+        total = self._apply_filters(select(func.count(self.model.book_id)), **filters)
+
+        stmt = self._page_stmt(
+            self._select_books(columns).add_columns(total.scalar_subquery().label("total")),
+            filters,
+            limit=limit,
+            offset=offset,
+            keyset=keyset,
+            backward=backward,
+        )
 
         result = await self.session.execute(stmt)
-        return list(result.scalars().all())
+        rows = result.all()
+
+        books = [book for book, _ in rows]
+        if backward:
+            books.reverse()
+        return books, (rows[0].total if rows else None)
+
+    async def get_version(self, book_id: UUID) -> tuple[int, datetime] | None:
+        """(version, updated_at) книги без загрузки всей строки; None — книги нет."""
+        stmt = select(self.model.version, self.model.updated_at).where(self.model.book_id == book_id)
+        result = await self.session.execute(stmt)
+        row = result.one_or_none()
+        return tuple(row) if row is not None else None
+
+    async def update(
+            self,
+            id: UUID,
+            expected_versions: Collection[int] | None = None,
+            **kwargs,
+    ) -> Book | None:
+        """
+        Обновить книгу одним UPDATE ... RETURNING и увеличить ее версию.
+
+        Args:
+            expected_versions: Обновить, только если текущая версия — одна
+                из этих (If-Match). Проверка и запись — один оператор,
+                поэтому параллельное изменение не потеряется, а блокировка
+                строки не держится между запросами.
+
+        Returns:
+            Book | None: Обновленная книга; None — книги нет или версия не совпала
+        """
+        where = self.model.book_id == id
+        if expected_versions is not None:
+            where = where & self.model.version.in_(list(expected_versions))
+        values = {key: value for key, value in kwargs.items() if hasattr(self.model, key)}
+        return await self._update_returning(where, {**values, "version": self.model.version + 1})
+
+    async def delete(self, id: UUID, expected_versions: Collection[int] | None = None) -> bool:
+        """
+        Удалить книгу одним DELETE ... RETURNING.
+
+        Returns:
+            bool: False — книги нет или версия не из expected_versions
+        """
+        where = self.model.book_id == id
+        if expected_versions is not None:
+            where = where & self.model.version.in_(list(expected_versions))
+        return await self._delete_returning(where)
+
+    async def create_or_get(self, **values) -> tuple[Book, bool]:
+        """
+        Вставить книгу или вернуть существующую с тем же ISBN — одним запросом.
+
+        INSERT ... ON CONFLICT (isbn) DO NOTHING RETURNING в CTE, а при
+        конфликте тот же оператор читает существующую строку. Проверка
+        и вставка атомарны: параллельные создания с одним ISBN не падают
+        на уникальном индексе, а получают уже созданную книгу.
+
+        Returns:
+            tuple[Book, bool]: Книга и True, если она создана этим вызовом
+        """
+        # Без search_vector (его заполняет триггер): модель его не загружает
+        columns = [column for column in self.model.__table__.c if column.key != "search_vector"]
+        inserted = (
+            insert(self.model)
+            .values(**values)
+            .on_conflict_do_nothing(index_elements=[self.model.isbn])
+            .returning(*columns, literal(True).label("created"))
+            .cte("inserted")
+        )
+        rows = select(inserted)
+        isbn = values.get("isbn")
+        if isbn is not None:
+            rows = rows.union_all(
+                select(*columns, literal(False).label("created"))
+                .where(self.model.isbn == isbn, ~exists(select(inserted.c.book_id)))
+            )
+        rows = rows.subquery()
+        # SELECT над INSERT в CTE: запись помечается явно, чтобы сессия
+        # ушла на primary и клиент получил read-your-writes
+        stmt = select(aliased(self.model, rows), rows.c.created).execution_options(writes=True)
+
+        while True:
+            result = await self.session.execute(stmt)
+            row = result.one_or_none()
+            await self.session.commit()
+            if row is not None:
+                return row[0], row[1]
+            # Конфликт со строкой, вставленной после снимка оператора:
+            # в снимке ее нет, отдельный запрос ее уже видит
+            existing = await self.find_by_isbn(isbn)
+            if existing is not None:
+                return existing, False
 
     async def find_by_isbn(self, isbn: str) -> Book | None:
         """Найти книгу по ISBN."""
@@ -47,6 +224,233 @@ class BookRepository(BaseRepository[Book]):
         result = await self.session.execute(stmt)
         return result.scalar_one_or_none()
 
+    async def find_existing_isbns(self, isbns: list[str]) -> set[str]:
+        """Найти, какие из ISBN уже есть в каталоге (один запрос)."""
+        if not isbns:
+            return set()
+        stmt = select(self.model.isbn).where(
+            self.model.isbn == any_(bindparam("isbns", isbns, type_=ARRAY(String)))
+        )
+        result = await self.session.execute(stmt)
+        return set(result.scalars().all())
+
+    async def get_by_ids(self, book_ids: list[UUID]) -> list[Book]:
+        """Получить книги по списку ID (один запрос, порядок не гарантирован)."""
+        return await self.get_by_keys(book_ids, [])
+
+    async def get_by_keys(self, book_ids: list[UUID], isbns: list[str]) -> list[Book]:
+        """
+        Получить книги по ID и ISBN одним запросом (порядок не гарантирован).
+
+        Списки передаются массивами (= ANY): текст запроса не зависит
+        от их длины, и подготовленный запрос asyncpg переиспользуется.
+        """
+        conditions = []
+        if book_ids:
+            conditions.append(
+                self.model.book_id == any_(bindparam("book_ids", book_ids, type_=ARRAY(postgresql.UUID)))
+            )
+        if isbns:
+            conditions.append(self.model.isbn == any_(bindparam("isbns", isbns, type_=ARRAY(String))))
+        if not conditions:
+            return []
+        stmt = select(self.model).where(or_(*conditions))
+        result = await self.session.execute(stmt)
+        return list(result.scalars().all())
+
+    async def bulk_create(self, rows: list[dict], batch_size: int = 500) -> set[UUID]:
+        """
+        Вставить книги многострочными INSERT пачками по batch_size.
+
+        Строки с ISBN, уже занятым в БД (в том числе параллельной вставкой),
+        пропускаются (ON CONFLICT DO NOTHING). Все пачки — одна транзакция.
+
+        Args:
+            rows: Значения колонок; у всех строк одинаковый набор ключей
+                и заранее сгенерированный book_id
+
+        Returns:
+            set[UUID]: book_id реально вставленных строк
+        """
+        created: set[UUID] = set()
+        for start in range(0, len(rows), batch_size):
+            stmt = (
+                insert(self.model)
+                .values(rows[start:start + batch_size])
+                .on_conflict_do_nothing(index_elements=[self.model.isbn])
+                .returning(self.model.book_id)
+            )
+            result = await self.session.execute(stmt)
+            created.update(result.scalars().all())
+        await self.session.commit()
+        return created
+
+    async def claim_pending_enrichment(self, limit: int, retry_delay: float) -> list[UUID]:
+        """
+        Забрать книги, ожидающие обогащения, в работу.
+
+        Берутся книги в статусе pending, к которым никто не обращался
+        последние retry_delay секунд (свежие книги обрабатывает процесс,
+        который их создал). Забранным ставится enriched_at = now(),
+        поэтому другие процессы не возьмут их повторно в течение
+        retry_delay; если процесс упал, книга вернется в очередь.
+        """
+        stale = func.now() - func.make_interval(0, 0, 0, 0, 0, 0, retry_delay)
+        candidates = (
+            select(self.model.book_id)
+            .where(self.model.enrichment_status == EnrichmentStatus.PENDING)
+            .where(func.coalesce(self.model.enriched_at, self.model.created_at) < stale)
+            .order_by(self.model.created_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        stmt = (
+            update(self.model)
+            .where(self.model.book_id.in_(candidates.scalar_subquery()))
+            # Аренда, а не изменение книги: updated_at не трогаем
+            .values(enriched_at=func.now(), updated_at=self.model.updated_at)
+            .returning(self.model.book_id)
+        )
+        result = await self.session.execute(stmt)
+        await self.session.commit()
+        return list(result.scalars().all())
+
+    async def complete_enrichment(self, book_id: UUID, extra: dict | None) -> bool:
+        """
+        Сохранить результат обогащения.
+
+        Обновляет только книги в статусе pending, поэтому повторная
+        обработка той же книги ничего не перезапишет.
+        """
+        stmt = (
+            update(self.model)
+            .where(self.model.book_id == book_id)
+            .where(self.model.enrichment_status == EnrichmentStatus.PENDING)
+            .values(
+                # SQL NULL, а не JSON null: "нет данных" одинаково для всех книг
+                extra=extra if extra is not None else null(),
+                enrichment_status=EnrichmentStatus.DONE if extra else EnrichmentStatus.NOT_FOUND,
+                enriched_at=func.now(),
+                version=self.model.version + 1,
+            )
+        )
+        result = await self.session.execute(stmt)
+        await self.session.commit()
+        return result.rowcount > 0
+
+    async def fail_enrichment(self, book_id: UUID, max_attempts: int) -> None:
+        """Учесть неудачную попытку; после max_attempts книга получает статус failed."""
+        attempts = self.model.enrichment_attempts + 1
+        stmt = (
+            update(self.model)
+            .where(self.model.book_id == book_id)
+            .where(self.model.enrichment_status == EnrichmentStatus.PENDING)
+            .values(
+                enrichment_attempts=attempts,
+                enrichment_status=case(
+                    (attempts >= max_attempts, EnrichmentStatus.FAILED.value),
+                    else_=EnrichmentStatus.PENDING.value,
+                ),
+                enriched_at=func.now(),
+                version=self.model.version + 1,
+            )
+        )
+        await self.session.execute(stmt)
+        await self.session.commit()
+
+    async def stream_by_filters(
+            self,
+            columns: list[str],
+            title: str | None = None,
+            author: str | None = None,
+            genre: str | None = None,
+            year: int | None = None,
+            available: bool | None = None,
+            q: str | None = None,
+            subject: str | None = None,
+            language: str | None = None,
+            publisher: str | None = None,
+            batch_size: int = 1_000,
+    ) -> AsyncIterator[list[RowMapping]]:
+        """
+        Прочитать все книги по фильтрам пачками через серверный курсор.
+
+        В памяти одновременно только одна пачка из batch_size строк;
+        следующая читается, когда вызывающий обработал предыдущую.
+        Выбираются только columns (без ORM-объектов), порядок — как в листинге.
+        """
+        stmt = select(*(self.model.__table__.c[name] for name in columns))
+        stmt = self._apply_filters(
+            stmt, title, author, genre, year, available, q, subject, language, publisher,
+        )
+        stmt = stmt.order_by(*self._order_by()).execution_options(yield_per=batch_size)
+
+        result = await self.session.stream(stmt)
+        async for partition in result.mappings().partitions():
+            yield partition
+
+    async def update_by_filters(
+            self,
+            values: dict,
+            chunk_size: int = 10_000,
+            **filters,
+    ) -> AsyncIterator[list[UUID]]:
+        """
+        Обновить все книги по фильтрам листинга и увеличить их версию.
+
+        Выполняется множественными UPDATE ... RETURNING пачками до chunk_size
+        строк по возрастанию book_id, каждая пачка — своя транзакция:
+        блокировки и размер транзакции ограничены. Книга, попавшая под
+        фильтр после прохода ее book_id, не обновляется.
+
+        Yields:
+            list[UUID]: book_id книг, обновленных очередной пачкой
+        """
+        stmt = update(self.model).values(**values, version=self.model.version + 1)
+        async for book_ids in self._write_by_filters(stmt, chunk_size, filters):
+            yield book_ids
+
+    async def delete_by_filters(self, chunk_size: int = 10_000, **filters) -> AsyncIterator[list[UUID]]:
+        """
+        Удалить все книги по фильтрам листинга пачками до chunk_size строк.
+
+        Yields:
+            list[UUID]: book_id книг, удаленных очередной пачкой
+        """
+        async for book_ids in self._write_by_filters(delete(self.model), chunk_size, filters):
+            yield book_ids
+
+    async def _write_by_filters(self, stmt, chunk_size: int, filters: dict) -> AsyncIterator[list[UUID]]:
+        after: UUID | None = None
+        while True:
+            chunk = self._apply_filters(select(self.model.book_id), **filters)
+            if after is not None:
+                chunk = chunk.where(self.model.book_id > after)
+            chunk = chunk.order_by(self.model.book_id).limit(chunk_size).cte("chunk")
+            # Фильтры повторяются во внешнем операторе: строку, измененную
+            # параллельно после выбора пачки, PostgreSQL перепроверит по ним
+            written = (
+                self._apply_filters(stmt.where(self.model.book_id.in_(select(chunk.c.book_id))), **filters)
+                .returning(self.model.book_id)
+                .cte("written")
+            )
+            # Одна строка на пачку: сколько выбрано, ключ последней и записанные
+            # book_id — конец виден без лишнего оператора на пустую пачку
+            chunk_stmt = select(
+                select(func.count()).select_from(chunk).scalar_subquery(),
+                select(chunk.c.book_id).order_by(chunk.c.book_id.desc()).limit(1).scalar_subquery(),
+                select(func.array_agg(written.c.book_id)).scalar_subquery(),
+            ).execution_options(writes=True)
+            selected, last, book_ids = (await self.session.execute(chunk_stmt)).one()
+            await self.session.commit()
+            if book_ids:
+                yield book_ids
+            # Записанных может быть меньше выбранных (отсеяны перепроверкой),
+            # поэтому конец — по числу выбранных строк
+            if selected < chunk_size:
+                return
+            after = last
+
     async def count_by_filters(
             self,
             title: str | None = None,
@@ -54,9 +458,285 @@ class BookRepository(BaseRepository[Book]):
             genre: str | None = None,
             year: int | None = None,
             available: bool | None = None,
+            q: str | None = None,
+            subject: str | None = None,
+            language: str | None = None,
+            publisher: str | None = None,
     ) -> int:
         """Подсчитать количество книг по фильтрам."""
-        stmt = select(func.count(self.model.book_id))
+        stmt = self._apply_filters(
+            select(func.count(self.model.book_id)),
+            title=title,
+            author=author,
+            genre=genre,
+            year=year,
+            available=available,
+            q=q,
+            subject=subject,
+            language=language,
+            publisher=publisher,
+        )
+
+        result = await self.session.execute(stmt)
+
+        return result.scalar_one()
+
+    async def facets_by_filters(
+            self,
+            limit: int,
+            title: str | None = None,
+            author: str | None = None,
+            genre: str | None = None,
+            year: int | None = None,
+            available: bool | None = None,
+            q: str | None = None,
+            subject: str | None = None,
+            language: str | None = None,
+            publisher: str | None = None,
+    ) -> tuple[int, FacetCounts]:
+        """
+        Количество книг по фильтрам и по каждому значению фасетов — один проход.
+
+        GROUPING SETS считает группы genre, decade, author, available и общий
+        итог за одно чтение отфильтрованных строк; в ответ попадают limit
+        самых частых значений каждого фасета.
+
+        Returns:
+            tuple: (общее количество, фасеты)
+        """
+        filtered = self._apply_filters(
+            select(
+                self.model.genre,
+                (self.model.year // 10 * 10).label("decade"),
+                self.model.author,
+                self.model.available,
+            ),
+            title=title, author=author, genre=genre, year=year, available=available, q=q,
+            subject=subject, language=language, publisher=publisher,
+        ).subquery()
+
+        columns = [filtered.c[facet] for facet in FACETS]
+        # Бит фасета в grouping() равен 0 в его группе; 0b1111 — общий итог
+        grouping = func.grouping(*columns)
+        count = func.count()
+        grouped = (
+            select(
+                grouping.label("grouping"),
+                *columns,
+                count.label("count"),
+                func.row_number().over(
+                    partition_by=grouping, order_by=(count.desc(), *columns)
+                ).label("rank"),
+            )
+            .group_by(func.grouping_sets(*(tuple_(column) for column in columns), tuple_()))
+            .subquery()
+        )
+        total_grouping = (1 << len(FACETS)) - 1
+        stmt = select(grouped).where(
+            or_(grouped.c.rank <= limit, grouped.c.grouping == total_grouping)
+        )
+
+        result = await self.session.execute(stmt)
+        total, facets = 0, {facet: [] for facet in FACETS}
+        for row in result.mappings():
+            if row["grouping"] == total_grouping:
+                total = row["count"]
+                continue
+            for bit, facet in enumerate(reversed(FACETS)):
+                if not row["grouping"] & (1 << bit) and row[facet] is not None:
+                    facets[facet].append((row[facet], row["count"]))
+        return total, facets
+
+    async def precomputed_facets(self, limit: int) -> tuple[int, FacetCounts]:
+        """
+        Фасеты всего каталога из book_facet_counts (без чтения books).
+
+        Returns:
+            tuple: (общее количество, фасеты) — как у facets_by_filters без фильтров
+        """
+        counts = BookFacetCount
+        count = cast(func.sum(counts.count), BigInteger)
+        grouped = (
+            select(
+                counts.facet,
+                counts.value,
+                count.label("count"),
+                cast(func.sum(count).over(partition_by=counts.facet), BigInteger).label("facet_total"),
+                func.row_number().over(
+                    partition_by=counts.facet, order_by=(count.desc(), counts.value)
+                ).label("rank"),
+            )
+            .group_by(counts.facet, counts.value)
+            .having(count > 0)
+            .subquery()
+        )
+        stmt = select(grouped).where(grouped.c.rank <= limit)
+
+        result = await self.session.execute(stmt)
+        total, facets = 0, {facet: [] for facet in FACETS}
+        for row in result.mappings():
+            if row["facet"] not in facets:
+                continue
+            facets[row["facet"]].append((self._facet_value(row["facet"], row["value"]), row["count"]))
+            if row["facet"] == "genre":
+                # genre NOT NULL — сумма по жанрам равна числу книг
+                total = row["facet_total"]
+        return total, facets
+
+    async def compact_facet_counts(self) -> bool:
+        """
+        Свернуть приращения book_facet_counts в одну строку на значение.
+
+        Приращения, записанные параллельно, не видны снимку и не удаляются.
+
+        Returns:
+            bool: False, если сжатие уже выполняет другой процесс
+        """
+        locked = await self.session.scalar(select(func.pg_try_advisory_xact_lock(FACET_COMPACT_LOCK)))
+        if not locked:
+            return False
+
+        counts = BookFacetCount
+        deleted = (
+            delete(counts)
+            .returning(counts.facet, counts.value, counts.count)
+            .cte("deleted")
+        )
+        total = func.sum(deleted.c.count)
+        stmt = (
+            insert(counts)
+            .from_select(
+                ["facet", "value", "count"],
+                select(deleted.c.facet, deleted.c.value, total)
+                .group_by(deleted.c.facet, deleted.c.value)
+                .having(total != 0),
+            )
+            .add_cte(deleted)
+        )
+        await self.session.execute(stmt)
+        await self.session.commit()
+        return True
+
+    @staticmethod
+    def _facet_value(facet: str, value: str) -> str | int | bool:
+        """Значение из book_facet_counts (текст) в тип колонки books."""
+        if facet == "decade":
+            return int(value)
+        if facet == "available":
+            return value == "true"
+        return value
+
+    async def estimate_by_filters(
+            self,
+            title: str | None = None,
+            author: str | None = None,
+            genre: str | None = None,
+            year: int | None = None,
+            available: bool | None = None,
+            q: str | None = None,
+            subject: str | None = None,
+            language: str | None = None,
+            publisher: str | None = None,
+    ) -> int | None:
+        """
+        Оценить количество книг по фильтрам без их подсчета.
+
+        Без фильтров берется статистика таблицы (pg_class.reltuples),
+        с фильтрами — оценка строк планировщика (EXPLAIN без выполнения).
+
+        Returns:
+            int | None: Оценка или None, если статистика еще не собрана
+        """
+        filters = dict(
+            title=title, author=author, genre=genre, year=year, available=available, q=q,
+            subject=subject, language=language, publisher=publisher,
+        )
+
+        if not any(value is not None for value in filters.values()):
+            result = await self.session.execute(
+                text("SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:table AS regclass)"),
+                {"table": self.model.__tablename__},
+            )
+            estimate = result.scalar_one_or_none()
+            return estimate if estimate is not None and estimate >= 0 else None
+
+        stmt = self._apply_filters(select(self.model.book_id), **filters)
+        conn = await self.session.connection(bind_arguments={"clause": stmt})
+        compiled = stmt.compile(dialect=conn.dialect)
+        params = compiled.construct_params()
+        # Значения фильтров передаются драйверу параметрами, а не текстом
+        # запроса: в них могут быть кавычки и ":name"
+        result = await conn.exec_driver_sql(
+            f"EXPLAIN (FORMAT JSON) {compiled}",
+            tuple(params[name] for name in compiled.positiontup),
+        )
+        plan = result.scalar_one()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    def _page_stmt(
+            self,
+            stmt: Select,
+            filters: dict,
+            limit: int,
+            offset: int,
+            keyset: tuple[datetime, UUID] | None,
+            backward: bool,
+    ) -> Select:
+        """Добавить фильтры, порядок и границы страницы к запросу листинга."""
+        stmt = self._apply_filters(stmt, **filters)
+
+        if keyset is None:
+            order_by = self._order_by()
+            if q := filters.get("q"):
+                rank = func.ts_rank_cd(self.model.search_vector, self._tsquery(q))
+                order_by = (rank.desc(), *order_by)
+            return stmt.order_by(*order_by).limit(limit).offset(offset)
+
+        key = tuple_(self.model.created_at, self.model.book_id)
+        if backward:
+            stmt = stmt.where(key > tuple_(*keyset))
+            stmt = stmt.order_by(self.model.created_at.asc(), self.model.book_id.asc())
+        else:
+            stmt = stmt.where(key < tuple_(*keyset))
+            stmt = stmt.order_by(*self._order_by())
+        return stmt.limit(limit)
+
+    def _select_books(self, columns: Collection[str] | None) -> Select:
+        """SELECT книг; с columns — только эти колонки (тяжелые description/extra не читаются)."""
+        stmt = select(self.model)
+        if columns is not None:
+            attributes = [getattr(self.model, name) for name in columns]
+            # raiseload: обращение к незагруженной колонке — ошибка, а не скрытый запрос
+            stmt = stmt.options(load_only(*attributes, raiseload=True))
+        return stmt
+
+    def _order_by(self) -> tuple:
+        """Стабильный порядок листинга (совпадает с ix_books_created_at_book_id)."""
+        return self.model.created_at.desc(), self.model.book_id.desc()
+
+    def _apply_filters(
+            self,
+            stmt: Select,
+            title: str | None = None,
+            author: str | None = None,
+            genre: str | None = None,
+            year: int | None = None,
+            available: bool | None = None,
+            q: str | None = None,
+            subject: str | None = None,
+            language: str | None = None,
+            publisher: str | None = None,
+    ) -> Select:
+        """
+        Добавить условия фильтрации к запросу.
+
+        Подстрочный поиск (ILIKE '%...%') по title/author/genre обслуживается
+        trigram GIN-индексами (pg_trgm), q — GIN-индексом по search_vector.
+        subject/language/publisher — точное совпадение со значением из Open
+        Library, проверкой вхождения extra @> '{...}' по GIN-индексу ix_books_extra.
+        """
         if title:
             stmt = stmt.where(self.model.title.ilike(f"%{title}%"))
         if author:
@@ -67,7 +747,22 @@ class BookRepository(BaseRepository[Book]):
             stmt = stmt.where(self.model.year == year)
         if available is not None:
             stmt = stmt.where(self.model.available == available)
+        if q:
+            stmt = stmt.where(self.model.search_vector.bool_op("@@")(self._tsquery(q)))
+        if subject:
+            stmt = stmt.where(self._extra_contains({"subjects": [subject]}))
+        if language:
+            stmt = stmt.where(self._extra_contains({"language": language}))
+        if publisher:
+            stmt = stmt.where(self._extra_contains({"publisher": publisher}))
+        return stmt
 
-        result = await self.session.execute(stmt)
+    def _extra_contains(self, value: dict):
+        # Строка с приведением к jsonb, а не JSONB-параметр: estimate_by_filters
+        # передает параметры драйверу напрямую, без обработчиков типов SQLAlchemy
+        return self.model.extra.contains(cast(literal(json.dumps(value)), postgresql.JSONB))
 
-        return result.scalar_one()
+    @staticmethod
+    def _tsquery(q: str):
+        """Полнотекстовый запрос в той же конфигурации, что и search_vector."""
+        return func.websearch_to_tsquery(SEARCH_CONFIG, q)
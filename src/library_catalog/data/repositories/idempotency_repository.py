@@ -0,0 +1,85 @@
+from datetime import timedelta
+from typing import Any
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.library_catalog.data.models.idempotency_key import IdempotencyKey
+
+
+class IdempotencyRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.model = IdempotencyKey
+
+    async def claim(self, key: str, request_hash: str, timeout: float) -> IdempotencyKey | None:
+        """
+        Занять ключ на время выполнения запроса (одним INSERT ... ON CONFLICT).
+
+        Просроченный ключ (ответ устарел или выполнявший запрос процесс
+        не уложился в timeout) занимается заново.
+
+        Returns:
+            IdempotencyKey | None: Занятый ключ; None — ключ уже занят
+                действующей записью (ее возвращает get)
+        """
+        stmt = insert(self.model).values(
+            key=key,
+            request_hash=request_hash,
+            status_code=None,
+            response=None,
+            expires_at=func.now() + timedelta(seconds=timeout),
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[self.model.key],
+            set_={
+                "request_hash": stmt.excluded.request_hash,
+                "status_code": None,
+                "response": None,
+                "expires_at": stmt.excluded.expires_at,
+            },
+            where=self.model.expires_at <= func.now(),
+        ).returning(self.model)
+        result = await self.session.execute(stmt)
+        claimed = result.scalar_one_or_none()
+        await self.session.commit()
+        return claimed
+
+    async def get(self, key: str) -> IdempotencyKey | None:
+        """Действующая запись ключа."""
+        stmt = select(self.model).where(self.model.key == key, self.model.expires_at > func.now())
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none()
+
+    async def complete(self, claimed: IdempotencyKey, status_code: int, response: Any, ttl: float) -> None:
+        """
+        Сохранить ответ; повторы получают его еще ttl секунд.
+
+        Ничего не делает, если после таймаута ключ успел занять другой запрос.
+        """
+        stmt = (
+            update(self.model)
+            .where(self._owned(claimed))
+            .values(status_code=status_code, response=response, expires_at=func.now() + timedelta(seconds=ttl))
+        )
+        await self.session.execute(stmt)
+        await self.session.commit()
+
+    async def release(self, claimed: IdempotencyKey) -> None:
+        """Освободить ключ незавершенного запроса, чтобы повтор выполнил его заново."""
+        await self.session.execute(delete(self.model).where(self._owned(claimed)))
+        await self.session.commit()
+
+    async def purge_expired(self) -> None:
+        """Удалить просроченные ключи."""
+        await self.session.execute(delete(self.model).where(self.model.expires_at <= func.now()))
+        await self.session.commit()
+
+    def _owned(self, claimed: IdempotencyKey):
+        # expires_at занятого ключа — метка владельца: повторный claim ее меняет
+        return (
+            (self.model.key == claimed.key)
+            & (self.model.expires_at == claimed.expires_at)
+            & self.model.status_code.is_(None)
+        )
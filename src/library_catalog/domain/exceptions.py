@@ -8,12 +8,39 @@ class BookNotFoundException(NotFoundException):
 
 class BookAlreadyExistsException(AppException):
     """Книга с таким ISBN уже существует."""
-    def __init__(self, isbn: str):
+    def __init__(self, isbn: str, book_id: UUID | None = None):
+        message = f"Book with ISBN '{isbn}' already exists"
+        if book_id is not None:
+            message += f" (id '{book_id}')"
         super().__init__(
-            message=f"Book with ISBN '{isbn}' already exists",
+            message=message,
             status_code=409,
         )
 
+class BookVersionMismatchException(AppException):
+    """Книга изменена с тех пор, как клиент ее прочитал (If-Match не совпал)."""
+    def __init__(self, book_id: UUID, current_version: int):
+        super().__init__(
+            message=f"Book '{book_id}' was modified (current version {current_version})",
+            status_code=412,
+        )
+
+class BulkWriteFilterRequiredException(AppException):
+    """Изменение или удаление по фильтрам без единого фильтра."""
+    def __init__(self):
+        super().__init__(
+            message="At least one filter is required to update or delete books by filter",
+            status_code=400,
+        )
+
+class BulkUpdateIsbnException(AppException):
+    """Один ISBN для нескольких книг нарушил бы уникальность books.isbn."""
+    def __init__(self):
+        super().__init__(
+            message="isbn cannot be set by a bulk update; update books one by one",
+            status_code=400,
+        )
+
 class InvalidYearException(AppException):
     """Невалидный год издания."""
     def __init__(self, year: int):
@@ -46,4 +73,45 @@ class OpenLibraryTimeoutException(AppException):
         super().__init__(
             message=f"Open Library API timeout after {timeout}s",
             status_code=504,
-        )
\ No newline at end of file
+        )
+
+class InvalidCursorException(AppException):
+    """Невалидный курсор пагинации."""
+    def __init__(self, cursor: str):
+        super().__init__(
+            message=f"Invalid pagination cursor '{cursor}'",
+            status_code=400,
+        )
+
+class InvalidFieldsException(AppException):
+    """Запрошены несуществующие поля книги (или пустой список полей)."""
+    def __init__(self, unknown: list[str], allowed: list[str]):
+        problem = f"Unknown fields {unknown}" if unknown else "No fields requested"
+        super().__init__(
+            message=f"{problem}, allowed: {', '.join(allowed)}",
+            status_code=400,
+        )
+
+class CursorNotSupportedException(AppException):
+    """Курсорная пагинация недоступна для выбранного режима."""
+    def __init__(self, mode: str):
+        super().__init__(
+            message=f"Cursor pagination is not supported with {mode}",
+            status_code=400,
+        )
+
+class IdempotencyKeyInUseException(AppException):
+    """Запрос с этим Idempotency-Key еще выполняется."""
+    def __init__(self, key: str):
+        super().__init__(
+            message=f"A request with Idempotency-Key '{key}' is still being processed",
+            status_code=409,
+        )
+
+class IdempotencyKeyMismatchException(AppException):
+    """Idempotency-Key уже использован с другим запросом."""
+    def __init__(self, key: str):
+        super().__init__(
+            message=f"Idempotency-Key '{key}' was already used with a different request",
+            status_code=422,
+        )
@@ -1,5 +1,9 @@
+from functools import lru_cache
+
+from pydantic import BaseModel, TypeAdapter
+
 from ...data.models.book import Book
-from ...api.v1.schemas.book import ShowBook
+from ...api.v1.schemas.book import ShowBook, book_projection
 
 
 class BookMapper:
@@ -10,28 +14,37 @@ class BookMapper:
         """
         Преобразовать Book ORM модель в ShowBook DTO.
 
+        Поля читаются из атрибутов модели одним проходом валидатора
+        pydantic-core (from_attributes) — это быстрее, чем сборка
+        через именованные аргументы или model_construct.
+
         Args:
             book: ORM модель из БД
 
         Returns:
             ShowBook: Pydantic модель для API
         """
-        return ShowBook(
-            book_id=book.book_id,
-            title=book.title,
-            author=book.author,
-            year=book.year,
-            genre=book.genre,
-            pages=book.pages,
-            available=book.available,
-            isbn=book.isbn,
-            description=book.description,
-            extra=book.extra,
-            created_at=book.created_at,
-            updated_at=book.updated_at,
-        )
+        return ShowBook.model_validate(book)
 
     @staticmethod
     def to_show_books(books: list[Book]) -> list[ShowBook]:
-        """Преобразовать список книг."""
-        return [BookMapper.to_show_book(book) for book in books]
\ No newline at end of file
+        """Преобразовать список книг (одним вызовом валидатора)."""
+        return _show_books_adapter.validate_python(books, from_attributes=True)
+
+    @staticmethod
+    def to_book_fields(books: list[Book], fields: tuple[str, ...]) -> list[BaseModel]:
+        """
+        Преобразовать книги в проекцию с полями fields.
+
+        Читаются только атрибуты проекции, поэтому подходят и книги,
+        загруженные с load_only.
+        """
+        return _projection_adapter(fields).validate_python(books, from_attributes=True)
+
+
+_show_books_adapter = TypeAdapter(list[ShowBook])
+
+
+@lru_cache(maxsize=256)
+def _projection_adapter(fields: tuple[str, ...]) -> TypeAdapter:
+    return TypeAdapter(list[book_projection(fields)])
@@ -0,0 +1,265 @@
+import json
+import logging
+from abc import ABC, abstractmethod
+from collections import Counter
+from pathlib import Path
+from typing import Awaitable, Callable, Iterable
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from ...api.v1.schemas.book import ShowBook
+from ...data.repositories.book_repository import BookRepository
+from ...utils.cache import MISSING, TTLCache
+from ...utils.single_flight import SingleFlight
+from ..mappers.book_mapper import BookMapper
+
+logger = logging.getLogger(__name__)
+
+
+class BookCacheBackend(ABC):
+    """Хранилище кэша книг по ID."""
+
+    @abstractmethod
+    async def get(self, book_id: UUID) -> ShowBook | None:
+        """Получить книгу или None."""
+
+    @abstractmethod
+    async def set(self, book_id: UUID, book: ShowBook) -> None:
+        """Сохранить книгу."""
+
+    @abstractmethod
+    async def delete(self, book_id: UUID) -> None:
+        """Удалить книгу из кэша."""
+
+    def hot_ids(self, limit: int) -> list[UUID]:
+        """ID книг для прогрева, начиная с самых востребованных."""
+        return []
+
+    def __len__(self) -> int:
+        return 0
+
+
+class MemoryBookCacheBackend(BookCacheBackend):
+    """LRU в памяти процесса; хранит готовые ShowBook без сериализации."""
+
+    def __init__(self, max_entries: int = 10_000, ttl: float | None = 60.0):
+        self._data: TTLCache[ShowBook] = TTLCache(max_entries=max_entries, ttl=ttl)
+
+    async def get(self, book_id: UUID) -> ShowBook | None:
+        value = self._data.get(book_id)
+        return None if value is MISSING else value
+
+    async def set(self, book_id: UUID, book: ShowBook) -> None:
+        self._data.set(book_id, book)
+
+    async def delete(self, book_id: UUID) -> None:
+        self._data.delete(book_id)
+
+    def hot_ids(self, limit: int) -> list[UUID]:
+        # Порядок LRU: последние прочитанные — в конце
+        return self._data.keys()[::-1][:limit]
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class BookCache:
+    """
+    Read-through кэш книг по ID.
+
+    Промах загружает книгу через loader; одновременные промахи по одной
+    книге выполняют одну загрузку. Отсутствующие книги не кэшируются.
+
+    Сброс точечный (invalidate после update/delete/обогащения). Чтобы
+    загрузка, начатая до сброса, не вернула в кэш устаревшие данные,
+    на время загрузки ведется счетчик сбросов ключа: если он изменился,
+    результат отдается вызывающему, но не сохраняется. Сброс также
+    отвязывает идущую загрузку: чтения после него начинают новую
+    и видят изменение (read-your-writes для пишущего).
+
+    Пакетное чтение (peek_many + load_many) делит с чтением по одному
+    ID те же записи и ту же защиту от сброса во время загрузки.
+
+    Без backend кэш только объединяет одновременные загрузки.
+    """
+
+    def __init__(self, backend: BookCacheBackend | None = None):
+        self.backend = backend
+        self._loads: SingleFlight[UUID, ShowBook | None] = SingleFlight()
+        # Счетчики сбросов ключей, которые сейчас загружаются, и число таких загрузок
+        self._generations: dict[UUID, int] = {}
+        self._loading: Counter[UUID] = Counter()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @property
+    def stores(self) -> bool:
+        """Сохраняет ли кэш книги (False — только объединяет загрузки)."""
+        return self.backend is not None
+
+    async def peek(self, book_id: UUID) -> ShowBook | None:
+        """Получить книгу только из кэша, без загрузки."""
+        if self.backend is None:
+            return None
+        book = await self.backend.get(book_id)
+        if book is not None:
+            self.hits += 1
+        return book
+
+    async def get_or_load(
+            self,
+            book_id: UUID,
+            loader: Callable[[], Awaitable[ShowBook | None]],
+    ) -> ShowBook | None:
+        """Получить книгу из кэша или загрузить через loader."""
+        if self.backend is not None:
+            book = await self.backend.get(book_id)
+            if book is not None:
+                self.hits += 1
+                return book
+            self.misses += 1
+
+        return await self._loads.do(book_id, lambda: self._load(book_id, loader))
+
+    async def peek_many(self, book_ids: Iterable[UUID]) -> dict[UUID, ShowBook]:
+        """Получить из кэша те книги, что в нем есть, без загрузки."""
+        found: dict[UUID, ShowBook] = {}
+        if self.backend is None:
+            return found
+        for book_id in book_ids:
+            book = await self.backend.get(book_id)
+            if book is not None:
+                found[book_id] = book
+        self.hits += len(found)
+        return found
+
+    async def load_many(
+            self,
+            book_ids: list[UUID],
+            loader: Callable[[], Awaitable[list[ShowBook]]],
+    ) -> list[ShowBook]:
+        """
+        Загрузить промахи пакетом (одним вызовом loader) и сохранить их.
+
+        loader может вернуть и другие книги (например, найденные по ISBN):
+        они отдаются вызывающему, но в кэш не попадают — их сброс
+        во время загрузки не отслеживался.
+        """
+        self.misses += len(book_ids)
+        generations = self._begin_load(book_ids)
+        try:
+            books = await loader()
+            if self.backend is not None:
+                for book in books:
+                    if self._generations.get(book.book_id, -1) == generations.get(book.book_id):
+                        await self.backend.set(book.book_id, book)
+            return books
+        finally:
+            self._end_load(book_ids)
+
+    async def invalidate(self, book_id: UUID) -> None:
+        """Сбросить книгу после ее изменения или удаления."""
+        if book_id in self._generations:
+            self._generations[book_id] += 1
+        # Загрузка могла прочитать книгу до изменения — к ней больше не присоединяемся
+        self._loads.forget(book_id)
+        self.invalidations += 1
+        if self.backend is not None:
+            await self.backend.delete(book_id)
+
+    async def warm_up(
+            self,
+            path: str | Path,
+            session_maker: async_sessionmaker[AsyncSession],
+    ) -> int:
+        """
+        Загрузить в кэш книги из файла прогрева одним запросом.
+
+        Returns:
+            int: Сколько книг загружено
+        """
+        if self.backend is None:
+            return 0
+
+        try:
+            book_ids = [UUID(value) for value in json.loads(Path(path).read_text())]
+        except FileNotFoundError:
+            return 0
+        except (OSError, ValueError, TypeError):
+            logger.warning("Book cache warm-up file is invalid: %s", path, exc_info=True)
+            return 0
+
+        try:
+            async with session_maker() as session:
+                books = await BookRepository(session).get_by_ids(book_ids)
+        except Exception:
+            # Прогрев — оптимизация, старт приложения он не блокирует
+            logger.warning("Book cache warm-up failed", exc_info=True)
+            return 0
+
+        for book in books:
+            await self.backend.set(book.book_id, BookMapper.to_show_book(book))
+        return len(books)
+
+    def save_hot_ids(self, path: str | Path, limit: int) -> int:
+        """
+        Записать ID самых недавно читаемых книг для прогрева при следующем старте.
+
+        Returns:
+            int: Сколько ID записано
+        """
+        if self.backend is None:
+            return 0
+
+        book_ids = self.backend.hot_ids(limit)
+        try:
+            Path(path).write_text(json.dumps([str(book_id) for book_id in book_ids]))
+        except OSError:
+            logger.warning("Failed to write book cache warm-up file: %s", path, exc_info=True)
+            return 0
+        return len(book_ids)
+
+    def stats(self) -> dict[str, int]:
+        """Счетчики кэша."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "size": len(self.backend) if self.backend is not None else 0,
+        }
+
+    async def _load(
+            self,
+            book_id: UUID,
+            loader: Callable[[], Awaitable[ShowBook | None]],
+    ) -> ShowBook | None:
+        """Загрузить книгу и сохранить, если ее не сбросили во время загрузки."""
+        generation = self._begin_load([book_id])[book_id]
+        try:
+            book = await loader()
+            if (
+                    book is not None
+                    and self.backend is not None
+                    and self._generations[book_id] == generation
+            ):
+                await self.backend.set(book_id, book)
+            return book
+        finally:
+            self._end_load([book_id])
+
+    def _begin_load(self, book_ids: Iterable[UUID]) -> dict[UUID, int]:
+        """Начать отслеживать сбросы ключей; возвращает их счетчики на начало загрузки."""
+        generations = {}
+        for book_id in book_ids:
+            self._loading[book_id] += 1
+            generations[book_id] = self._generations.setdefault(book_id, 0)
+        return generations
+
+    def _end_load(self, book_ids: Iterable[UUID]) -> None:
+        for book_id in book_ids:
+            self._loading[book_id] -= 1
+            if not self._loading[book_id]:
+                del self._loading[book_id]
+                del self._generations[book_id]
@@ -0,0 +1,97 @@
+import csv
+import io
+import json
+from typing import AsyncIterator, Literal
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from ...api.v1.schemas.book import ShowBook
+from ...data.repositories.book_repository import BookRepository
+
+ExportFormat = Literal["ndjson", "csv"]
+
+MEDIA_TYPES: dict[ExportFormat, str] = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+class BookExporter:
+    """
+    Потоковая выгрузка каталога в NDJSON или CSV.
+
+    Книги читаются серверным курсором пачками по batch_size и отдаются
+    по пачке за раз: следующая пачка читается из БД только после того,
+    как клиент принял предыдущую. Память не зависит от размера каталога.
+
+    Выгрузка идет в своей сессии (одна транзакция — согласованный снимок),
+    так как тело ответа отправляется уже после выхода из эндпоинта.
+    """
+
+    COLUMNS = list(ShowBook.model_fields)
+
+    def __init__(
+            self,
+            session_maker: async_sessionmaker[AsyncSession],
+            batch_size: int = 1_000,
+    ):
+        self.session_maker = session_maker
+        self.batch_size = batch_size
+
+    async def stream(
+            self,
+            export_format: ExportFormat,
+            title: str | None = None,
+            author: str | None = None,
+            genre: str | None = None,
+            year: int | None = None,
+            available: bool | None = None,
+            q: str | None = None,
+            subject: str | None = None,
+            language: str | None = None,
+            publisher: str | None = None,
+    ) -> AsyncIterator[bytes]:
+        """Выгрузить книги по фильтрам; каждый элемент — закодированная пачка."""
+        encode = self._encode_csv if export_format == "csv" else self._encode_ndjson
+
+        if export_format == "csv":
+            yield self._csv_line(self.COLUMNS)
+
+        async with self.session_maker() as session:
+            batches = BookRepository(session).stream_by_filters(
+                self.COLUMNS,
+                title=title,
+                author=author,
+                genre=genre,
+                year=year,
+                available=available,
+                q=q,
+                subject=subject,
+                language=language,
+                publisher=publisher,
+                batch_size=self.batch_size,
+            )
+            async for rows in batches:
+                yield encode([ShowBook.model_validate(row) for row in rows])
+
+    @staticmethod
+    def _encode_ndjson(books: list[ShowBook]) -> bytes:
+        serializer = ShowBook.__pydantic_serializer__
+        return b"".join(serializer.to_json(book) + b"\n" for book in books)
+
+    @classmethod
+    def _encode_csv(cls, books: list[ShowBook]) -> bytes:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for book in books:
+            data = book.model_dump(mode="json")
+            if data["extra"] is not None:
+                data["extra"] = json.dumps(data["extra"], ensure_ascii=False)
+            writer.writerow(data[column] for column in cls.COLUMNS)
+        return buffer.getvalue().encode()
+
+    @staticmethod
+    def _csv_line(values: list[str]) -> bytes:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerow(values)
+        return buffer.getvalue().encode()
@@ -0,0 +1,46 @@
+import asyncio
+import logging
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from ...data.repositories.book_repository import BookRepository
+
+logger = logging.getLogger(__name__)
+
+
+class FacetCountsCompactor:
+    """
+    Периодическое сжатие book_facet_counts.
+
+    Триггеры на books только добавляют строки-приращения, поэтому таблица
+    растет с каждой записью книг. Раз в interval секунд приращения
+    сворачиваются в одну строку на значение фасета; при нескольких
+    процессах сжимает один (advisory lock), остальные пропускают.
+    """
+
+    def __init__(self, session_maker: async_sessionmaker[AsyncSession], interval: float = 60.0):
+        self.session_maker = session_maker
+        self.interval = interval
+        self._task: asyncio.Task | None = None
+
+    async def compact(self) -> bool:
+        async with self.session_maker() as session:
+            return await BookRepository(session).compact_facet_counts()
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="facet-counts-compactor")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.compact()
+            except Exception:
+                logger.exception("Facet counts compaction failed")
@@ -1,9 +1,29 @@
-from uuid import UUID
-from ...api.v1.schemas.book import BookCreate, BookUpdate, ShowBook
+from datetime import datetime
+from uuid import UUID, uuid4
+
+from pydantic import BaseModel
+
+from ...api.v1.schemas.book import (
+    BookBulkItemResult,
+    BookBulkResponse,
+    BookBulkWriteResponse,
+    BookCreate,
+    BookFacets,
+    BookLookupResponse,
+    BookUpdate,
+    FacetBucket,
+    ShowBook,
+    projection_columns,
+)
+from ...api.v1.schemas.common import CountMode, PageCursor
+from ...core.config import settings
+from ...core.database import primary_reads
+from ...data.models.book import EnrichmentStatus
 from ...data.repositories.book_repository import BookRepository
-from ...external.openlibrary.client import OpenLibraryClient
 from ..exceptions import *
 from ..mappers.book_mapper import BookMapper
+from .book_cache import BookCache
+from .enrichment import EnrichmentWorker
 
 
 class BookService:
@@ -16,14 +36,19 @@ class BookService:
     def __init__(
             self,
             book_repository: BookRepository,
-            openlibrary_client: OpenLibraryClient,
+            enrichment_worker: EnrichmentWorker,
+            book_cache: BookCache,
     ):
         self.book_repo = book_repository
-        self.ol_client = openlibrary_client
+        self.enrichment = enrichment_worker
+        self.cache = book_cache
 
     async def create_book(self, book_data: BookCreate) -> ShowBook:
         """
-        Создать новую книгу с обогащением из Open Library.
+        Создать новую книгу.
+
+        Обогащение из Open Library выполняется в фоне: книга возвращается
+        сразу со статусом обогащения pending.
 
         Бизнес-правила:
         - Год не в будущем
@@ -44,17 +69,8 @@ class BookService:
         # 1. Валидация бизнес-правил
         self._validate_book_data(book_data)
 
-        # 2. Проверка уникальности ISBN
-        if book_data.isbn:
-            existing = await self.book_repo.find_by_isbn(book_data.isbn)
-            if existing:
-                raise BookAlreadyExistsException(book_data.isbn)
-
-        # 3. Обогащение данных из Open Library
-        extra = await self._enrich_book_data(book_data)
-
-        # 4. Создание в БД
-        book = await self.book_repo.create(
+        # 2. Создание в БД; проверка уникальности ISBN — в том же INSERT
+        book, created = await self.book_repo.create_or_get(
             title=book_data.title,
             author=book_data.author,
             year=book_data.year,
@@ -62,64 +78,289 @@ class BookService:
             pages=book_data.pages,
             isbn=book_data.isbn,
             description=book_data.description,
-            extra=extra,
         )
+        if not created:
+            raise BookAlreadyExistsException(book_data.isbn, book.book_id)
+
+        # 3. Обогащение данных из Open Library — в фоне
+        self.enrichment.submit(book.book_id)
 
-        # 5. Маппинг в DTO
+        # 4. Маппинг в DTO
         return BookMapper.to_show_book(book)
 
+    async def create_books(
+            self,
+            items: list[BookCreate],
+    ) -> BookBulkResponse:
+        """
+        Создать пакет книг.
+
+        Бизнес-правила проверяются для каждой книги, уникальность ISBN —
+        одним запросом на весь пакет, вставка — многострочными INSERT.
+        Нарушения не прерывают пакет, а попадают в статус книги.
+        Обогащение созданных книг выполняется в фоне.
+        """
+        results: list[BookBulkItemResult] = []
+        rows: list[dict] = []
+        seen_isbns: set[str] = set()
+
+        # 1. Валидация бизнес-правил и дубликаты внутри пакета
+        for index, book_data in enumerate(items):
+            result = BookBulkItemResult(index=index, status="created", isbn=book_data.isbn)
+            results.append(result)
+            try:
+                self._validate_book_data(book_data)
+            except AppException as e:
+                result.status, result.error = "invalid", e.message
+                continue
+
+            if book_data.isbn:
+                if book_data.isbn in seen_isbns:
+                    result.status = "duplicate"
+                    continue
+                seen_isbns.add(book_data.isbn)
+
+            result.book_id = uuid4()
+            rows.append(
+                dict(
+                    book_id=result.book_id,
+                    title=book_data.title,
+                    author=book_data.author,
+                    year=book_data.year,
+                    genre=book_data.genre,
+                    pages=book_data.pages,
+                    available=True,
+                    isbn=book_data.isbn,
+                    description=book_data.description,
+                    extra=None,
+                    enrichment_status=EnrichmentStatus.PENDING,
+                    enrichment_attempts=0,
+                )
+            )
+
+        # 2. Уникальность ISBN относительно каталога
+        existing = await self.book_repo.find_existing_isbns(list(seen_isbns))
+        rows = [row for row in rows if row["isbn"] not in existing]
+
+        # 3. Вставка пачками
+        created = await self.book_repo.bulk_create(
+            rows, batch_size=settings.bulk_insert_batch_size
+        )
+
+        for result in results:
+            if result.status == "created" and result.book_id not in created:
+                # Занят в каталоге (до проверки или параллельной вставкой)
+                result.status, result.book_id = "exists", None
+
+        # 4. Обогащение — в фоне; не поместившиеся в очередь подберет sweep
+        for book_id in created:
+            self.enrichment.submit(book_id)
+
+        return BookBulkResponse(
+            created=len(created),
+            failed=len(results) - len(created),
+            items=results,
+        )
+
     async def get_book(self, book_id: UUID) -> ShowBook:
         """
         Получить книгу по ID.
 
+        Читает через кэш: попадание не обращается к БД, одновременные
+        промахи по одной книге обслуживаются одним чтением.
+
         Raises:
             BookNotFoundException: Если книга не найдена
         """
-        book = await self.book_repo.get_by_id(book_id)
+        book = await self.cache.get_or_load(book_id, lambda: self._load_book(book_id))
         if book is None:
             raise BookNotFoundException(book_id)
 
-        return BookMapper.to_show_book(book)
+        return book
+
+    async def lookup_books(self, book_ids: list[UUID], isbns: list[str]) -> BookLookupResponse:
+        """
+        Получить книги по списку ID и ISBN.
+
+        Книги по ID сначала берутся из кэша; промахи и все ISBN читаются
+        одним запросом, промахи по ID сохраняются в кэш.
+        """
+        book_ids = list(dict.fromkeys(book_ids))
+        isbns = list(dict.fromkeys(isbns))
+
+        by_id = await self.cache.peek_many(book_ids)
+        missing_ids = [book_id for book_id in book_ids if book_id not in by_id]
+        loaded: list[ShowBook] = []
+        if missing_ids or isbns:
+            loaded = await self.cache.load_many(
+                missing_ids, lambda: self._load_books(missing_ids, isbns)
+            )
+        by_isbn: dict[str, ShowBook] = {}
+        for book in loaded:
+            by_id.setdefault(book.book_id, book)
+            if book.isbn is not None:
+                by_isbn[book.isbn] = book
+
+        items: dict[UUID, ShowBook] = {}
+        for book_id in book_ids:
+            if book_id in by_id:
+                items.setdefault(book_id, by_id[book_id])
+        for isbn in isbns:
+            if isbn in by_isbn:
+                items.setdefault(by_isbn[isbn].book_id, by_isbn[isbn])
+
+        return BookLookupResponse(
+            items=list(items.values()),
+            missing_book_ids=[book_id for book_id in book_ids if book_id not in by_id],
+            missing_isbns=[isbn for isbn in isbns if isbn not in by_isbn],
+        )
+
+    async def get_book_version(self, book_id: UUID) -> tuple[int, datetime]:
+        """
+        Получить версию книги (version, updated_at) для условных запросов.
+
+        Берется из кэша, иначе — узким запросом без загрузки всей книги.
+
+        Raises:
+            BookNotFoundException: Если книга не найдена
+        """
+        cached = await self.cache.peek(book_id)
+        if cached is not None:
+            return cached.version, cached.updated_at
+
+        version = await self.book_repo.get_version(book_id)
+        if version is None:
+            raise BookNotFoundException(book_id)
+        return version
 
     async def update_book(
             self,
             book_id: UUID,
             book_data: BookUpdate,
+            expected_versions: list[int] | None = None,
     ) -> ShowBook:
         """
         Обновить книгу.
 
-        Обновляются только переданные поля.
-        """
-        # Проверить существование
-        existing = await self.book_repo.get_by_id(book_id)
-        if existing is None:
-            raise BookNotFoundException(book_id)
+        Обновляются только переданные поля — одним UPDATE ... RETURNING,
+        без предварительного чтения книги.
+
+        Args:
+            expected_versions: Версии из If-Match; обновить, только если
+                текущая версия книги — одна из них
 
+        Raises:
+            BookNotFoundException: Если книга не найдена
+            BookVersionMismatchException: Если версия не совпала
+        """
         # Валидация если обновляется год/страницы
         if book_data.year is not None:
             self._validate_year(book_data.year)
         if book_data.pages is not None:
             self._validate_pages(book_data.pages)
 
-        # Обновить
-        updated = await self.book_repo.update(
-            book_id,
-            **book_data.dict(exclude_unset=True)
-        )
+        values = book_data.model_dump(exclude_unset=True)
+        if not values:
+            # Пустой PATCH ничего не меняет и не увеличивает версию
+            book = await self.book_repo.get_by_id(book_id)
+            if book is None:
+                raise BookNotFoundException(book_id)
+            if expected_versions is not None and book.version not in expected_versions:
+                raise BookVersionMismatchException(book_id, book.version)
+            return BookMapper.to_show_book(book)
+
+        updated = await self.book_repo.update(book_id, expected_versions, **values)
+        if updated is None:
+            await self._raise_write_conflict(book_id)
+        await self.cache.invalidate(book_id)
 
         return BookMapper.to_show_book(updated)
 
-    async def delete_book(self, book_id: UUID) -> None:
+    async def delete_book(self, book_id: UUID, expected_versions: list[int] | None = None) -> None:
         """
-        Удалить книгу.
+        Удалить книгу одним DELETE ... RETURNING.
+
+        Args:
+            expected_versions: Версии из If-Match; удалить, только если
+                текущая версия книги — одна из них
 
         Raises:
             BookNotFoundException: Если книга не найдена
+            BookVersionMismatchException: Если версия не совпала
         """
-        deleted = await self.book_repo.delete(book_id)
+        deleted = await self.book_repo.delete(book_id, expected_versions)
         if not deleted:
+            await self._raise_write_conflict(book_id)
+        await self.cache.invalidate(book_id)
+
+    async def update_books(self, book_data: BookUpdate, dry_run: bool = False, **filters) -> BookBulkWriteResponse:
+        """
+        Обновить все книги по фильтрам листинга.
+
+        Обновление — множественными UPDATE пачками (без чтения книг),
+        версия каждой книги увеличивается.
+
+        Args:
+            dry_run: Только посчитать подходящие книги
+
+        Raises:
+            BulkWriteFilterRequiredException: Если не передан ни один фильтр
+            BulkUpdateIsbnException: Если передан ISBN (он уникален)
+        """
+        self._require_filters(filters)
+        if book_data.isbn is not None:
+            # Иначе вторая книга пачки нарушит уникальный индекс (500),
+            # а уже записанные пачки останутся примененными
+            raise BulkUpdateIsbnException()
+        if book_data.year is not None:
+            self._validate_year(book_data.year)
+        if book_data.pages is not None:
+            self._validate_pages(book_data.pages)
+
+        if dry_run:
+            return BookBulkWriteResponse(count=await self.book_repo.count_by_filters(**filters), dry_run=True)
+        values = book_data.model_dump(exclude_unset=True)
+        if not values:
+            # Как у PATCH одной книги: пустое изменение ничего не пишет
+            return BookBulkWriteResponse(count=0, dry_run=False)
+
+        count = 0
+        async for book_ids in self.book_repo.update_by_filters(
+                values, chunk_size=settings.bulk_write_chunk_size, **filters
+        ):
+            count += len(book_ids)
+            await self._invalidate_many(book_ids)
+        return BookBulkWriteResponse(count=count, dry_run=False)
+
+    async def delete_books(self, dry_run: bool = False, **filters) -> BookBulkWriteResponse:
+        """
+        Удалить все книги по фильтрам листинга пачками DELETE.
+
+        Raises:
+            BulkWriteFilterRequiredException: Если не передан ни один фильтр
+        """
+        self._require_filters(filters)
+        if dry_run:
+            return BookBulkWriteResponse(count=await self.book_repo.count_by_filters(**filters), dry_run=True)
+
+        count = 0
+        async for book_ids in self.book_repo.delete_by_filters(
+                chunk_size=settings.bulk_write_chunk_size, **filters
+        ):
+            count += len(book_ids)
+            await self._invalidate_many(book_ids)
+        return BookBulkWriteResponse(count=count, dry_run=False)
+
+    async def _raise_write_conflict(self, book_id: UUID) -> None:
+        """
+        Причина, по которой условная запись не затронула строку.
+
+        Только на неуспешном пути: второй запрос различает 404 и 412.
+        """
+        version = await self.book_repo.get_version(book_id)
+        if version is None:
             raise BookNotFoundException(book_id)
+        raise BookVersionMismatchException(book_id, version[0])
 
     async def search_books(
             self,
@@ -128,39 +369,148 @@ class BookService:
             genre: str | None = None,
             year: int | None = None,
             available: bool | None = None,
+            q: str | None = None,
+            subject: str | None = None,
+            language: str | None = None,
+            publisher: str | None = None,
             limit: int = 20,
             offset: int = 0,
-    ) -> tuple[list[ShowBook], int]:
+            cursor: PageCursor | None = None,
+            count: CountMode = "exact",
+            fields: tuple[str, ...] | None = None,
+    ) -> tuple[list[BaseModel], int | None, CountMode, bool]:
         """
         Поиск книг с фильтрацией и пагинацией.
 
+        С fields из БД читаются только колонки проекции (book_projection),
+        и книги возвращаются ею; без fields — ShowBook.
+
+        Если передан cursor, страница читается по ключу (created_at, book_id)
+        от курсора, и offset игнорируется. При полнотекстовом поиске (q)
+        книги упорядочены по релевантности, поэтому курсор недоступен.
+
+        Режимы подсчета total (count):
+        - exact: книги и точное количество одним запросом
+        - estimated: оценка планировщика; если она меньше
+          settings.count_estimate_threshold, считается точно
+        - none: без total, только признак следующей страницы
+
         Returns:
-            tuple: (список книг, общее количество)
-        """
-        # Получить книги
-        books = await self.book_repo.find_by_filters(
-            title=title,
-            author=author,
-            genre=genre,
-            year=year,
-            available=available,
-            limit=limit,
+            tuple: (список книг, общее количество, режим, которым оно получено,
+                есть ли еще записи в направлении чтения)
+
+        Raises:
+            CursorNotSupportedException: Если переданы и q, и cursor
+        """
+        if q and cursor is not None:
+            raise CursorNotSupportedException("full-text search (q)")
+
+        filters = dict(
+            title=title, author=author, genre=genre, year=year, available=available, q=q,
+            subject=subject, language=language, publisher=publisher,
+        )
+        backward = cursor is not None and cursor.backward
+        page = dict(
+            # +1 запись, чтобы узнать, есть ли следующая страница
+            limit=limit + 1,
             offset=offset,
+            keyset=(cursor.created_at, cursor.book_id) if cursor else None,
+            backward=backward,
+            columns=projection_columns(fields) if fields else None,
         )
 
-        # Подсчитать общее количество
-        total = await self.book_repo.count_by_filters(
-            title=title,
-            author=author,
-            genre=genre,
-            year=year,
-            available=available,
-        )
+        total = None
+        if count == "estimated":
+            total = await self.book_repo.estimate_by_filters(**filters)
+            if total is None or total < settings.count_estimate_threshold:
+                # Узкая выборка: точный подсчет дешев
+                count = "exact"
+
+        if count == "exact":
+            books, total = await self.book_repo.find_by_filters_with_total(**filters, **page)
+            if total is None:
+                # Пустая страница: количество не пришло вместе со строками
+                first_page = offset == 0 and cursor is None
+                total = 0 if first_page else await self.book_repo.count_by_filters(**filters)
+        else:
+            books = await self.book_repo.find_by_filters(**filters, **page)
+
+        has_more = len(books) > limit
+        books = books[-limit:] if backward else books[:limit]
+
+        if fields:
+            return BookMapper.to_book_fields(books, fields), total, count, has_more
+        return BookMapper.to_show_books(books), total, count, has_more
+
+    async def get_facets(
+            self,
+            limit: int = 10,
+            title: str | None = None,
+            author: str | None = None,
+            genre: str | None = None,
+            year: int | None = None,
+            available: bool | None = None,
+            q: str | None = None,
+            subject: str | None = None,
+            language: str | None = None,
+            publisher: str | None = None,
+    ) -> BookFacets:
+        """
+        Количества книг по жанрам, десятилетиям, авторам и доступности.
 
-        return BookMapper.to_show_books(books), total
+        Без фильтров читаются заранее посчитанные счетчики (book_facet_counts),
+        с фильтрами — все фасеты и total считаются одним запросом.
+        В каждом фасете — limit самых частых значений.
+        """
+        filters = dict(
+            title=title, author=author, genre=genre, year=year, available=available, q=q,
+            subject=subject, language=language, publisher=publisher,
+        )
+        if any(value is not None for value in filters.values()):
+            total, facets = await self.book_repo.facets_by_filters(limit, **filters)
+            source = "query"
+        else:
+            total, facets = await self.book_repo.precomputed_facets(limit)
+            source = "precomputed"
+
+        return BookFacets(
+            total=total,
+            source=source,
+            **{
+                facet: [FacetBucket(value=value, count=count) for value, count in buckets]
+                for facet, buckets in facets.items()
+            },
+        )
 
     # ========== ПРИВАТНЫЕ МЕТОДЫ ==========
 
+    async def _invalidate_many(self, book_ids: list[UUID]) -> None:
+        for book_id in book_ids:
+            await self.cache.invalidate(book_id)
+
+    @staticmethod
+    def _require_filters(filters: dict) -> None:
+        """Запись по пустым фильтрам затронула бы весь каталог — только явно по фильтру."""
+        if all(value is None or value == "" for value in filters.values()):
+            raise BulkWriteFilterRequiredException()
+
+    async def _load_book(self, book_id: UUID) -> ShowBook | None:
+        """
+        Прочитать книгу из БД и преобразовать в DTO.
+
+        Книга, которая попадет в кэш, читается с primary: иначе отстающая
+        реплика могла бы вернуть в кэш версию до только что сброшенной.
+        """
+        with primary_reads(self.cache.stores):
+            book = await self.book_repo.get_by_id(book_id)
+        return BookMapper.to_show_book(book) if book is not None else None
+
+    async def _load_books(self, book_ids: list[UUID], isbns: list[str]) -> list[ShowBook]:
+        """Прочитать книги по ID и ISBN одним запросом (с primary — как _load_book)."""
+        with primary_reads(self.cache.stores):
+            books = await self.book_repo.get_by_keys(book_ids, isbns)
+        return BookMapper.to_show_books(books)
+
     def _validate_book_data(self, data: BookCreate) -> None:
         """Валидация бизнес-правил для новой книги."""
         self._validate_year(data.year)
@@ -178,29 +528,3 @@ class BookService:
         """Проверить что количество страниц валидно."""
         if pages <= 0:
             raise InvalidPagesException(pages)
-
-    async def _enrich_book_data(
-            self,
-            book_data: BookCreate
-    ) -> dict | None:
-        """
-        Обогатить данные книги из Open Library.
-
-        Не выбрасывает исключение если API недоступен.
-        """
-        try:
-            extra = await self.ol_client.enrich(
-                title=book_data.title,
-                author=book_data.author,
-                isbn=book_data.isbn,
-            )
-            return extra if extra else None
-        except OpenLibraryException:
-            # Логируем но не прерываем создание книги
-            import logging
-            logger = logging.getLogger(__name__)
-            logger.warning(
-                "Failed to enrich book data from Open Library",
-                extra={"title": book_data.title, "author": book_data.author}
-            )
-            return None
\ No newline at end of file
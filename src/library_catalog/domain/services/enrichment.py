@@ -0,0 +1,178 @@
+import asyncio
+import logging
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from ...data.models.book import EnrichmentStatus
+from ...data.repositories.book_repository import BookRepository
+from ...external.openlibrary.client import OpenLibraryClient
+from ..exceptions import OpenLibraryException, OpenLibraryTimeoutException
+from .book_cache import BookCache
+
+logger = logging.getLogger(__name__)
+
+
+class EnrichmentWorker:
+    """
+    Фоновое обогащение книг из Open Library.
+
+    Книги создаются со статусом pending и сразу отдаются клиенту.
+    Пул из concurrency корутин заполняет extra и ставит статус
+    done / not_found (или failed после max_attempts неудач).
+
+    Очередь в памяти — только ускорение: источник правды — статус в БД.
+    Периодический sweep забирает из БД книги, которые не попали в очередь
+    (переполнение, рестарт, падение процесса), поэтому работа переживает
+    перезапуск и корректно делится между несколькими uvicorn-воркерами.
+    """
+
+    def __init__(
+            self,
+            ol_client: OpenLibraryClient,
+            session_maker: async_sessionmaker[AsyncSession],
+            concurrency: int = 4,
+            queue_size: int = 10_000,
+            max_attempts: int = 5,
+            retry_delay: float = 300.0,
+            sweep_interval: float = 30.0,
+            book_cache: BookCache | None = None,
+    ):
+        self.ol_client = ol_client
+        self.session_maker = session_maker
+        self.book_cache = book_cache
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.sweep_interval = sweep_interval
+        self._queue: asyncio.Queue[UUID] = asyncio.Queue(maxsize=queue_size)
+        self._queued: set[UUID] = set()
+        self._tasks: list[asyncio.Task] = []
+        self._accepting = False
+
+    async def start(self) -> None:
+        """Запустить воркеры и sweep (sweep сразу подберет книги, оставшиеся с прошлого запуска)."""
+        self._accepting = True
+        self._tasks = [
+            asyncio.create_task(self._work(), name=f"enrichment-worker-{i}")
+            for i in range(self.concurrency)
+        ]
+        self._tasks.append(asyncio.create_task(self._sweep(), name="enrichment-sweep"))
+
+    def submit(self, book_id: UUID) -> bool:
+        """
+        Поставить книгу в очередь без ожидания.
+
+        Returns:
+            bool: False, если очередь полна или воркер останавливается —
+                книга останется pending и будет подобрана sweep
+        """
+        if not self._accepting or book_id in self._queued:
+            return False
+        try:
+            self._queue.put_nowait(book_id)
+        except asyncio.QueueFull:
+            return False
+        self._queued.add(book_id)
+        return True
+
+    async def stop(self, timeout: float) -> None:
+        """
+        Остановиться, дообработав очередь в пределах timeout.
+
+        Книги, не успевшие обработаться, остаются pending в БД
+        и будут обогащены после перезапуска.
+        """
+        self._accepting = False
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(
+                "Enrichment drain timed out, %d books left pending", self._queue.qsize()
+            )
+
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    @property
+    def pending(self) -> int:
+        """Книг в очереди процесса."""
+        return self._queue.qsize()
+
+    async def _work(self) -> None:
+        """Цикл одного воркера."""
+        while True:
+            book_id = await self._queue.get()
+            try:
+                await self._enrich(book_id)
+            except Exception:
+                logger.exception("Enrichment failed", extra={"book_id": str(book_id)})
+            finally:
+                self._queued.discard(book_id)
+                self._queue.task_done()
+
+    async def _enrich(self, book_id: UUID) -> None:
+        """
+        Обогатить одну книгу.
+
+        Сессия чтения закрывается до запроса к Open Library, результат
+        пишется в новой: соединение не простаивает в открытой транзакции
+        (idle in transaction) на время сетевых повторов.
+        """
+        async with self.session_maker() as session:
+            book = await BookRepository(session).get_by_id(book_id)
+        if book is None or book.enrichment_status != EnrichmentStatus.PENDING:
+            return
+
+        try:
+            extra = await self.ol_client.enrich(
+                title=book.title,
+                author=book.author,
+                isbn=book.isbn,
+            )
+        except (OpenLibraryException, OpenLibraryTimeoutException):
+            logger.warning(
+                "Failed to enrich book data from Open Library",
+                extra={"book_id": str(book_id)},
+            )
+            failed = True
+        except Exception:
+            # Неожиданная ошибка тоже расходует попытку: иначе книга
+            # осталась бы pending и забиралась обходом бесконечно
+            logger.exception(
+                "Unexpected error while enriching book",
+                extra={"book_id": str(book_id)},
+            )
+            failed = True
+        else:
+            failed = False
+
+        async with self.session_maker() as session:
+            book_repo = BookRepository(session)
+            if failed:
+                await book_repo.fail_enrichment(book_id, self.max_attempts)
+            else:
+                await book_repo.complete_enrichment(book_id, extra or None)
+
+        # Статус и extra изменились — закэшированная книга устарела
+        if self.book_cache is not None:
+            await self.book_cache.invalidate(book_id)
+
+    async def _sweep(self) -> None:
+        """Периодически забирать из БД книги, ожидающие обогащения."""
+        while True:
+            free = self._queue.maxsize - self._queue.qsize()
+            if self._accepting and free > 0:
+                try:
+                    async with self.session_maker() as session:
+                        book_ids = await BookRepository(session).claim_pending_enrichment(
+                            limit=free, retry_delay=self.retry_delay
+                        )
+                    for book_id in book_ids:
+                        self.submit(book_id)
+                except Exception:
+                    logger.exception("Enrichment sweep failed")
+
+            await asyncio.sleep(self.sweep_interval)
@@ -0,0 +1,119 @@
+import hashlib
+import json
+import logging
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable
+
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from ...core.exceptions import AppException
+from ...data.repositories.idempotency_repository import IdempotencyRepository
+from ..exceptions import IdempotencyKeyInUseException, IdempotencyKeyMismatchException
+
+logger = logging.getLogger(__name__)
+
+
+def request_fingerprint(method: str, path: str, body: Any) -> str:
+    """Хэш запроса для сравнения повторов с одним ключом (порядок ключей JSON не важен)."""
+    payload = json.dumps([method, path, body], sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+@dataclass
+class IdempotentResult:
+    """Ответ на запрос с Idempotency-Key: новый (модель) или сохраненный (JSON)."""
+
+    status_code: int
+    body: BaseModel | Any
+    replayed: bool = False
+
+
+class IdempotencyStore:
+    """
+    Выполнение запросов с Idempotency-Key не больше одного раза.
+
+    Первый запрос занимает ключ, выполняется и сохраняет ответ (в том числе
+    ошибку клиента 4xx); повтор с тем же ключом и телом получает этот ответ
+    без повторного выполнения и фонового обогащения. Ошибка сервера или
+    обрыв освобождают ключ — повтор выполнит запрос заново. Ключи хранятся
+    в БД, общей для всех процессов, и работают в собственных сессиях.
+    """
+
+    # Раз в столько занятых ключей удалять просроченные
+    PURGE_EVERY = 1000
+
+    def __init__(
+            self,
+            session_maker: async_sessionmaker[AsyncSession],
+            ttl: float = 24 * 3600,
+            processing_timeout: float = 60.0,
+    ):
+        self.session_maker = session_maker
+        self.ttl = ttl
+        self.processing_timeout = processing_timeout
+        self._claims = 0
+
+    async def run(
+            self,
+            key: str,
+            fingerprint: str,
+            status_code: int,
+            operation: Callable[[], Awaitable[BaseModel]],
+    ) -> IdempotentResult:
+        """
+        Выполнить operation под ключом или вернуть сохраненный ответ.
+
+        Raises:
+            IdempotencyKeyMismatchException: Ключ уже использован с другим запросом
+            IdempotencyKeyInUseException: Запрос с этим ключом еще выполняется
+        """
+        async with self.session_maker() as session:
+            repo = IdempotencyRepository(session)
+            claimed = await repo.claim(key, fingerprint, self.processing_timeout)
+            if claimed is None:
+                return self._replay(key, fingerprint, await repo.get(key))
+            await self._maybe_purge(repo)
+
+        try:
+            body = await operation()
+        except AppException as e:
+            if e.status_code < 500:
+                await self._complete(claimed, e.status_code, {"detail": e.message})
+            else:
+                await self._release(claimed)
+            raise
+        except Exception:
+            await self._release(claimed)
+            raise
+
+        await self._complete(claimed, status_code, body.model_dump(mode="json"))
+        return IdempotentResult(status_code, body)
+
+    def _replay(self, key: str, fingerprint: str, stored) -> IdempotentResult:
+        # Запись могла истечь между claim и get — тогда это все еще «занят»
+        if stored is not None and stored.request_hash != fingerprint:
+            raise IdempotencyKeyMismatchException(key)
+        if stored is None or stored.status_code is None:
+            raise IdempotencyKeyInUseException(key)
+        return IdempotentResult(stored.status_code, stored.response, replayed=True)
+
+    async def _complete(self, claimed, status_code: int, response: Any) -> None:
+        async with self.session_maker() as session:
+            await IdempotencyRepository(session).complete(claimed, status_code, response, self.ttl)
+
+    async def _release(self, claimed) -> None:
+        try:
+            async with self.session_maker() as session:
+                await IdempotencyRepository(session).release(claimed)
+        except Exception:
+            # Ключ освободится сам через processing_timeout
+            logger.warning("Failed to release idempotency key %r", claimed.key, exc_info=True)
+
+    async def _maybe_purge(self, repo: IdempotencyRepository) -> None:
+        self._claims += 1
+        if self._claims % self.PURGE_EVERY == 0:
+            try:
+                await repo.purge_expired()
+            except Exception:
+                logger.warning("Failed to purge expired idempotency keys", exc_info=True)
@@ -1,17 +1,23 @@
 from abc import ABC, abstractmethod
+import asyncio
 import httpx
 import logging
 import time
 
+from ...core.metrics import ExternalApiMetrics
+from .resilience import CircuitBreaker, CircuitOpenError, RetryBudget, backoff_delay
+
 
 class BaseApiClient(ABC):
     """
     Базовый класс для HTTP клиентов внешних API.
 
     Включает:
-    - Retry логику
+    - Retry логику (неблокирующий backoff с jitter и бюджетом повторов)
+    - Circuit breaker
+    - Лимиты пула соединений и числа одновременных запросов
     - Обработку ошибок
-    - Логирование
+    - Логирование и метрики
     - Timeout management
     """
 
@@ -21,13 +27,37 @@ class BaseApiClient(ABC):
             timeout: float = 10.0,
             retries: int = 3,
             backoff: float = 0.5,
+            max_connections: int = 20,
+            max_keepalive_connections: int = 10,
+            max_concurrency: int = 10,
+            retry_budget_ratio: float = 0.2,
+            breaker_failure_threshold: int = 5,
+            breaker_recovery_timeout: float = 30.0,
     ):
         self.base_url = base_url.rstrip("/")
         self.timeout = timeout
         self.retries = retries
         self.backoff = backoff
-        self._client = httpx.AsyncClient(timeout=self.timeout)
+        self._client = httpx.AsyncClient(
+            timeout=self.timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+            ),
+        )
+        self._concurrency = asyncio.Semaphore(max_concurrency)
         self.logger = logging.getLogger(self.client_name())
+        self.breaker = CircuitBreaker(
+            self.client_name(),
+            failure_threshold=breaker_failure_threshold,
+            recovery_timeout=breaker_recovery_timeout,
+        )
+        self.retry_budget = RetryBudget(ratio=retry_budget_ratio)
+        self.requests_count = 0
+        self.retries_count = 0
+        self.retries_denied_count = 0
+        self.failures_count = 0
+        self.metrics = ExternalApiMetrics(self.client_name())
 
     @abstractmethod
     def client_name(self) -> str:
@@ -51,50 +81,96 @@ class BaseApiClient(ABC):
         """
         Выполнить HTTP запрос с retry логикой.
 
+        Повторяются таймауты, сетевые ошибки и 5xx, пока есть попытки
+        и бюджет повторов. Ожидание между попытками не блокирует event loop.
+
         Raises:
+            CircuitOpenError: Если API признан недоступным
             httpx.TimeoutException: При таймауте
             httpx.HTTPError: При HTTP ошибке
         """
         url = self._build_url(path)
+        self.requests_count += 1
+        self.retry_budget.deposit()
+
+        outcomes = self.metrics.outcomes
 
         for attempt in range(self.retries):
+            try:
+                self.breaker.before_call()
+            except CircuitOpenError:
+                outcomes["circuit_open"].inc()
+                raise
+
             try:
                 self.logger.debug(f"{method} {url} params={params}")
 
-                response = await self._client.request(
-                    method=method,
-                    url=url,
-                    params=params,
-                    json=json,
-                    headers=headers,
-                )
+                async with self._concurrency:
+                    started = time.perf_counter()
+                    try:
+                        response = await self._client.request(
+                            method=method,
+                            url=url,
+                            params=params,
+                            json=json,
+                            headers=headers,
+                        )
+                    finally:
+                        self.metrics.duration.observe(time.perf_counter() - started)
 
                 response.raise_for_status()
-                return response.json()
-
-            except httpx.TimeoutException:
-                if attempt == self.retries - 1:
-                    self.logger.error(f"Timeout after {self.retries} attempts")
-                    raise
-
-                wait_time = self.backoff * (2 ** attempt)
-                self.logger.warning(f"Timeout, retrying in {wait_time}s...")
-                time.sleep(wait_time)
 
             except httpx.HTTPStatusError as e:
-                # 5xx ошибки - retry
-                if e.response.status_code >= 500 and attempt < self.retries - 1:
-                    wait_time = self.backoff * (2 ** attempt)
-                    self.logger.warning(f"Server error, retrying in {wait_time}s...")
-                    time.sleep(wait_time)
-                else:
+                # 4xx — API работает, повторять бессмысленно
+                if e.response.status_code < 500:
+                    outcomes["client_error"].inc()
+                    self.breaker.record_success()
                     self.logger.error(f"HTTP error: {e}")
                     raise
+                outcomes["server_error"].inc()
+                error = e
+
+            except httpx.TransportError as e:
+                # Таймауты и сетевые ошибки
+                outcomes["transport_error"].inc()
+                error = e
+
+            else:
+                outcomes["success"].inc()
+                self.breaker.record_success()
+                return response.json()
+
+            self.failures_count += 1
+            self.breaker.record_failure()
+
+            if attempt == self.retries - 1:
+                self.logger.error(f"{type(error).__name__} after {self.retries} attempts")
+                raise error
+            if not self.retry_budget.try_withdraw():
+                self.retries_denied_count += 1
+                self.logger.error(f"{type(error).__name__}, retry budget exhausted")
+                raise error
+
+            wait_time = backoff_delay(self.backoff, attempt)
+            self.retries_count += 1
+            self.metrics.retries.inc()
+            self.logger.warning(f"{type(error).__name__}, retrying in {wait_time:.2f}s...")
+            await asyncio.sleep(wait_time)
 
     async def _get(self, path: str, **kwargs) -> dict:
         """GET запрос."""
         return await self._request("GET", path, **kwargs)
 
+    def resilience_stats(self) -> dict:
+        """Счетчики запросов, повторов и состояние circuit breaker."""
+        return {
+            "requests": self.requests_count,
+            "retries": self.retries_count,
+            "retries_denied": self.retries_denied_count,
+            "failures": self.failures_count,
+            "circuit_breaker": self.breaker.stats(),
+        }
+
     async def close(self) -> None:
         """Закрыть HTTP клиент."""
-        await self._client.aclose()
\ No newline at end of file
+        await self._client.aclose()
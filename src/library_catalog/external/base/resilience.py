@@ -0,0 +1,137 @@
+import random
+import time
+
+import httpx
+
+
+class CircuitOpenError(httpx.HTTPError):
+    """
+    Запрос отклонен без обращения к API: circuit breaker разомкнут.
+
+    Наследуется от httpx.HTTPError, чтобы клиенты обрабатывали его
+    так же, как сетевые ошибки.
+    """
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"Circuit breaker '{name}' is open, retry after {retry_after:.1f}s")
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker по числу подряд идущих сбоев.
+
+    - closed: запросы проходят; после failure_threshold сбоев подряд — open
+    - open: запросы сразу отклоняются CircuitOpenError в течение recovery_timeout
+    - half_open: пропускается один пробный запрос; успех — closed, сбой — open
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+            self,
+            name: str,
+            failure_threshold: int = 5,
+            recovery_timeout: float = 30.0,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._probe_started: float | None = None
+        self.opened_count = 0
+        self.rejected_count = 0
+
+    @property
+    def state(self) -> str:
+        """Текущее состояние."""
+        if self._opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self._opened_at < self.recovery_timeout:
+            return self.OPEN
+        return self.HALF_OPEN
+
+    def before_call(self) -> None:
+        """
+        Проверить, можно ли выполнить запрос.
+
+        Raises:
+            CircuitOpenError: Если breaker разомкнут или пробный запрос уже идет
+        """
+        state = self.state
+        now = time.monotonic()
+
+        if state == self.HALF_OPEN:
+            # Пробный запрос, который так и не завершился, считаем потерянным
+            probe_alive = (
+                self._probe_started is not None
+                and now - self._probe_started < self.recovery_timeout
+            )
+            if not probe_alive:
+                self._probe_started = now
+                return
+
+        if state != self.CLOSED:
+            self.rejected_count += 1
+            retry_after = max(self._opened_at + self.recovery_timeout - now, 0.0)
+            raise CircuitOpenError(self.name, retry_after)
+
+    def record_success(self) -> None:
+        """Учесть успешный ответ API."""
+        self._failures = 0
+        self._opened_at = None
+        self._probe_started = None
+
+    def record_failure(self) -> None:
+        """Учесть сбой API (таймаут, сетевая ошибка, 5xx)."""
+        self._failures += 1
+        state = self.state
+        if state == self.HALF_OPEN or (
+                state == self.CLOSED and self._failures >= self.failure_threshold
+        ):
+            self.opened_count += 1
+            self._opened_at = time.monotonic()
+            self._probe_started = None
+
+    def stats(self) -> dict:
+        """Состояние и счетчики."""
+        return {
+            "state": self.state,
+            "consecutive_failures": self._failures,
+            "opened": self.opened_count,
+            "rejected": self.rejected_count,
+        }
+
+
+class RetryBudget:
+    """
+    Бюджет повторов: не больше ratio повторов на один исходный запрос.
+
+    Каждый запрос пополняет бюджет на ratio (не выше max_tokens),
+    каждый повтор тратит единицу. Когда API лежит, повторы быстро
+    заканчиваются и не умножают нагрузку на него.
+    """
+
+    def __init__(self, ratio: float = 0.2, max_tokens: float = 10.0):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self._tokens = max_tokens
+
+    def deposit(self) -> None:
+        """Учесть исходный запрос."""
+        self._tokens = min(self._tokens + self.ratio, self.max_tokens)
+
+    def try_withdraw(self) -> bool:
+        """Взять токен на повтор; False — бюджет исчерпан."""
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+
+def backoff_delay(backoff: float, attempt: int, max_delay: float = 30.0) -> float:
+    """Экспоненциальная задержка с full jitter: случайно в [0, backoff * 2^attempt]."""
+    return random.uniform(0, min(backoff * (2 ** attempt), max_delay))
@@ -0,0 +1,180 @@
+import logging
+import re
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from ...data.models.openlibrary_cache import OpenLibraryCacheEntry
+from ...utils.cache import MISSING, TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_isbn(isbn: str) -> str:
+    """
+    Нормализовать ISBN для ключа кэша.
+
+    Убирает дефисы/пробелы и приводит ISBN-10 к ISBN-13,
+    чтобы обе записи одной книги попадали в одну запись кэша.
+    Невалидный ISBN (X не на месте контрольной цифры) остается очищенной строкой.
+    """
+    clean = re.sub(r"[^0-9Xx]", "", isbn).upper()
+    if len(clean) != 10 or not clean[:9].isdigit():
+        return clean
+
+    core = "978" + clean[:9]
+    checksum = sum(int(d) * (1 if i % 2 == 0 else 3) for i, d in enumerate(core))
+    return core + str((10 - checksum % 10) % 10)
+
+
+def normalize_text(value: str) -> str:
+    """Нормализовать название/автора: регистр, пунктуация, пробелы."""
+    return " ".join(re.sub(r"[^\w\s]", " ", value.casefold()).split())
+
+
+def isbn_key(isbn: str) -> str:
+    """Ключ кэша для поиска по ISBN."""
+    return f"isbn:{normalize_isbn(isbn)}"
+
+
+def title_author_key(title: str, author: str) -> str:
+    """Ключ кэша для поиска по названию и автору."""
+    return f"title:{normalize_text(title)}|author:{normalize_text(author)}"
+
+
+class CacheBackend(ABC):
+    """Персистентное хранилище кэша, общее для процессов."""
+
+    @abstractmethod
+    async def get(self, key: str) -> dict | None:
+        """Получить непросроченное значение или None."""
+
+    @abstractmethod
+    async def set(self, key: str, value: dict, ttl: float) -> None:
+        """Сохранить значение на ttl секунд."""
+
+
+class PostgresCacheBackend(CacheBackend):
+    """Кэш в таблице openlibrary_cache."""
+
+    # Раз в столько записей удалять просроченные строки
+    PURGE_EVERY = 1000
+
+    def __init__(self, session_maker: async_sessionmaker[AsyncSession]):
+        self.session_maker = session_maker
+        self._writes = 0
+
+    async def get(self, key: str) -> dict | None:
+        stmt = (
+            select(OpenLibraryCacheEntry.value)
+            .where(OpenLibraryCacheEntry.key == key)
+            .where(OpenLibraryCacheEntry.expires_at > datetime.now(timezone.utc))
+        )
+        async with self.session_maker() as session:
+            result = await session.execute(stmt)
+            return result.scalar_one_or_none()
+
+    async def set(self, key: str, value: dict, ttl: float) -> None:
+        expires_at = datetime.now(timezone.utc) + timedelta(seconds=ttl)
+        stmt = insert(OpenLibraryCacheEntry).values(key=key, value=value, expires_at=expires_at)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[OpenLibraryCacheEntry.key],
+            set_={"value": stmt.excluded.value, "expires_at": stmt.excluded.expires_at},
+        )
+        async with self.session_maker() as session:
+            await session.execute(stmt)
+
+            self._writes += 1
+            if self._writes % self.PURGE_EVERY == 0:
+                await session.execute(
+                    delete(OpenLibraryCacheEntry).where(
+                        OpenLibraryCacheEntry.expires_at <= datetime.now(timezone.utc)
+                    )
+                )
+            await session.commit()
+
+
+class EnrichmentCache:
+    """
+    Кэш результатов поиска Open Library.
+
+    Уровни: LRU в памяти процесса, затем (опционально) персистентный backend.
+    Найденные книги живут ttl, промахи (пустой результат) — negative_ttl.
+    Ошибки backend не ломают обогащение: кэш просто пропускается.
+    """
+
+    def __init__(
+            self,
+            max_entries: int = 10_000,
+            ttl: float = 7 * 24 * 3600,
+            negative_ttl: float = 3600,
+            backend: CacheBackend | None = None,
+    ):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.backend = backend
+        self._memory: TTLCache[dict] = TTLCache(max_entries=max_entries)
+        self.hits = 0
+        self.negative_hits = 0
+        self.backend_hits = 0
+        self.misses = 0
+
+    async def get(self, key: str) -> dict | None:
+        """
+        Получить результат поиска.
+
+        Returns:
+            dict | None: Данные книги, {} для закэшированного промаха,
+                None если в кэше ничего нет
+        """
+        value = self._memory.get(key)
+
+        if value is MISSING and self.backend is not None:
+            try:
+                value = await self.backend.get(key)
+            except Exception:
+                logger.warning("Open Library cache backend read failed", exc_info=True)
+                value = None
+
+            if value is None:
+                value = MISSING
+            else:
+                self.backend_hits += 1
+                self._memory.set(key, value, self._ttl_for(value))
+
+        if value is MISSING:
+            self.misses += 1
+            return None
+
+        if value:
+            self.hits += 1
+        else:
+            self.negative_hits += 1
+        return value
+
+    async def set(self, key: str, value: dict) -> None:
+        """Запомнить результат поиска (пустой dict — промах)."""
+        ttl = self._ttl_for(value)
+        self._memory.set(key, value, ttl)
+
+        if self.backend is not None:
+            try:
+                await self.backend.set(key, value, ttl)
+            except Exception:
+                logger.warning("Open Library cache backend write failed", exc_info=True)
+
+    def stats(self) -> dict[str, int]:
+        """Счетчики кэша."""
+        return {
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "backend_hits": self.backend_hits,
+            "misses": self.misses,
+            "size": len(self._memory),
+        }
+
+    def _ttl_for(self, value: dict) -> float:
+        return self.ttl if value else self.negative_ttl
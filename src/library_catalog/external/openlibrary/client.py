@@ -1,17 +1,31 @@
 import httpx
 from ..base.base_client import BaseApiClient
 from ...domain.exceptions import OpenLibraryException, OpenLibraryTimeoutException
+from ...utils.single_flight import SingleFlight
+from .cache import EnrichmentCache, isbn_key, title_author_key
 
 
 class OpenLibraryClient(BaseApiClient):
-    """Клиент для Open Library API."""
+    """
+    Клиент для Open Library API.
+
+    Если передан cache, результаты поиска (включая промахи)
+    запоминаются по нормализованному ISBN и title+author.
+    Одинаковые одновременные поиски выполняются одним HTTP запросом.
+    Остальные параметры (retries, лимиты, circuit breaker)
+    передаются в BaseApiClient.
+    """
 
     def __init__(
             self,
             base_url: str = "https://openlibrary.org",
             timeout: float = 10.0,
+            cache: EnrichmentCache | None = None,
+            **client_options,
     ):
-        super().__init__(base_url, timeout=timeout)
+        super().__init__(base_url, timeout=timeout, **client_options)
+        self.cache = cache
+        self._inflight: SingleFlight[str, dict] = SingleFlight()
 
     def client_name(self) -> str:
         return "openlibrary"
@@ -29,22 +43,7 @@ class OpenLibraryClient(BaseApiClient):
         Raises:
             OpenLibraryException: При ошибке API
         """
-        try:
-            data = await self._get(
-                "/search.json",
-                params={"isbn": isbn, "limit": 1}
-            )
-
-            docs = data.get("docs", [])
-            if not docs:
-                return {}
-
-            return self._extract_book_data(docs[0])
-
-        except httpx.TimeoutException:
-            raise OpenLibraryTimeoutException(self.timeout)
-        except httpx.HTTPError as e:
-            raise OpenLibraryException(str(e))
+        return await self._search(isbn_key(isbn), {"isbn": isbn, "limit": 1})
 
     async def search_by_title_author(
             self,
@@ -52,26 +51,10 @@ class OpenLibraryClient(BaseApiClient):
             author: str
     ) -> dict:
         """Поиск по названию и автору."""
-        try:
-            data = await self._get(
-                "/search.json",
-                params={
-                    "title": title,
-                    "author": author,
-                    "limit": 1
-                }
-            )
-
-            docs = data.get("docs", [])
-            if not docs:
-                return {}
-
-            return self._extract_book_data(docs[0])
-
-        except httpx.TimeoutException:
-            raise OpenLibraryTimeoutException(self.timeout)
-        except httpx.HTTPError as e:
-            raise OpenLibraryException(str(e))
+        return await self._search(
+            title_author_key(title, author),
+            {"title": title, "author": author, "limit": 1},
+        )
 
     async def enrich(
             self,
@@ -96,6 +79,36 @@ class OpenLibraryClient(BaseApiClient):
         # Попытка 2: По title + author
         return await self.search_by_title_author(title, author)
 
+    async def _search(self, cache_key: str, params: dict) -> dict:
+        """
+        Выполнить /search.json через кэш.
+
+        Ошибки API не кэшируются, пустой результат кэшируется как промах.
+        Конкурентные промахи кэша по одному ключу ждут один запрос.
+        """
+        if self.cache is not None:
+            cached = await self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        return await self._inflight.do(cache_key, lambda: self._fetch(cache_key, params))
+
+    async def _fetch(self, cache_key: str, params: dict) -> dict:
+        """Запросить /search.json и сохранить результат в кэш."""
+        try:
+            data = await self._get("/search.json", params=params)
+        except httpx.TimeoutException:
+            raise OpenLibraryTimeoutException(self.timeout)
+        except httpx.HTTPError as e:
+            raise OpenLibraryException(str(e))
+
+        docs = data.get("docs", [])
+        result = self._extract_book_data(docs[0]) if docs else {}
+
+        if self.cache is not None:
+            await self.cache.set(cache_key, result)
+        return result
+
     def _extract_book_data(self, doc: dict) -> dict:
         """
         Извлечь нужные поля из ответа Open Library.
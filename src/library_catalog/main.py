@@ -7,10 +7,14 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from .api.dependencies import get_book_cache, get_enrichment_worker, get_facet_counts_compactor
 from .core.config import settings
-from .core.database import dispose_engine
+from .core.database import async_session_maker, dispose_engine, engine, replicas
 from .core.exceptions import register_exception_handlers
 from .core.logging_config import setup_logging
+from .core.metrics import mark_process_dead, setup_metrics
+from .core.middleware import ReadYourWritesMiddleware
+from .core.queries import QueryStatsMiddleware
 from .api.v1.routers import books, health
 
 
@@ -22,17 +26,34 @@ async def lifespan(app: FastAPI):
     Lifecycle manager для FastAPI.
 
     Выполняется при:
-    - startup: настройка логирования
-    - shutdown: закрытие подключений к БД
+    - startup: настройка логирования, проверка реплик, прогрев кэша книг,
+      запуск фонового обогащения и сжатия счетчиков фасетов
+    - shutdown: дообработка очереди обогащения, сохранение популярных книг
+      для прогрева, закрытие подключений к БД
     """
     # Startup
     setup_logging()
+    await replicas.start()
+    book_cache = get_book_cache()
+    if settings.book_cache_warmup_file:
+        await book_cache.warm_up(settings.book_cache_warmup_file, async_session_maker)
+    enrichment_worker = get_enrichment_worker()
+    await enrichment_worker.start()
+    facet_compactor = get_facet_counts_compactor()
+    await facet_compactor.start()
     print("🚀 Application started")
 
     yield
 
     # Shutdown
+    await facet_compactor.stop()
+    await enrichment_worker.stop(timeout=settings.enrichment_drain_timeout)
+    if settings.book_cache_warmup_file:
+        book_cache.save_hot_ids(
+            settings.book_cache_warmup_file, settings.book_cache_warmup_size
+        )
     await dispose_engine()
+    mark_process_dead()
     print("👋 Application stopped")
 
 
@@ -49,6 +70,16 @@ app = FastAPI(
 
 # ========== MIDDLEWARE ==========
 
+# Число и время запросов к БД на HTTP запрос (Server-Timing, N+1)
+app.add_middleware(
+    QueryStatsMiddleware,
+    budget=settings.database_request_query_budget,
+    repeated_threshold=settings.database_repeated_query_threshold,
+)
+
+# Read-your-writes при чтении с реплик
+app.add_middleware(ReadYourWritesMiddleware, sticky_seconds=settings.database_sticky_seconds)
+
 # CORS
 app.add_middleware(
     CORSMiddleware,
@@ -87,6 +118,18 @@ async def root():
     }
 
 
+# ========== METRICS ==========
+
+# После роутеров: метки создаются по зарегистрированным маршрутам
+setup_metrics(
+    app,
+    engines={
+        "primary": engine,
+        **{f"replica_{i}": replica for i, replica in enumerate(replicas.engines)},
+    },
+)
+
+
 # ========== RUN ==========
 
 if __name__ == "__main__":
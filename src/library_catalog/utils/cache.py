@@ -0,0 +1,65 @@
+import time
+from collections import OrderedDict
+from typing import Any, Generic, Hashable, TypeVar
+
+V = TypeVar('V')
+
+# Маркер отсутствия значения (None — допустимое значение в кэше)
+MISSING: Any = object()
+
+
+class TTLCache(Generic[V]):
+    """
+    In-process LRU кэш с TTL на каждую запись.
+
+    При превышении max_entries вытесняется давно не использованная запись.
+    Просроченные записи удаляются при обращении к ним.
+    Не потокобезопасен — рассчитан на один event loop.
+    """
+
+    def __init__(self, max_entries: int, ttl: float | None = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float | None, V]] = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = MISSING) -> V | Any:
+        """Получить значение или default, если записи нет или она просрочена."""
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._data[key]
+            return default
+
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: V, ttl: float | None = None) -> None:
+        """Сохранить значение; ttl по умолчанию — из конструктора, None — бессрочно."""
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> bool:
+        """Удалить запись. Возвращает True, если она была."""
+        return self._data.pop(key, None) is not None
+
+    def keys(self) -> list[Hashable]:
+        """Ключи от давно использованных к недавним (включая просроченные)."""
+        return list(self._data)
+
+    def clear(self) -> None:
+        """Удалить все записи."""
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key) is not MISSING
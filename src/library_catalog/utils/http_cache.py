@@ -0,0 +1,83 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Mapping
+
+
+def make_etag(*parts: Any) -> str:
+    """Сильный ETag: хэш от строкового представления частей."""
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(str(part).encode())
+        digest.update(b"\x00")
+    return f'"{digest.hexdigest()}"'
+
+
+def format_http_date(value: datetime) -> str:
+    """Дата в формате HTTP (IMF-fixdate, GMT)."""
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def validator_headers(etag: str, last_modified: datetime | None = None) -> dict[str, str]:
+    """
+    Заголовки для условных запросов.
+
+    no-cache: клиенты и CDN могут хранить ответ, но перепроверяют его
+    при каждом использовании (дешевый 304 вместо тела).
+    """
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_http_date(last_modified)
+    return headers
+
+
+def has_conditions(headers: Mapping[str, str]) -> bool:
+    """Есть ли в запросе If-None-Match или If-Modified-Since."""
+    return "if-none-match" in headers or "if-modified-since" in headers
+
+
+def if_match_tags(headers: Mapping[str, str]) -> list[str] | None:
+    """
+    Теги из If-Match для сильного сравнения (RFC 9110, 13.1.1).
+
+    Returns:
+        list[str] | None: None — заголовка нет или If-Match: * (подходит
+            любая существующая версия); слабые теги (W/) отбрасываются,
+            так как при сильном сравнении никогда не совпадают
+    """
+    if_match = headers.get("if-match")
+    if if_match is None:
+        return None
+    tags = [tag.strip() for tag in if_match.split(",")]
+    if "*" in tags:
+        return None
+    return [tag for tag in tags if tag and not tag.startswith("W/")]
+
+
+def is_not_modified(
+        headers: Mapping[str, str],
+        etag: str,
+        last_modified: datetime | None = None,
+) -> bool:
+    """
+    Можно ли ответить 304 Not Modified.
+
+    If-None-Match сравнивается слабо (W/ игнорируется) и, если передан,
+    имеет приоритет над If-Modified-Since (RFC 9110, 13.2.2).
+    """
+    if_none_match = headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or etag in tags
+
+    if_modified_since = headers.get("if-modified-since")
+    if if_modified_since is None or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    # HTTP-даты с точностью до секунды
+    return last_modified.replace(microsecond=0) <= since
@@ -0,0 +1,69 @@
+import asyncio
+from typing import Awaitable, Callable, Generic, Hashable, TypeVar
+
+K = TypeVar('K', bound=Hashable)
+V = TypeVar('V')
+
+
+class SingleFlight(Generic[K, V]):
+    """
+    Объединение одинаковых конкурентных вызовов.
+
+    Пока вызов с ключом key выполняется, остальные вызовы с тем же ключом
+    не запускают fn, а ждут и получают тот же результат (или то же
+    исключение). Результат общий — его нельзя изменять на месте.
+
+    fn выполняется в задаче первого вызывающего («лидера»), поэтому может
+    использовать его ресурсы (например, сессию БД). Если лидер отменен,
+    ожидающие не падают: один из них повторяет вызов сам.
+    """
+
+    def __init__(self):
+        self._calls: dict[K, asyncio.Future[V]] = {}
+        self.shared_count = 0
+
+    async def do(self, key: K, fn: Callable[[], Awaitable[V]]) -> V:
+        """Выполнить fn или присоединиться к уже идущему вызову с тем же ключом."""
+        while (call := self._calls.get(key)) is not None:
+            try:
+                result = await asyncio.shield(call)
+            except asyncio.CancelledError:
+                if call.cancelled():
+                    # Лидер отменен — пробуем стать лидером сами
+                    continue
+                raise
+            self.shared_count += 1
+            return result
+
+        call = asyncio.get_running_loop().create_future()
+        self._calls[key] = call
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            call.cancel()
+            raise
+        except BaseException as e:
+            call.set_exception(e)
+            # Помечаем исключение полученным, даже если ожидающих не было
+            call.exception()
+            raise
+        else:
+            call.set_result(result)
+            return result
+        finally:
+            if self._calls.get(key) is call:
+                del self._calls[key]
+
+    def forget(self, key: K) -> None:
+        """
+        Отвязать идущий вызов от key.
+
+        Уже ожидающие получат его результат, а следующие вызовы с key
+        запустят fn заново (например, после изменения данных, которые
+        вызов мог прочитать до изменения).
+        """
+        self._calls.pop(key, None)
+
+    def __len__(self) -> int:
+        """Число ключей, по которым сейчас идут вызовы."""
+        return len(self._calls)
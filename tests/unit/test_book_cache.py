@@ -0,0 +1,111 @@
+import asyncio
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+
+from src.library_catalog.api.v1.schemas.book import ShowBook
+from src.library_catalog.domain.services.book_cache import BookCache, MemoryBookCacheBackend
+
+
+def make_book(book_id, title: str) -> ShowBook:
+    now = datetime.now(timezone.utc)
+    return ShowBook(
+        book_id=book_id,
+        title=title,
+        author="Robert Martin",
+        year=2008,
+        genre="Programming",
+        pages=464,
+        available=True,
+        isbn=None,
+        description=None,
+        extra=None,
+        enrichment_status="done",
+        enriched_at=None,
+        version=1,
+        created_at=now,
+        updated_at=now,
+    )
+
+
+@pytest.mark.asyncio
+async def test_hit_does_not_call_loader():
+    cache = BookCache(MemoryBookCacheBackend())
+    book_id = uuid4()
+    calls = 0
+
+    async def load():
+        nonlocal calls
+        calls += 1
+        return make_book(book_id, "Clean Code")
+
+    await cache.get_or_load(book_id, load)
+    await cache.get_or_load(book_id, load)
+    assert calls == 1
+    assert cache.stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_invalidation_during_load_is_not_overwritten():
+    cache = BookCache(MemoryBookCacheBackend())
+    book_id = uuid4()
+    release = asyncio.Event()
+
+    async def stale_load():
+        await release.wait()
+        return make_book(book_id, "old title")
+
+    load = asyncio.create_task(cache.get_or_load(book_id, stale_load))
+    await asyncio.sleep(0)
+    await cache.invalidate(book_id)
+    release.set()
+
+    # Загрузчик получает свой результат, но в кэш он не попадает
+    assert (await load).title == "old title"
+    assert await cache.backend.get(book_id) is None
+
+
+@pytest.mark.asyncio
+async def test_read_after_invalidation_does_not_join_stale_load():
+    cache = BookCache(MemoryBookCacheBackend())
+    book_id = uuid4()
+    release = asyncio.Event()
+
+    async def stale_load():
+        await release.wait()
+        return make_book(book_id, "old title")
+
+    async def fresh_load():
+        return make_book(book_id, "new title")
+
+    stale = asyncio.create_task(cache.get_or_load(book_id, stale_load))
+    await asyncio.sleep(0)
+    await cache.invalidate(book_id)
+
+    # Чтение после записи запускает свою загрузку, не дожидаясь старой
+    fresh = await asyncio.wait_for(cache.get_or_load(book_id, fresh_load), timeout=1)
+    release.set()
+
+    assert fresh.title == "new title"
+    assert (await stale).title == "old title"
+    assert (await cache.backend.get(book_id)).title == "new title"
+
+
+@pytest.mark.asyncio
+async def test_load_many_stores_only_requested_ids_not_invalidated():
+    cache = BookCache(MemoryBookCacheBackend())
+    requested, invalidated, by_isbn = uuid4(), uuid4(), uuid4()
+    release = asyncio.Event()
+
+    async def load():
+        await release.wait()
+        return [make_book(book_id, "title") for book_id in (requested, invalidated, by_isbn)]
+
+    load_task = asyncio.create_task(cache.load_many([requested, invalidated], load))
+    await asyncio.sleep(0)
+    await cache.invalidate(invalidated)
+    release.set()
+
+    assert len(await load_task) == 3
+    assert set(await cache.peek_many([requested, invalidated, by_isbn])) == {requested}
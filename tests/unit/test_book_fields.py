@@ -0,0 +1,52 @@
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+
+from src.library_catalog.api.v1.schemas.book import (
+    BookFields, BookFilters, ShowBook, book_projection, projection_columns,
+)
+from src.library_catalog.domain.exceptions import InvalidFieldsException
+
+BOOK = ShowBook(
+    book_id=uuid4(),
+    title="Dune",
+    author="Frank Herbert",
+    year=1965,
+    genre="Science Fiction",
+    pages=412,
+    available=True,
+    isbn="9780441013593",
+    description="Long description",
+    extra={"subjects": ["Fiction"]},
+    enrichment_status="done",
+    enriched_at=None,
+    version=3,
+    created_at=datetime(2026, 1, 10, tzinfo=timezone.utc),
+    updated_at=datetime(2026, 1, 10, tzinfo=timezone.utc),
+)
+
+
+def test_parse_fields():
+    assert BookFields().parse() is None
+    assert BookFields(fields=" title, author,title ").parse() == ("title", "author")
+    assert BookFields(fields=",".join(ShowBook.model_fields)).parse() is None
+    for fields in ("title,nope", ", "):
+        with pytest.raises(InvalidFieldsException):
+            BookFields(fields=fields).parse()
+
+
+def test_projection_serializes_only_requested_fields():
+    fields = ("title", "year")
+    projected = book_projection(fields).model_validate(BOOK)
+    assert projected.model_dump() == {"title": "Dune", "year": 1965}
+    # Ключ курсора и версия доступны, но не сериализуются
+    assert (projected.book_id, projected.version) == (BOOK.book_id, 3)
+    assert book_projection(fields) is book_projection(fields)
+    assert projection_columns(fields) == ("book_id", "created_at", "version", "title", "year")
+
+
+def test_empty_query_is_not_full_text_search():
+    assert BookFilters(q="").q is None
+    assert BookFilters(q="  ").q is None
+    assert BookFilters(q="dune").q == "dune"
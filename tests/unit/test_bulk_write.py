@@ -0,0 +1,35 @@
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from src.library_catalog.api.v1.schemas.book import BookUpdate
+from src.library_catalog.domain.exceptions import BulkUpdateIsbnException, BulkWriteFilterRequiredException
+from src.library_catalog.domain.services.book_service import BookService
+
+
+def make_service() -> tuple[BookService, Mock]:
+    repo = Mock()
+    repo.count_by_filters = AsyncMock(return_value=2)
+    return BookService(book_repository=repo, enrichment_worker=Mock(), book_cache=Mock()), repo
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("dry_run", [False, True])
+async def test_bulk_update_rejects_isbn(dry_run):
+    service, repo = make_service()
+
+    with pytest.raises(BulkUpdateIsbnException) as exc_info:
+        await service.update_books(BookUpdate(isbn="9780441013593"), dry_run, genre="Fantasy")
+
+    assert exc_info.value.status_code == 400
+    repo.update_by_filters.assert_not_called()
+    repo.count_by_filters.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_bulk_write_requires_filter():
+    service, repo = make_service()
+
+    with pytest.raises(BulkWriteFilterRequiredException):
+        await service.delete_books(genre=None, q="")
+    repo.delete_by_filters.assert_not_called()
@@ -0,0 +1,28 @@
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from sqlalchemy.dialects.postgresql import asyncpg
+
+from src.library_catalog.data.repositories.book_repository import BookRepository
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("filters", [
+    {"title": "Dune :part"},
+    {"q": "dune :part"},
+    {"publisher": "Ace :books", "subject": "O'Brien"},
+])
+async def test_estimate_passes_filter_values_as_parameters(filters):
+    # ":part" в тексте запроса стал бы именованным параметром text() без значения
+    result = Mock()
+    result.scalar_one.return_value = [{"Plan": {"Plan Rows": 42}}]
+    conn = Mock(dialect=asyncpg.dialect(), exec_driver_sql=AsyncMock(return_value=result))
+    session = Mock(connection=AsyncMock(return_value=conn))
+
+    assert await BookRepository(session).estimate_by_filters(**filters) == 42
+
+    sql, params = conn.exec_driver_sql.await_args.args
+    assert sql.startswith("EXPLAIN (FORMAT JSON) SELECT")
+    assert ":part" not in sql and ":books" not in sql and "O'Brien" not in sql
+    assert sql.count("$") == len(params)
+    assert any(":" in str(param) for param in params)
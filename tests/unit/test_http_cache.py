@@ -0,0 +1,38 @@
+from datetime import datetime, timezone
+
+from src.library_catalog.utils.http_cache import format_http_date, if_match_tags, is_not_modified, make_etag
+
+UPDATED_AT = datetime(2026, 1, 10, 12, 30, 15, 123456, tzinfo=timezone.utc)
+
+
+def test_etag_is_strong_and_stable():
+    etag = make_etag("book", UPDATED_AT.isoformat())
+    assert etag.startswith('"') and etag.endswith('"')
+    assert etag == make_etag("book", UPDATED_AT.isoformat())
+    assert etag != make_etag("book", UPDATED_AT.replace(microsecond=0).isoformat())
+
+
+def test_if_none_match():
+    etag = make_etag("book")
+    assert is_not_modified({"if-none-match": f'"other", W/{etag}'}, etag)
+    assert is_not_modified({"if-none-match": "*"}, etag)
+    assert not is_not_modified({"if-none-match": '"other"'}, etag)
+
+
+def test_if_modified_since_has_second_precision():
+    etag = make_etag("book")
+    since = {"if-modified-since": format_http_date(UPDATED_AT)}
+    assert is_not_modified(since, etag, UPDATED_AT)
+    assert not is_not_modified(since, etag, UPDATED_AT.replace(second=16))
+
+
+def test_if_none_match_takes_precedence():
+    headers = {"if-none-match": '"other"', "if-modified-since": format_http_date(UPDATED_AT)}
+    assert not is_not_modified(headers, make_etag("book"), UPDATED_AT)
+
+
+def test_if_match_uses_strong_comparison():
+    assert if_match_tags({}) is None
+    assert if_match_tags({"if-match": "*"}) is None
+    assert if_match_tags({"if-match": '"3", W/"4" ,"5"'}) == ['"3"', '"5"']
+    assert if_match_tags({"if-match": 'W/"4"'}) == []
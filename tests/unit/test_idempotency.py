@@ -0,0 +1,30 @@
+from types import SimpleNamespace
+
+import pytest
+
+from src.library_catalog.domain.exceptions import IdempotencyKeyInUseException, IdempotencyKeyMismatchException
+from src.library_catalog.domain.services.idempotency import IdempotencyStore, request_fingerprint
+
+
+def test_fingerprint_ignores_key_order():
+    a = request_fingerprint("POST", "/api/v1/books/", {"title": "Dune", "pages": 412})
+    b = request_fingerprint("POST", "/api/v1/books/", {"pages": 412, "title": "Dune"})
+    assert a == b
+    assert a != request_fingerprint("POST", "/api/v1/books/bulk", {"title": "Dune", "pages": 412})
+
+
+def test_replay_returns_stored_response():
+    store = IdempotencyStore(session_maker=None)
+    stored = SimpleNamespace(request_hash="h", status_code=201, response={"title": "Dune"})
+    result = store._replay("k", "h", stored)
+    assert (result.status_code, result.body, result.replayed) == (201, {"title": "Dune"}, True)
+
+
+def test_replay_rejects_other_request_and_in_progress():
+    store = IdempotencyStore(session_maker=None)
+    with pytest.raises(IdempotencyKeyMismatchException):
+        store._replay("k", "h", SimpleNamespace(request_hash="other", status_code=201, response={}))
+    with pytest.raises(IdempotencyKeyInUseException):
+        store._replay("k", "h", SimpleNamespace(request_hash="h", status_code=None, response=None))
+    with pytest.raises(IdempotencyKeyInUseException):
+        store._replay("k", "h", None)
@@ -0,0 +1,35 @@
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from src.library_catalog.core.metrics import HTTP_REQUESTS, MetricsMiddleware, UNMATCHED_ROUTE
+
+
+def requests_total(method: str, route: str, status: int) -> float:
+    return HTTP_REQUESTS.labels(method, route, str(status))._value.get()
+
+
+@pytest.mark.asyncio
+async def test_requests_are_labelled_by_route_template():
+    app = FastAPI()
+
+    @app.get("/metrics-test/items/{item_id}")
+    async def get_item(item_id: int):
+        return {"item_id": item_id}
+
+    app.add_middleware(MetricsMiddleware, routes=list(app.routes))
+    route = "/metrics-test/items/{item_id}"
+    before_ok = requests_total("GET", route, 200)
+    before_invalid = requests_total("GET", route, 422)
+    before_unmatched = requests_total("GET", UNMATCHED_ROUTE, 404)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        await client.get("/metrics-test/items/1")
+        await client.get("/metrics-test/items/2")
+        await client.get("/metrics-test/items/abc")
+        await client.get("/metrics-test/missing")
+
+    assert requests_total("GET", route, 200) == before_ok + 2
+    assert requests_total("GET", route, 422) == before_invalid + 1
+    assert requests_total("GET", UNMATCHED_ROUTE, 404) == before_unmatched + 1
@@ -0,0 +1,11 @@
+from src.library_catalog.external.openlibrary.cache import isbn_key, normalize_isbn
+
+
+def test_isbn10_and_isbn13_share_cache_key():
+    assert normalize_isbn("0-441-01359-7") == "9780441013593"
+    assert isbn_key("0-8044-2957-X") == isbn_key("978-0-8044-2957-3")
+
+
+def test_misplaced_check_digit_is_kept_as_is():
+    assert normalize_isbn("X123456789") == "X123456789"
+    assert normalize_isbn("12345X6789") == "12345X6789"
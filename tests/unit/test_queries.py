@@ -0,0 +1,69 @@
+from types import SimpleNamespace
+
+import logging
+
+import pytest
+from pydantic import ValidationError
+from sqlalchemy import create_engine, text
+
+from src.library_catalog.core.config import Settings
+from src.library_catalog.core.queries import (
+    QueryBudgetExceeded, instrument_queries, query_budget, record_queries,
+)
+
+
+@pytest.fixture
+def engine():
+    # Слушателям нужен только sync_engine — sqlite из stdlib вместо asyncpg
+    sync_engine = create_engine("sqlite://")
+    instrument_queries(SimpleNamespace(sync_engine=sync_engine))
+    yield sync_engine
+    sync_engine.dispose()
+
+
+def test_nested_recorders_see_queries(engine):
+    with engine.connect() as conn:
+        with record_queries() as outer:
+            conn.execute(text("SELECT 1"))
+            with record_queries() as inner:
+                conn.execute(text("SELECT 2"))
+                conn.execute(text("SELECT 2"))
+
+    assert outer.count == 3
+    assert inner.count == 2
+    assert inner.repeated(2) == [("SELECT 2", 2)]
+
+
+def test_query_budget(engine):
+    with engine.connect() as conn:
+        with query_budget(2):
+            conn.execute(text("SELECT 1"))
+            conn.execute(text("SELECT 1"))
+
+        with pytest.raises(QueryBudgetExceeded, match="3 queries, budget 2"):
+            with query_budget(2):
+                for _ in range(3):
+                    conn.execute(text("SELECT 1"))
+
+
+def test_failed_explain_keeps_request_transaction(caplog):
+    sync_engine = create_engine("sqlite://")
+    # EXPLAIN (ANALYZE, BUFFERS) — синтаксическая ошибка в sqlite
+    instrument_queries(SimpleNamespace(sync_engine=sync_engine), slow_query_threshold=0, explain="analyze")
+
+    with caplog.at_level(logging.WARNING), sync_engine.begin() as conn:
+        conn.execute(text("CREATE TABLE books (title TEXT)"))
+        conn.execute(text("INSERT INTO books VALUES ('Dune')"))
+        conn.execute(text("SELECT title FROM books"))
+        assert conn.execute(text("SELECT count(*) FROM books")).scalar() == 1
+
+    assert "EXPLAIN failed" in caplog.text
+    sync_engine.dispose()
+
+
+def test_explain_analyze_only_in_development_or_debug():
+    base = dict(database_url="postgresql+asyncpg://localhost/library_catalog", database_slow_query_explain="analyze")
+    assert Settings(environment="development", debug=False, **base)
+    assert Settings(environment="staging", debug=True, **base)
+    with pytest.raises(ValidationError, match="analyze"):
+        Settings(environment="production", debug=False, **base)
@@ -0,0 +1,80 @@
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+import httpx
+import pytest
+from sqlalchemy import select
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from src.library_catalog.core import database
+from src.library_catalog.core.database import RoutingSession, request_routing
+from src.library_catalog.core.middleware import ReadYourWritesMiddleware
+from src.library_catalog.data.models.book import Book
+from src.library_catalog.data.repositories.book_repository import BookRepository
+
+REPLICA = SimpleNamespace(sync_engine=object())
+
+
+async def create_or_get_statement():
+    session = Mock(execute=AsyncMock(return_value=Mock(one_or_none=Mock(return_value=(Mock(), True)))),
+                   commit=AsyncMock())
+    await BookRepository(session).create_or_get(title="Dune", author="Frank Herbert", isbn="9780441013593")
+    return session.execute.await_args.args[0]
+
+
+async def update_by_filters_statement():
+    session = Mock(execute=AsyncMock(return_value=Mock(one=Mock(return_value=(0, None, None)))), commit=AsyncMock())
+    async for _ in BookRepository(session).update_by_filters({"available": False}, genre="Fantasy"):
+        pass
+    return session.execute.await_args.args[0]
+
+
+async def delete_by_filters_statement():
+    session = Mock(execute=AsyncMock(return_value=Mock(one=Mock(return_value=(0, None, None)))), commit=AsyncMock())
+    async for _ in BookRepository(session).delete_by_filters(genre="Fantasy"):
+        pass
+    return session.execute.await_args.args[0]
+
+
+async def read_statement():
+    return select(Book)
+
+
+async def route(statement) -> tuple[object, httpx.Response]:
+    """Выбрать bind для statement внутри HTTP запроса, читающего с реплики."""
+    binds = []
+
+    async def endpoint(request):
+        request_routing.get().read_only = True
+        binds.append(RoutingSession().get_bind(clause=statement))
+        return PlainTextResponse("ok")
+
+    app = ReadYourWritesMiddleware(Starlette(routes=[Route("/", endpoint)]), sticky_seconds=5)
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://t") as client:
+        response = await client.get("/")
+    return binds[0], response
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("make_statement", [
+    create_or_get_statement, update_by_filters_statement, delete_by_filters_statement,
+])
+async def test_write_in_cte_goes_to_primary_and_sets_cookie(monkeypatch, make_statement):
+    monkeypatch.setattr(database.replicas, "choose", lambda: REPLICA)
+
+    bind, response = await route(await make_statement())
+
+    assert bind is database.engine.sync_engine
+    assert "db_primary=1" in response.headers.get("set-cookie", "")
+
+
+@pytest.mark.asyncio
+async def test_read_goes_to_replica_without_cookie(monkeypatch):
+    monkeypatch.setattr(database.replicas, "choose", lambda: REPLICA)
+
+    bind, response = await route(await read_statement())
+
+    assert bind is REPLICA.sync_engine
+    assert "set-cookie" not in response.headers
@@ -0,0 +1,96 @@
+import asyncio
+
+import httpx
+import pytest
+
+from src.library_catalog.external.openlibrary.client import OpenLibraryClient
+from src.library_catalog.utils.single_flight import SingleFlight
+
+CONCURRENCY = 1000
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_backend_call():
+    flight: SingleFlight[str, dict] = SingleFlight()
+    calls = 0
+
+    async def load() -> dict:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"title": "Clean Code"}
+
+    results = await asyncio.gather(*(flight.do("book", load) for _ in range(CONCURRENCY)))
+
+    assert calls == 1
+    assert all(r is results[0] for r in results)
+    assert flight.shared_count == CONCURRENCY - 1
+    assert len(flight) == 0
+
+
+@pytest.mark.asyncio
+async def test_error_is_shared_and_not_cached():
+    flight: SingleFlight[str, int] = SingleFlight()
+    calls = 0
+
+    async def fail() -> int:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    results = await asyncio.gather(
+        *(flight.do("key", fail) for _ in range(10)), return_exceptions=True
+    )
+    assert calls == 1
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+    # Следующий вызов после ошибки идет в backend заново
+    with pytest.raises(RuntimeError):
+        await flight.do("key", fail)
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_leader_cancellation_does_not_fail_waiters():
+    flight: SingleFlight[str, str] = SingleFlight()
+    calls = 0
+
+    async def load() -> str:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return "ok"
+
+    leader = asyncio.create_task(flight.do("key", load))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(flight.do("key", load))
+    await asyncio.sleep(0)
+
+    leader.cancel()
+    assert await waiter == "ok"
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_openlibrary_duplicate_searches_make_one_request():
+    requests = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal requests
+        requests += 1
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json={"docs": [{"publisher": ["Prentice Hall"]}]})
+
+    client = OpenLibraryClient(max_concurrency=CONCURRENCY)
+    client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    try:
+        results = await asyncio.gather(
+            *(client.search_by_isbn("978-0132350884") for _ in range(CONCURRENCY))
+        )
+    finally:
+        await client.close()
+
+    assert requests == 1
+    assert results[0] == {"publisher": "Prentice Hall"}
+    assert all(r is results[0] for r in results)